@@ -0,0 +1,217 @@
+import os
+import time
+import socket
+import uuid
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Proteções pros downloads de imagem:
+#   - prazo total por download (o timeout do requests só vale por leitura)
+#   - detector de travamento: abaixo de MIN_BYTES_PER_SEC depois do período
+#     de carência, aborta em vez de ficar minutos pingando bytes
+#   - hedge: se o download passar do p95 observado, dispara uma cópia em
+#     paralelo e fica com a que terminar primeiro
+#   - escreve num .part e renomeia no fim: arquivo truncado nunca fica no
+#     lugar do definitivo (os scripts pulam arquivo que já existe)
+
+DEADLINE_SECONDS = 60
+MIN_BYTES_PER_SEC = 4 * 1024
+STALL_GRACE_SECONDS = 5
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 15
+
+HEDGE = True
+HEDGE_MIN_SAMPLES = 20     # sem amostras suficientes o p95 não diz nada
+HEDGE_MIN_DELAY = 1.0      # nunca dispara cópia antes disso
+
+MAX_BACKOFF_SECONDS = 8
+
+
+class DownloadAborted(IOError):
+    pass
+
+
+class StallError(DownloadAborted):
+    pass
+
+
+class DeadlineExceeded(DownloadAborted):
+    pass
+
+
+def backoff(attempt: int) -> float:
+    """
+    Exponencial com teto e jitter (antes chegava a 32 s na última tentativa).
+    """
+    return min(2 ** attempt, MAX_BACKOFF_SECONDS) + random.uniform(0, 0.5)
+
+
+class LatencyTracker:
+    """
+    Janela das últimas durações de download bem-sucedidas -> p95.
+    """
+
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def p95(self):
+        with self.lock:
+            if len(self.samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def _abort(resp):
+    """
+    Derruba o socket por baixo do requests: a leitura bloqueada na outra
+    thread estoura na hora em vez de esperar o próximo chunk.
+    """
+    # o http.client tira o socket da conexão e pendura no fp da resposta
+    fp = getattr(getattr(resp.raw, "_fp", None), "fp", None)
+    sock = getattr(getattr(fp, "raw", None), "_sock", None)
+    sock = sock or getattr(getattr(resp.raw, "connection", None), "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    try:
+        resp.close()
+    except Exception:
+        pass
+
+
+def stream_to_file(resp, path: str, cancel: threading.Event = None, chunk_size: int = 8192,
+                   deadline: float = DEADLINE_SECONDS, min_rate: float = MIN_BYTES_PER_SEC,
+                   grace: float = STALL_GRACE_SECONDS):
+    """
+    Baixa resp pra path. Um watchdog confere prazo/vazão a cada 0.5 s — o
+    iter_content fica bloqueado até juntar um chunk inteiro, então a
+    checagem não pode ficar só dentro do loop.
+    """
+    start = time.monotonic()
+    tmp = f"{path}.part-{uuid.uuid4().hex[:8]}"
+    progress = {"received": 0}
+    reason = []
+    finished = threading.Event()
+
+    def watchdog():
+        while not finished.wait(0.5):
+            now = time.monotonic() - start
+            received = progress["received"]
+            if cancel is not None and cancel.is_set():
+                reason.append(DownloadAborted("cancelado (outra cópia terminou antes)"))
+            elif now > deadline:
+                reason.append(DeadlineExceeded(f"passou de {deadline}s ({received} bytes)"))
+            elif now > grace and received / now < min_rate:
+                reason.append(StallError(f"{received / now:.0f} B/s depois de {now:.1f}s"))
+            else:
+                continue
+            _abort(resp)
+            return
+
+    dog = threading.Thread(target=watchdog, daemon=True)
+    dog.start()
+    try:
+        with open(tmp, "wb") as f:
+            try:
+                for chunk in resp.iter_content(chunk_size):
+                    if reason:
+                        break
+                    if chunk:
+                        f.write(chunk)
+                        progress["received"] += len(chunk)
+            except Exception:
+                if not reason:
+                    raise
+            if reason:
+                raise reason[0]
+        os.replace(tmp, path)
+    finally:
+        finished.set()
+        dog.join()
+        resp.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return progress["received"]
+
+
+def fetch_once(get, url: str, path: str, cancel=None, before=None, passthrough=(429,)):
+    """
+    Um GET completo com prazo/stall. Retorna o status HTTP.
+    Status em `passthrough` volta sem baixar (o chamador decide: 429, 403...).
+    """
+    if before is not None:
+        before()
+    r = get(url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=True)
+    if r.status_code in passthrough:
+        r.close()
+        return r.status_code
+    r.raise_for_status()
+    stream_to_file(r, path, cancel=cancel)
+    return r.status_code
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+        return _pool
+
+
+def fetch_to_file(get, url: str, path: str, tracker: LatencyTracker = None, before=None,
+                  passthrough=(429,), hedge: bool = None):
+    """
+    fetch_once com hedge: se o primeiro GET passar do p95 do tracker,
+    dispara um segundo; o primeiro a terminar com sucesso ganha e o outro
+    é cancelado. Sem tracker (ou poucas amostras) é um GET normal.
+    """
+    hedge = HEDGE if hedge is None else hedge
+    start = time.monotonic()
+    delay = tracker.p95() if (tracker is not None and hedge) else None
+
+    if delay is None:
+        status = fetch_once(get, url, path, before=before, passthrough=passthrough)
+    else:
+        status = _hedged(get, url, path, max(delay, HEDGE_MIN_DELAY), before, passthrough)
+
+    if tracker is not None and status not in passthrough:
+        tracker.add(time.monotonic() - start)
+    return status
+
+
+def _hedged(get, url, path, delay, before, passthrough):
+    pool = _get_pool()
+    cancel = threading.Event()
+    futures = [pool.submit(fetch_once, get, url, path, cancel, before, passthrough)]
+
+    done, _ = wait(futures, timeout=delay)
+    if not done:
+        futures.append(pool.submit(fetch_once, get, url, path, cancel, before, passthrough))
+
+    error = None
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            try:
+                status = fut.result()
+            except Exception as e:
+                error = e
+                continue
+            cancel.set()  # a outra cópia desiste no próximo chunk
+            return status
+    raise error
@@ -0,0 +1,84 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+
+# Cache persistente de respostas HTTP (texto) para os crawlers da wiki.
+#
+# Um arquivo .json.gz por URL:
+#   {"url", "status", "fetchedAt", "text"}
+#
+# Modos:
+#   live        -> sempre vai na rede e atualiza o cache
+#   cache-first -> usa o cache se existir (e não estiver velho), senão rede
+#   offline     -> só cache; URL sem cache levanta CacheMiss
+
+MODES = ("live", "cache-first", "offline")
+
+DEFAULT_CACHE_DIR = ".http_cache"
+
+
+class CacheMiss(Exception):
+    pass
+
+
+def cache_path(url: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    # 2 níveis pra não ter milhares de arquivos numa pasta só
+    return os.path.join(cache_dir, h[:2], f"{h}.json.gz")
+
+
+def load(url: str, cache_dir: str = DEFAULT_CACHE_DIR):
+    path = cache_path(url, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # colisão de sha1 é improvável, mas não custa conferir
+    if entry.get("url") != url:
+        return None
+    return entry
+
+
+def store(url: str, text: str, status: int = 200, cache_dir: str = DEFAULT_CACHE_DIR) -> dict:
+    path = cache_path(url, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entry = {
+        "url": url,
+        "status": status,
+        "fetchedAt": time.time(),
+        "text": text,
+    }
+    # escreve num tmp e renomeia: um Ctrl+C no meio não deixa cache corrompido
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return entry
+
+
+def get_text(url: str, fetch_live, mode: str = "cache-first",
+             cache_dir: str = DEFAULT_CACHE_DIR, max_age=None) -> str:
+    """
+    fetch_live(url) -> str é quem faz o request de verdade (com delay, headers, etc).
+    max_age (segundos) só vale no cache-first: entrada mais velha é rebuscada.
+    """
+    if mode not in MODES:
+        raise ValueError(f"modo de cache inválido: {mode!r} (use {', '.join(MODES)})")
+
+    if mode != "live":
+        entry = load(url, cache_dir)
+        if entry is not None:
+            fresh = max_age is None or (time.time() - entry["fetchedAt"]) <= max_age
+            if fresh or mode == "offline":
+                return entry["text"]
+        if mode == "offline":
+            raise CacheMiss(url)
+
+    text = fetch_live(url)
+    store(url, text, cache_dir=cache_dir)
+    return text
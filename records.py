@@ -0,0 +1,263 @@
+import os
+import json
+import dataclasses
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import ClassVar, Optional, Union, get_args, get_origin, get_type_hints
+
+# Registros tipados com o mesmo schema de src/lib/types.ts (os nomes dos
+# campos são os do TS, camelCase mesmo) + Session/Mission do missions.json.
+#   - slots: bem menos memória por registro que um dict
+#   - from_dict valida tipo a tipo e estoura RecordError com o caminho
+#     do campo, em vez de um scrape quebrado ir parar no JSON
+#   - dumps/loads usam orjson se estiver instalado (bem mais rápido),
+#     senão o json da stdlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# NA_JSON_PRETTY=0 -> artefatos compactos (sem indentação)
+PRETTY = os.environ.get("NA_JSON_PRETTY", "1") == "1"
+
+
+class RecordError(ValueError):
+    pass
+
+
+# ---------- schema ----------
+
+@dataclass(slots=True)
+class ChakraRequirement:
+    type: str
+    total: Union[int, str]
+
+
+@dataclass(slots=True)
+class Skill:
+    id: str
+    name: str
+    description: str
+    cooldown: int
+    chakraCost: list[ChakraRequirement]
+    classes: list[str]
+    target: str
+    imageUrl: Optional[str] = None
+    extra: dict = field(default_factory=dict)  # campos internos "_xxx" dos scrapers
+
+    OMIT_NONE: ClassVar = {"imageUrl"}
+
+
+@dataclass(slots=True)
+class Character:
+    id: str
+    name: str
+    chakraTypes: list[str]
+    skills: list[Skill]
+    description: str = ""
+    displayName: Optional[str] = None
+    unlockRequirements: Optional[str] = None
+    avatarUrl: Optional[str] = None
+    extra: dict = field(default_factory=dict)
+
+    OMIT_NONE: ClassVar = {"displayName", "unlockRequirements", "avatarUrl"}
+
+
+@dataclass(slots=True)
+class Image:
+    url: Optional[str]
+    file: Optional[str] = None
+
+
+@dataclass(slots=True)
+class Requirement:
+    name: str
+    color: Optional[str] = None
+
+
+@dataclass(slots=True)
+class MissionCard:
+    imageUrl: Optional[str]
+    isAvailable: Optional[bool]
+    isLevelAvailable: Optional[bool]
+    isCompleted: Optional[bool]
+    rankRequirement: Optional[str]
+    levelRequirement: Optional[int]
+    completedRequeriments: list[Requirement]
+    unlockedCharacter: Optional[str]
+
+
+@dataclass(slots=True)
+class Goal:
+    text: str
+    isCompleted: bool
+
+
+@dataclass(slots=True)
+class Mission:
+    id: str
+    title: str
+    section: str
+    card: MissionCard
+    missionInfo: dict[str, str]
+    requirements: str
+    reward: str
+    goals: list[Goal]
+    images: dict[str, Image]
+    pageUrl: str
+
+
+@dataclass(slots=True)
+class Session:
+    id: str
+    title: str
+    description: str
+    url: str
+    image: Optional[Image]
+    missions: list[Mission]
+
+
+# ---------- decode / encode ----------
+
+@lru_cache(maxsize=None)
+def _fields(cls):
+    hints = get_type_hints(cls)
+    out = []
+    for f in dataclasses.fields(cls):
+        required = f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING
+        out.append((f.name, hints[f.name], required))
+    return tuple(out)
+
+
+def _decode(tp, value, path: str):
+    origin = get_origin(tp)
+
+    if origin is Union:
+        args = get_args(tp)
+        if value is None and type(None) in args:
+            return None
+        for arg in args:
+            if arg is type(None):
+                continue
+            try:
+                return _decode(arg, value, path)
+            except RecordError:
+                continue
+        raise RecordError(f"{path}: tipo inválido {type(value).__name__} (esperado {tp})")
+
+    if origin is list:
+        if not isinstance(value, list):
+            raise RecordError(f"{path}: esperado lista, veio {type(value).__name__}")
+        (item,) = get_args(tp)
+        return [_decode(item, v, f"{path}[{i}]") for i, v in enumerate(value)]
+
+    if origin is dict or tp is dict:
+        if not isinstance(value, dict):
+            raise RecordError(f"{path}: esperado objeto, veio {type(value).__name__}")
+        args = get_args(tp)
+        if not args:
+            return value
+        return {k: _decode(args[1], v, f"{path}.{k}") for k, v in value.items()}
+
+    if dataclasses.is_dataclass(tp):
+        return from_dict(tp, value, path)
+
+    # bool é subclasse de int: não deixa True virar cooldown
+    if tp is int and (isinstance(value, bool) or not isinstance(value, int)):
+        raise RecordError(f"{path}: esperado int, veio {type(value).__name__}")
+    if not isinstance(value, tp):
+        raise RecordError(f"{path}: esperado {tp.__name__}, veio {type(value).__name__}")
+    return value
+
+
+def from_dict(cls, data, path: str = None):
+    """
+    dict (como sai dos scrapers / do JSON) -> registro validado.
+    Chaves "_xxx" vão pra `extra` (se o registro tiver); outras chaves
+    desconhecidas são erro.
+    """
+    path = path or cls.__name__
+    if not isinstance(data, dict):
+        raise RecordError(f"{path}: esperado objeto, veio {type(data).__name__}")
+
+    kwargs = {}
+    known = set()
+    for name, tp, required in _fields(cls):
+        known.add(name)
+        if name == "extra":
+            continue
+        if name not in data:
+            if required:
+                raise RecordError(f"{path}.{name}: campo obrigatório ausente")
+            continue
+        kwargs[name] = _decode(tp, data[name], f"{path}.{name}")
+
+    unknown = [k for k in data if k not in known]
+    if unknown:
+        if "extra" not in known or any(not k.startswith("_") for k in unknown):
+            raise RecordError(f"{path}: campos desconhecidos {unknown}")
+        kwargs["extra"] = {k: data[k] for k in unknown}
+    return cls(**kwargs)
+
+
+def to_dict(obj):
+    """
+    Registro -> dict no formato do JSON (mesma ordem de campos do schema).
+    """
+    if isinstance(obj, list):
+        return [to_dict(v) for v in obj]
+    if isinstance(obj, dict):
+        return {k: to_dict(v) for k, v in obj.items()}
+    if not dataclasses.is_dataclass(obj):
+        return obj
+
+    omit = getattr(obj, "OMIT_NONE", ())
+    out = {}
+    for name, _, _ in _fields(type(obj)):
+        value = getattr(obj, name)
+        if name == "extra":
+            out.update(value)
+        elif value is None and name in omit:
+            continue
+        else:
+            out[name] = to_dict(value)
+    return out
+
+
+def validate(cls, data, path: str = None) -> dict:
+    """
+    Valida e devolve o dict normalizado (atalho pros scrapers que seguem
+    trabalhando com dict).
+    """
+    return to_dict(from_dict(cls, data, path))
+
+
+# ---------- JSON ----------
+
+def dumps(data, pretty: bool = None) -> bytes:
+    pretty = PRETTY if pretty is None else pretty
+    data = to_dict(data)
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def write_json(path: str, data, pretty: bool = None):
+    with open(path, "wb") as f:
+        f.write(dumps(data, pretty))
+
+
+def read_json(path: str):
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Cópias com hash no nome (nome.<hash8>.webp) + manifest nome lógico -> cópia.
+# O front resolve a URL pelo manifest (src/lib/assets.ts), então dá pra
+# servir tudo em _h/ com cache imutável: ícone atualizado = hash novo = URL nova.
+# Conversão pra WebP só se o Pillow estiver instalado; senão a cópia mantém
+# o formato original (o hash continua valendo).
+
+# ========= CONFIG =========
+ASSETS_ROOT = os.path.join("public", "assets", "nawiki")
+ASSET_DIRS = ["characters", "skills", os.path.join("missions_out", "images")]
+HASHED_DIR = "_h"
+MANIFEST_JSON = "asset-manifest.json"      # dentro de ASSETS_ROOT (importado pelo front)
+SOURCES_JSON = ".sources.json"             # dentro de _h: hash da origem -> cópia (pula reconversão)
+
+HASH_LEN = 8
+WEBP = True
+WEBP_QUALITY = 90
+CONVERT_EXTS = {".png", ".jpg", ".jpeg"}
+IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
+# ==========================
+
+
+def webp_available() -> bool:
+    try:
+        from PIL import features
+    except ImportError:
+        return False
+    return features.check("webp")
+
+
+def iter_assets(root: str, dirs):
+    """
+    Gera nomes lógicos (relativos a root, com "/") de todas as imagens.
+    """
+    for d in dirs:
+        base = os.path.join(root, d)
+        for cur, _, files in os.walk(base):
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTS:
+                    yield os.path.relpath(os.path.join(cur, name), root).replace("\\", "/")
+
+
+def to_webp(data: bytes, ext: str) -> bytes:
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as img:
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "P") else "RGB")
+        out = io.BytesIO()
+        # PNG (ícones, transparência) sem perda; JPEG já é com perda
+        img.save(out, "WEBP", lossless=(ext == ".png"), quality=WEBP_QUALITY, method=6)
+        return out.getvalue()
+
+
+def build_one(args):
+    """
+    Roda no pool: (root, lógico, converter?) -> (lógico, sha da origem, nome com hash, bytes|None).
+    Devolve os bytes só quando precisa gravar.
+    """
+    root, logical, convert, known = args
+    with open(os.path.join(root, *logical.split("/")), "rb") as f:
+        data = f.read()
+    src_sha = hashlib.sha256(data).hexdigest()
+    if known and known[0] == src_sha and os.path.exists(os.path.join(root, *known[1].split("/"))):
+        return logical, src_sha, known[1], None
+
+    stem, ext = os.path.splitext(logical)
+    ext = ext.lower()
+    out, out_ext = data, ext
+    if convert and ext in CONVERT_EXTS:
+        try:
+            out, out_ext = to_webp(data, ext), ".webp"
+        except Exception:
+            out, out_ext = data, ext  # imagem que o Pillow não abre: copia como está
+
+    digest = hashlib.sha256(out).hexdigest()[:HASH_LEN]
+    hashed = f"{HASHED_DIR}/{stem}.{digest}{out_ext}"
+    return logical, src_sha, hashed, out
+
+
+def build_manifest(root: str = ASSETS_ROOT, dirs=ASSET_DIRS, convert: bool = None, workers: int = None, prune: bool = False):
+    convert = (WEBP and webp_available()) if convert is None else convert
+    sources_path = os.path.join(root, HASHED_DIR, SOURCES_JSON)
+    sources = {}
+    if os.path.exists(sources_path):
+        with open(sources_path, "r", encoding="utf-8") as f:
+            sources = json.load(f)
+
+    jobs = [(root, logical, convert, sources.get(logical)) for logical in iter_assets(root, dirs)]
+    manifest, new_sources = {}, {}
+    stats = {"assets": len(jobs), "written": 0, "reused": 0, "pruned": 0, "webp": convert}
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for logical, src_sha, hashed, data in ex.map(build_one, jobs, chunksize=32):
+            manifest[logical] = hashed
+            new_sources[logical] = [src_sha, hashed]
+            path = os.path.join(root, *hashed.split("/"))
+            if data is None or os.path.exists(path):
+                stats["reused"] += 1
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            stats["written"] += 1
+
+    if prune:
+        keep = {os.path.normpath(os.path.join(root, *h.split("/"))) for h in manifest.values()}
+        keep.add(os.path.normpath(sources_path))
+        for cur, _, files in os.walk(os.path.join(root, HASHED_DIR)):
+            for name in files:
+                path = os.path.normpath(os.path.join(cur, name))
+                if path not in keep:
+                    os.remove(path)
+                    stats["pruned"] += 1
+
+    os.makedirs(os.path.dirname(sources_path), exist_ok=True)
+    with open(sources_path, "w", encoding="utf-8") as f:
+        json.dump(new_sources, f, ensure_ascii=False, separators=(",", ":"))
+    with open(os.path.join(root, MANIFEST_JSON), "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(manifest.items())), f, ensure_ascii=False, indent=0)
+    return manifest, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera cópias com hash no nome + asset-manifest.json pro front.")
+    parser.add_argument("--root", default=ASSETS_ROOT, help=f"default: {ASSETS_ROOT}")
+    parser.add_argument("--no-webp", action="store_true", help="Não converte pra WebP")
+    parser.add_argument("--prune", action="store_true", help=f"Apaga de {HASHED_DIR}/ o que não está mais no manifest")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    convert = False if args.no_webp else None
+    manifest, stats = build_manifest(args.root, ASSET_DIRS, convert, args.workers, args.prune)
+
+    print(stats)
+    if not stats["webp"] and not args.no_webp:
+        print("⚠️ Pillow com WebP não encontrado: cópias no formato original")
+    print("📄 Manifest:", os.path.join(args.root, MANIFEST_JSON))
+
+
+if __name__ == "__main__":
+    main()
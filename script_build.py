@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Runner incremental: cada etapa declara entradas e saídas; a etapa só roda
+# se o hash do conteúdo das entradas mudou desde a última vez (ou se alguma
+# saída sumiu / foi mexida). Dependências saem sozinhas: quem lê um arquivo
+# depende de quem o produz. Etapas independentes rodam em paralelo.
+#
+# Etapas "manual" (browser logado, crawl da wiki inteira) só rodam quando
+# pedidas pelo nome ou com --all, e aí sempre rodam (o que muda é o site).
+
+# ========= CONFIG =========
+STATE_JSON = ".build_state.json"
+SNAPSHOT = "Characters and Skills - Naruto Arena Classic2.html"
+MISSIONS_JSON = os.path.join("missions_out", "missions.json")
+MISSION_IMAGES = os.path.join("missions_out", "images")
+PUBLIC_DIR = os.path.join("public", "assets", "nawiki")
+# ==========================
+
+
+def py(script, *args):
+    return [sys.executable, script, *args]
+
+
+def publish_mission_images():
+    # o front lê missions_out_translated_v3.json (tradução feita à mão a partir
+    # do missions.json); o "file" das imagens lá aponta pra missions_out/images/
+    dest = os.path.join(PUBLIC_DIR, "missions_out", "images")
+    os.makedirs(dest, exist_ok=True)
+    for name in sorted(os.listdir(MISSION_IMAGES)):
+        src, out = os.path.join(MISSION_IMAGES, name), os.path.join(dest, name)
+        if not os.path.exists(out) or os.path.getsize(out) != os.path.getsize(src):
+            shutil.copy2(src, out)
+
+
+# name, comando (lista = subprocess, função = roda no processo), entradas, saídas
+# ("optional": entradas que entram no hash/grafo mas podem não existir)
+STAGES = [
+    {"name": "skill_tokens", "cmd": py("script_skill_tokens.py"),
+     "inputs": [SNAPSHOT, "script_skill_tokens.py", "snapshot.py"],
+     "outputs": ["export/skill_tokens.json"]},
+    {"name": "facets", "cmd": py("script_facets.py"),
+     "inputs": [SNAPSHOT, "script_facets.py", "script_skill_tokens.py", "snapshot.py"],
+     "outputs": ["export/facets.json"]},
+    {"name": "search_index", "cmd": py("script_search_index.py"),
+     "inputs": [SNAPSHOT, "script_search_index.py", "script_skill_tokens.py", "snapshot.py"],
+     "outputs": ["export/search_en.json", "export/search_br.json"]},
+    {"name": "skill_matrix", "cmd": py("script_skill_matrix.py"),
+     "inputs": [SNAPSHOT, "script_skill_matrix.py", "script_facets.py", "script_skill_tokens.py", "snapshot.py"],
+     "outputs": ["export/skill_matrix.npz"]},
+    {"name": "team_eval", "cmd": py("script_team_eval.py"),
+     "inputs": ["export/skill_matrix.npz", "script_team_eval.py"],
+     "outputs": ["export/team_index.json"]},
+    {"name": "images", "cmd": py("script_images.py"),
+     "inputs": [SNAPSHOT, "script_images.py"],
+     "outputs": ["images"]},
+    {"name": "verify_images", "cmd": py("script_verify_images.py", "images"),
+     "inputs": ["images", "script_verify_images.py"],
+     "outputs": ["image_report.json"]},
+    {"name": "wiki", "cmd": py("script_text_image.py"), "manual": True,
+     "inputs": ["script_text_image.py"],
+     "outputs": [os.path.join("out_nawiki", "characters.json")]},
+    {"name": "name_match", "cmd": py("script_name_match.py"),
+     "inputs": [SNAPSHOT, os.path.join("out_nawiki", "characters.json"), "script_name_match.py"],
+     # só sai do script_only_text.py (fora do pipeline); o name_match roda sem ele
+     "optional": ["personagens.json"],
+     "outputs": ["export/id_map.json"]},
+    {"name": "missions", "cmd": py("script_missions_sync.py"), "manual": True,
+     "inputs": ["script_missions.py", "script_missions_sync.py"],
+     "outputs": [MISSIONS_JSON, MISSION_IMAGES]},
+    {"name": "mission_index", "cmd": py("script_mission_index.py"),
+     "inputs": [MISSIONS_JSON, "script_mission_index.py"],
+     "outputs": ["export/mission_index.json"]},
+    {"name": "publish_mission_images", "cmd": publish_mission_images,
+     "inputs": [MISSION_IMAGES],
+     "outputs": [os.path.join(PUBLIC_DIR, "missions_out", "images")]},
+    {"name": "asset_manifest", "cmd": py("script_asset_manifest.py"),
+     "inputs": [os.path.join(PUBLIC_DIR, "characters"), os.path.join(PUBLIC_DIR, "skills"),
+                os.path.join(PUBLIC_DIR, "missions_out", "images"), "script_asset_manifest.py"],
+     "outputs": [os.path.join(PUBLIC_DIR, "asset-manifest.json")]},
+]
+
+
+# ---------- fingerprint ----------
+
+class Hasher:
+    """
+    Hash do conteúdo de arquivos/pastas. O hash de cada arquivo fica em
+    cache por (tamanho, mtime) — pasta com 3000 imagens não é relida
+    inteira a cada build.
+    """
+
+    def __init__(self, cache: dict):
+        self.cache = cache
+        self.lock = threading.Lock()
+
+    def file(self, path: str) -> str:
+        st = os.stat(path)
+        key = f"{st.st_size}:{st.st_mtime_ns}"
+        with self.lock:
+            hit = self.cache.get(path)
+        if hit and hit[0] == key:
+            return hit[1]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self.lock:
+            self.cache[path] = [key, digest]
+        return digest
+
+    def paths(self, paths) -> str:
+        h = hashlib.sha256()
+        for p in paths:
+            h.update(p.encode("utf-8"))
+            if os.path.isdir(p):
+                for cur, dirs, files in os.walk(p):
+                    dirs.sort()
+                    for name in sorted(files):
+                        fp = os.path.join(cur, name)
+                        h.update(fp.encode("utf-8"))
+                        h.update(self.file(fp).encode())
+            elif os.path.exists(p):
+                h.update(self.file(p).encode())
+            else:
+                h.update(b"<missing>")
+        return h.hexdigest()
+
+
+def load_state(path: str = STATE_JSON) -> dict:
+    if not os.path.exists(path):
+        return {"stages": {}, "files": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state: dict, path: str = STATE_JSON, lock: threading.Lock = None):
+    # as threads do pool continuam enchendo state["files"] (Hasher.file):
+    # grava uma cópia tirada sob o lock do Hasher
+    if lock is not None:
+        with lock:
+            state = dict(state, files=dict(state["files"]))
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+# ---------- grafo ----------
+
+def stage_inputs(st: dict) -> list:
+    return st["inputs"] + st.get("optional", [])
+
+
+def build_graph(stages):
+    """
+    {etapa: {etapas das quais depende}} — A depende de B se lê algo que B produz.
+    """
+    producers = {}
+    for st in stages:
+        for out in st["outputs"]:
+            producers[os.path.normpath(out)] = st["name"]
+    deps = {}
+    for st in stages:
+        deps[st["name"]] = {producers[os.path.normpath(i)] for i in stage_inputs(st)
+                            if os.path.normpath(i) in producers and producers[os.path.normpath(i)] != st["name"]}
+    return deps
+
+
+def select(stages, deps, targets, include_manual: bool):
+    """
+    Etapas pedidas + tudo que vem depois delas no grafo (quem consome as
+    saídas). Sem alvo: todas (menos as manuais, sem --all).
+    """
+    by_name = {st["name"]: st for st in stages}
+    if not targets:
+        return [n for n, st in by_name.items() if include_manual or not st.get("manual")]
+
+    unknown = [t for t in targets if t not in by_name]
+    if unknown:
+        raise SystemExit(f"Etapas desconhecidas: {unknown} (use --list)")
+    chosen = set(targets)
+    changed = True
+    while changed:
+        changed = False
+        for name, d in deps.items():
+            if name not in chosen and d & chosen and (include_manual or not by_name[name].get("manual")):
+                chosen.add(name)
+                changed = True
+    return [n for n in by_name if n in chosen]
+
+
+# ---------- execução ----------
+
+def run_stage(st: dict) -> float:
+    t0 = time.time()
+    if callable(st["cmd"]):
+        st["cmd"]()
+    else:
+        # manuais ficam com o terminal (login no browser, input())
+        quiet = not st.get("manual")
+        subprocess.run(st["cmd"], check=True, stdout=subprocess.DEVNULL if quiet else None)
+    return time.time() - t0
+
+
+def build(stages, targets=None, include_manual=False, force=False, dry_run=False, workers=4):
+    by_name = {st["name"]: st for st in stages}
+    deps = build_graph(stages)
+    chosen = select(stages, deps, targets, include_manual)
+    state = load_state()
+    hasher = Hasher(state.setdefault("files", {}))
+
+    pending = {n: deps[n] & set(chosen) for n in chosen}
+    report = {}
+
+    def decide(name):
+        st = by_name[name]
+        in_hash = hasher.paths(stage_inputs(st))
+        out_hash = hasher.paths(st["outputs"])
+        if st.get("manual"):
+            return in_hash  # a entrada de verdade é o site: pediu, roda
+        prev = state["stages"].get(name) or {}
+        missing = [o for o in st["outputs"] if not os.path.exists(o)]
+        if not force and not missing and prev.get("inputs") == in_hash and prev.get("outputs") == out_hash:
+            return None
+        return in_hash
+
+    def execute(name, in_hash):
+        # roda no pool: devolve o registro, quem mexe em state["stages"] é a thread principal
+        st = by_name[name]
+        seconds = run_stage(st)
+        return {
+            "inputs": in_hash,
+            "outputs": hasher.paths(st["outputs"]),
+            "seconds": round(seconds, 2),
+            "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        while pending or running:
+            ready = [n for n, d in pending.items() if not d]
+            for name in ready:
+                del pending[name]
+                blocked = [d for d in deps[name] if report.get(d, {}).get("status") in ("failed", "blocked", "no-input")]
+                if blocked:
+                    report[name] = {"status": "blocked", "seconds": 0.0}
+                    _release(pending, name)
+                    continue
+                missing = [i for i in by_name[name]["inputs"] if not os.path.exists(i)]
+                if missing and not dry_run:
+                    report[name] = {"status": "no-input", "seconds": 0.0, "error": f"faltando: {missing}"}
+                    _release(pending, name)
+                    continue
+                in_hash = decide(name)
+                if in_hash is None:
+                    report[name] = {"status": "up-to-date", "seconds": 0.0}
+                    _release(pending, name)
+                elif dry_run:
+                    report[name] = {"status": "would-run", "seconds": 0.0}
+                    _release(pending, name)
+                else:
+                    print(f"▶ {name}")
+                    running[ex.submit(execute, name, in_hash)] = name
+
+            if not running:
+                if pending and not any(not d for d in pending.values()):
+                    raise SystemExit(f"Ciclo entre etapas: {sorted(pending)}")
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                try:
+                    record = fut.result()
+                    state["stages"][name] = record
+                    report[name] = {"status": "ran", "seconds": record["seconds"]}
+                except Exception as e:
+                    report[name] = {"status": "failed", "seconds": 0.0, "error": str(e)}
+                _release(pending, name)
+            if not dry_run:
+                save_state(state, lock=hasher.lock)
+
+    if not dry_run:
+        save_state(state)
+    return [(n, report[n]) for n in chosen]
+
+
+def _release(pending: dict, name: str):
+    for d in pending.values():
+        d.discard(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roda as etapas do pipeline que estão desatualizadas.")
+    parser.add_argument("stages", nargs="*", help="Etapas (e o que depende delas); vazio = todas")
+    parser.add_argument("--all", action="store_true", help="Inclui etapas manuais (browser/crawl da wiki)")
+    parser.add_argument("--force", action="store_true", help="Roda mesmo se estiver em dia")
+    parser.add_argument("--dry-run", action="store_true", help="Só mostra o que rodaria")
+    parser.add_argument("--list", action="store_true", help="Lista as etapas e dependências")
+    parser.add_argument("-j", "--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.list:
+        deps = build_graph(STAGES)
+        for st in STAGES:
+            tag = " (manual)" if st.get("manual") else ""
+            print(f"{st['name']}{tag} <- {', '.join(sorted(deps[st['name']])) or '-'}")
+        return
+
+    t0 = time.time()
+    report = build(STAGES, args.stages, args.all, args.force, args.dry_run, args.workers)
+
+    print()
+    for name, r in report:
+        extra = f"  {r['error']}" if r.get("error") else ""
+        print(f"{r['status']:>11}  {r['seconds']:7.2f}s  {name}{extra}")
+    print(f"\nTotal: {time.time() - t0:.2f}s")
+    if any(r["status"] == "failed" for _, r in report):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import os
+import re
+import json
+
+from script_skill_tokens import load_chars_from_next_data, tokenize_description
+
+# ========= CONFIG =========
+OUT_DIR = "export"
+OUT_JSON = os.path.join(OUT_DIR, "facets.json")
+
+# bits por palavra do bitset (32 cabe certinho em number/Uint32Array no JS)
+WORD_BITS = 32
+# ==========================
+
+# energy do site (Tai/Nin/...) -> ChakraType usado no front (src/lib/types.ts)
+ENERGY_NAMES = {
+    "Tai": "Taijutsu",
+    "Nin": "Ninjutsu",
+    "Gen": "Genjutsu",
+    "Blood": "Bloodline",
+    "Random": "Random",
+}
+
+# classes "de verdade"; o snapshot tem lixo tipo "_$1", "allyBypass", "Instant*"
+KNOWN_CLASSES = {
+    "Physical", "Chakra", "Mental", "Affliction", "Unique", "Ranged", "Melee",
+    "Instant", "Action", "Control", "Passive", "Harmful", "Helpful", "Piercing",
+    "Strategic", "Energy", "Summon",
+}
+
+
+def cooldown_bucket(cd) -> str:
+    cd = int(cd or 0)
+    if cd <= 0:
+        return "0"
+    if cd >= 4:
+        return "4+"
+    return str(cd)
+
+
+def normalize_class(raw: str):
+    c = (raw or "").strip("*$_ 0123456789")
+    c = c[:1].upper() + c[1:]
+    return c if c in KNOWN_CLASSES else None
+
+
+def skill_tags(tokens) -> set:
+    """
+    Heurística de TeamTag (AVAILABLE_TEAM_TAGS em src/lib/data.ts)
+    a partir dos spans da descrição em inglês.
+    """
+    tags = set()
+    full = " ".join(t[1] for t in tokens).lower()
+
+    for tok in tokens:
+        kind, text = tok[0], tok[1].lower()
+        if kind == "Effects" and "stun" in text:
+            tags.add("Stun")
+        if kind == "Defense":
+            tags.add("Defense")
+        if kind == "Improvements":
+            tags.add("Buffer")
+        if kind == "Damage" and re.search(r"each turn|every turn|for \d+ turns", full):
+            tags.add("Damage Over Time")
+
+    if re.search(r"all enem", full) and "damage" in full:
+        tags.add("AoE Damage")
+    if re.search(r"steal|remove[sd]? \d+ .*chakra|lose \d+ .*chakra", full):
+        tags.add("Chakra Steal")
+    return tags
+
+
+def char_facets(ch: dict) -> dict:
+    energy, classes, cooldowns, tags = set(), set(), set(), set()
+
+    for sk in ch.get("skills", []):
+        for e in sk.get("energy") or []:
+            energy.add(ENERGY_NAMES.get(e, e))
+        for c in sk.get("classes") or []:
+            c = normalize_class(c)
+            if c:
+                classes.add(c)
+        cooldowns.add(cooldown_bucket(sk.get("cooldown")))
+        tags |= skill_tags(tokenize_description(sk.get("description") or ""))
+
+    return {"energy": energy, "class": classes, "cooldown": cooldowns, "tag": tags}
+
+
+def to_words(bits: int, n: int) -> list[int]:
+    """
+    Bitset (bit i = personagem i) -> lista de palavras uint32.
+    A interseção no front é um AND palavra a palavra.
+    """
+    words = (n + WORD_BITS - 1) // WORD_BITS
+    mask = (1 << WORD_BITS) - 1
+    return [(bits >> (WORD_BITS * w)) & mask for w in range(words)]
+
+
+def build_facets(chars):
+    """
+    Índice invertido facet -> valor -> bitset de ids de personagem.
+    O id é a posição em pageProps.chars (igual ao shortcut_c do site).
+    """
+    index = {"energy": {}, "class": {}, "cooldown": {}, "tag": {}}
+
+    for i, ch in enumerate(chars):
+        for facet, values in char_facets(ch).items():
+            for v in values:
+                index[facet][v] = index[facet].get(v, 0) | (1 << i)
+
+    n = len(chars)
+    return {
+        "wordBits": WORD_BITS,
+        "chars": [ch.get("name") for ch in chars],
+        "facets": {
+            facet: {v: to_words(bits, n) for v, bits in sorted(values.items())}
+            for facet, values in index.items()
+        },
+    }
+
+
+def decode_words(words) -> int:
+    bits = 0
+    for w, val in enumerate(words):
+        bits |= val << (WORD_BITS * w)
+    return bits
+
+
+def query(index: dict, **filters) -> list[str]:
+    """
+    query(idx, energy=["Taijutsu"], **{"class": ["Melee"]}) -> nomes
+    Dentro de um facet os valores são OR; entre facets é AND.
+    """
+    names = index["chars"]
+    result = (1 << len(names)) - 1
+    for facet, values in filters.items():
+        if isinstance(values, str):
+            values = [values]
+        acc = 0
+        for v in values:
+            acc |= decode_words(index["facets"][facet].get(v, []))
+        result &= acc
+    return [name for i, name in enumerate(names) if result >> i & 1]
+
+
+def main():
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+    chars = load_chars_from_next_data()
+    index = build_facets(chars)
+
+    for facet, values in index["facets"].items():
+        print(f"{facet}: {', '.join(values)}")
+
+    with open(OUT_JSON, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+
+    print("\n✅ Concluído!")
+    print("📄 JSON:", OUT_JSON)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import download_guard
+import records
+from script_missions import OUT_JSON as MISSIONS_JSON
+
+# Publica o resultado dos scrapers no Firestore (o mesmo projeto do
+# src/lib/firebase.ts) escrevendo só o que mudou:
+#   1. monta os documentos e um hash do conteúdo de cada um
+#   2. lê do Firestore só o campo _hash da coleção (select) e compara
+#   3. grava os diferentes em lotes de 500 (limite do Firestore), vários
+#      commits em paralelo, com retry/backoff nos erros transitórios
+# Testa local com o emulador: firebase emulators:start --only firestore
+# e rode com --emulator localhost:8080 (ou FIRESTORE_EMULATOR_HOST).
+
+# ========= CONFIG =========
+CHARACTERS_JSON = os.path.join("out_nawiki", "characters.json")   # script_text_image.py
+PROJECT_ID = os.environ.get("NEXT_PUBLIC_FIREBASE_PROJECT_ID") or os.environ.get("GOOGLE_CLOUD_PROJECT")
+
+MAX_BATCH = 500          # limite de escritas por commit do Firestore
+CONCURRENCY = 8          # commits em paralelo
+MAX_RETRIES = 5
+HASH_FIELD = "_hash"
+# ==========================
+
+COLLECTIONS = ("characters", "missionSessions", "missions")
+
+
+def content_hash(doc: dict) -> str:
+    raw = json.dumps(doc, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def character_docs(path: str) -> dict:
+    """
+    {id: doc} no schema do front (records.Character), sem os campos
+    internos "_xxx" dos scrapers.
+    """
+    docs = {}
+    for raw in records.read_json(path):
+        ch = records.from_dict(records.Character, raw)
+        ch.extra = {}
+        for sk in ch.skills:
+            sk.extra = {}
+        docs[ch.id] = records.to_dict(ch)
+    return docs
+
+
+def mission_docs(path: str):
+    """
+    missions.json -> ({id: sessão sem missões}, {id: missão + sessionId}).
+    """
+    sessions, missions = {}, {}
+    data = records.read_json(path)
+    for order, raw in enumerate(data.get("sessions", [])):
+        sess = records.to_dict(records.from_dict(records.Session, raw))
+        mission_list = sess.pop("missions")
+        sess["order"] = order
+        sess["missionIds"] = [m["id"] for m in mission_list]
+        sessions[sess["id"]] = sess
+        for m in mission_list:
+            missions[m["id"]] = dict(m, sessionId=sess["id"])
+    return sessions, missions
+
+
+def plan_writes(docs: dict, remote_hashes: dict, prune: bool = False):
+    """
+    Compara com o estado do Firestore ({id: _hash}).
+    Retorna (sets {id: doc com _hash}, deletes [ids], inalterados).
+    """
+    sets = {}
+    unchanged = 0
+    for doc_id, doc in docs.items():
+        h = content_hash(doc)
+        if remote_hashes.get(doc_id) == h:
+            unchanged += 1
+        else:
+            sets[doc_id] = dict(doc, **{HASH_FIELD: h})
+    deletes = sorted(set(remote_hashes) - set(docs)) if prune else []
+    return sets, deletes, unchanged
+
+
+def chunks(items: list, size: int = MAX_BATCH):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ---------- Firestore ----------
+
+def get_client(project: str, emulator: str = None):
+    if emulator:
+        os.environ["FIRESTORE_EMULATOR_HOST"] = emulator
+    from google.cloud import firestore
+
+    return firestore.Client(project=project)
+
+
+def fetch_remote_hashes(client, collection: str) -> dict:
+    # select() traz só o _hash: cada doc ainda conta como leitura, mas o
+    # payload é mínimo
+    out = {}
+    for snap in client.collection(collection).select([HASH_FIELD]).stream():
+        out[snap.id] = (snap.to_dict() or {}).get(HASH_FIELD)
+    return out
+
+
+def is_transient(e: Exception) -> bool:
+    from google.api_core import exceptions as gexc
+
+    return isinstance(e, (gexc.Aborted, gexc.DeadlineExceeded, gexc.ServiceUnavailable,
+                          gexc.ResourceExhausted, gexc.InternalServerError))
+
+
+def commit_batch(client, collection: str, ops: list):
+    """
+    ops: [("set", id, doc) | ("delete", id, None)] — no máximo MAX_BATCH.
+    O lote é atômico, então repetir depois de um erro é seguro.
+    """
+    coll = client.collection(collection)
+    for attempt in range(MAX_RETRIES):
+        batch = client.batch()
+        for op, doc_id, doc in ops:
+            if op == "set":
+                batch.set(coll.document(doc_id), doc)
+            else:
+                batch.delete(coll.document(doc_id))
+        try:
+            batch.commit()
+            return len(ops)
+        except Exception as e:
+            if attempt == MAX_RETRIES - 1 or not is_transient(e):
+                raise
+            time.sleep(download_guard.backoff(attempt))
+
+
+def publish(client, collection: str, docs: dict, prune: bool = False, dry_run: bool = False,
+            concurrency: int = CONCURRENCY) -> dict:
+    remote = fetch_remote_hashes(client, collection)
+    sets, deletes, unchanged = plan_writes(docs, remote, prune)
+    stats = {"set": len(sets), "delete": len(deletes), "unchanged": unchanged, "remote": len(remote)}
+    if dry_run:
+        return stats
+
+    ops = [("set", k, v) for k, v in sets.items()] + [("delete", k, None) for k in deletes]
+    written = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        futures = [ex.submit(commit_batch, client, collection, batch) for batch in chunks(ops)]
+        for fut in as_completed(futures):
+            written += fut.result()
+    stats["written"] = written
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publica characters/missions no Firestore gravando só o que mudou.")
+    parser.add_argument("--characters", default=CHARACTERS_JSON, help=f"default: {CHARACTERS_JSON}")
+    parser.add_argument("--missions", default=MISSIONS_JSON, help=f"default: {MISSIONS_JSON}")
+    parser.add_argument("--only", choices=COLLECTIONS, action="append", help="Só essas coleções (repetível)")
+    parser.add_argument("--project", default=PROJECT_ID, help="Projeto (default: NEXT_PUBLIC_FIREBASE_PROJECT_ID)")
+    parser.add_argument("--emulator", default=os.environ.get("FIRESTORE_EMULATOR_HOST"), help="host:porta do emulador")
+    parser.add_argument("--prune", action="store_true", help="Apaga docs que não existem mais no scrape")
+    parser.add_argument("--dry-run", action="store_true", help="Só mostra o diff")
+    parser.add_argument("-j", "--concurrency", type=int, default=CONCURRENCY)
+    args = parser.parse_args()
+
+    if not args.project:
+        raise SystemExit("Defina --project ou NEXT_PUBLIC_FIREBASE_PROJECT_ID")
+
+    wanted = set(args.only or COLLECTIONS)
+    payload = {}
+    if "characters" in wanted and os.path.exists(args.characters):
+        payload["characters"] = character_docs(args.characters)
+    if wanted & {"missionSessions", "missions"} and os.path.exists(args.missions):
+        sessions, missions = mission_docs(args.missions)
+        payload["missionSessions"] = sessions
+        payload["missions"] = missions
+    payload = {k: v for k, v in payload.items() if k in wanted}
+
+    client = get_client(args.project, args.emulator)
+    print(f"Firestore: {args.project}" + (f" (emulador {args.emulator})" if args.emulator else ""))
+
+    t0 = time.time()
+    for collection, docs in payload.items():
+        stats = publish(client, collection, docs, args.prune, args.dry_run, args.concurrency)
+        print(f"{collection}: {stats}")
+    print(f"\n✅ Concluído em {time.time() - t0:.1f}s" + (" (dry-run)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import download_guard
+import script_images as si
+from script_verify_images import sniff_format
+
+# ========= CONFIG =========
+HOST = "127.0.0.1"
+PORT = 8765
+CACHE_DIR = ".image_cache"
+MAX_CACHE_MB = 200
+BROWSER_MAX_AGE = 86400  # Cache-Control pro navegador
+# ==========================
+
+# Proxy de imagens pro dev/staging: mesmos nomes do script_images.py
+# (/characters/<slug>.png, /skills/<slug>__<skill>.png), mas baixa do imgur
+# na primeira vez que alguém pede. Cache em disco com LRU por tamanho total;
+# pedidos simultâneos da mesma imagem viram um download só.
+
+CONTENT_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "gif": "image/gif", "webp": "image/webp"}
+
+
+def build_routes(chars) -> dict:
+    """
+    {"characters/uzumaki-naruto.png": url, "skills/...": url}
+    """
+    routes = {}
+    for url, path in si.collect_downloads(chars):
+        rel = os.path.relpath(path, si.OUT_DIR).replace("\\", "/")
+        routes.setdefault(rel, url)
+    return routes
+
+
+class LRUCache:
+    """
+    Arquivos em cache_dir; a ordem de uso fica em memória (e no mtime, pra
+    sobreviver a um restart). Passou de max_bytes -> apaga os mais antigos.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> bytes
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._scan()
+
+    def _scan(self):
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if ".part-" in name:
+                    continue
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                key = os.path.relpath(path, self.cache_dir).replace("\\", "/")
+                found.append((st.st_mtime, key, st.st_size))
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.total += size
+        self._evict()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, *key.split("/"))
+
+    def get(self, key: str):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, key: str, size: int):
+        with self.lock:
+            self.total += size - self.entries.pop(key, 0)
+            self.entries[key] = size
+            self.misses += 1
+            self._evict(keep=key)
+
+    def _evict(self, keep: str = None):
+        while self.total > self.max_bytes and self.entries:
+            key, size = next(iter(self.entries.items()))
+            if key == keep:
+                break
+            del self.entries[key]
+            self.total -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "files": len(self.entries),
+                "mb": round(self.total / (1024 * 1024), 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class ImageProxy:
+    def __init__(self, routes: dict, cache: LRUCache, local_dir: str = si.OUT_DIR):
+        self.routes = routes
+        self.cache = cache
+        self.local_dir = local_dir
+        self.inflight = {}  # key -> Event (single-flight)
+        self.lock = threading.Lock()
+
+    def resolve(self, key: str):
+        """
+        Caminho do arquivo pra servir, ou None (404/502).
+        Ordem: pasta do script_images.py (se já baixou) -> cache -> imgur.
+        """
+        url = self.routes.get(key)
+        if url is None:
+            return None
+
+        local = os.path.join(self.local_dir, *key.split("/"))
+        if os.path.exists(local):
+            return local
+
+        path = self.cache.get(key)
+        if path is not None:
+            return path
+
+        with self.lock:
+            event = self.inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self.inflight[key] = threading.Event()
+
+        if not leader:
+            # outra thread já está baixando: espera e lê do cache
+            # (se o download dela falhou, esse pedido também falha)
+            event.wait()
+            return self.cache.get(key)
+
+        try:
+            return self._fetch(key, url)
+        finally:
+            with self.lock:
+                del self.inflight[key]
+            event.set()
+
+    def _fetch(self, key: str, url: str):
+        path = self.cache.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for attempt in range(si.MAX_RETRIES):
+            try:
+                status = download_guard.fetch_to_file(
+                    si.get_session().get, url, path, tracker=si._latency, before=si.rate_limit
+                )
+            except Exception as e:
+                logging.error(f"Proxy falhou: {url} -> {key} | {e}")
+                code = getattr(getattr(e, "response", None), "status_code", None)
+                if code is not None and 400 <= code < 500:
+                    return None  # 404/403: link morto, repetir não adianta
+                time.sleep(download_guard.backoff(attempt))
+                continue
+            if status == 429:
+                time.sleep(download_guard.backoff(attempt))
+                continue
+
+            with open(path, "rb") as f:
+                fmt = sniff_format(f.read(64))
+            if fmt not in CONTENT_TYPES:
+                # imgur às vezes devolve página HTML com 200: não cacheia
+                logging.error(f"Proxy: resposta não é imagem ({fmt}): {url}")
+                os.remove(path)
+                return None
+            self.cache.put(key, os.path.getsize(path))
+            return path
+        return None
+
+
+def make_handler(proxy: ImageProxy):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            key = self.path.split("?", 1)[0].lstrip("/")
+            if key == "_stats":
+                body = str(proxy.cache.stats()).encode("utf-8")
+                return self._send(200, body, "text/plain; charset=utf-8")
+
+            data = None
+            for _ in range(2):
+                path = proxy.resolve(key)
+                if path is None:
+                    break
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    break
+                except FileNotFoundError:
+                    # o LRU removeu entre o resolve e o open: resolve de novo
+                    continue
+            if data is None:
+                code = 404 if key not in proxy.routes else 502
+                return self._send(code, b"", "text/plain")
+            ctype = CONTENT_TYPES.get(sniff_format(data[:64]), "application/octet-stream")
+            self._send(200, data, ctype, cache=True)
+
+        def _send(self, code: int, body: bytes, ctype: str, cache: bool = False):
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            if cache:
+                self.send_header("Cache-Control", f"public, max-age={BROWSER_MAX_AGE}")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proxy local de imagens com cache em disco (LRU por tamanho).")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--max-mb", type=int, default=MAX_CACHE_MB)
+    args = parser.parse_args()
+
+    logging.basicConfig(filename="download_errors.log", level=logging.ERROR, format="%(asctime)s - %(message)s")
+    os.makedirs(args.cache_dir, exist_ok=True)
+
+    routes = build_routes(si.load_chars_from_next_data())
+    cache = LRUCache(args.cache_dir, args.max_mb * 1024 * 1024)
+    proxy = ImageProxy(routes, cache)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(proxy))
+    print(f"{len(routes)} imagens mapeadas | cache: {cache.stats()}")
+    print(f"🖼️ http://{args.host}:{args.port}/characters/uzumaki-naruto.png")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("🧠 Cache:", cache.stats())
+
+
+if __name__ == "__main__":
+    main()
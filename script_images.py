@@ -1,12 +1,11 @@
 import os
 import re
-import json
 import time
-import random
 import logging
-import requests
-from bs4 import BeautifulSoup
-from tqdm import tqdm
+import threading
+
+import snapshot
+import download_guard
 
 # ========= CONFIG =========
 HTML_FILE = "Characters and Skills - Naruto Arena Classic2.html"
@@ -18,29 +17,42 @@ REQUESTS_PER_SECOND = 2
 MAX_RETRIES = 6
 # ==========================
 
-os.makedirs(CHAR_DIR, exist_ok=True)
-os.makedirs(SKILL_DIR, exist_ok=True)
-
-logging.basicConfig(
-    filename="download_errors.log",
-    level=logging.ERROR,
-    format="%(asctime)s - %(message)s"
-)
-
-session = requests.Session()
-session.headers.update({
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-})
-
+# Nada roda no import: pastas e log só em setup() (chamado pelo main),
+# sessão HTTP só no primeiro download.
+_session = None
 _last_req = 0.0
+_rate_lock = threading.Lock()  # o hedge do download_guard chama de outra thread
+_latency = download_guard.LatencyTracker()
+
+def setup():
+    os.makedirs(CHAR_DIR, exist_ok=True)
+    os.makedirs(SKILL_DIR, exist_ok=True)
+
+    logging.basicConfig(
+        filename="download_errors.log",
+        level=logging.ERROR,
+        format="%(asctime)s - %(message)s"
+    )
+
+def get_session():
+    global _session
+    if _session is None:
+        import requests
+
+        _session = requests.Session()
+        _session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        })
+    return _session
 
 def rate_limit():
     global _last_req
-    min_interval = 1 / REQUESTS_PER_SECOND
-    elapsed = time.time() - _last_req
-    if elapsed < min_interval:
-        time.sleep(min_interval - elapsed)
-    _last_req = time.time()
+    with _rate_lock:
+        min_interval = 1 / REQUESTS_PER_SECOND
+        elapsed = time.time() - _last_req
+        if elapsed < min_interval:
+            time.sleep(min_interval - elapsed)
+        _last_req = time.time()
 
 def slug(s: str) -> str:
     s = (s or "").strip().lower()
@@ -56,41 +68,31 @@ def download(url: str, path: str):
 
     for attempt in range(MAX_RETRIES):
         try:
-            rate_limit()
-            r = session.get(url, timeout=30, stream=True)
+            # prazo total + detector de travamento + hedge acima do p95
+            status = download_guard.fetch_to_file(
+                get_session().get, url, path, tracker=_latency, before=rate_limit
+            )
 
-            if r.status_code == 429:
-                wait = (2 ** attempt) + random.uniform(0.5, 1.5)
-                time.sleep(wait)
+            if status == 429:
+                time.sleep(download_guard.backoff(attempt))
                 continue
 
-            r.raise_for_status()
-
-            with open(path, "wb") as f:
-                for chunk in r.iter_content(8192):
-                    if chunk:
-                        f.write(chunk)
             return
 
         except Exception as e:
             if attempt == MAX_RETRIES - 1:
                 logging.error(f"Falhou: {url} -> {path} | {e}")
             else:
-                time.sleep(2 ** attempt)
+                time.sleep(download_guard.backoff(attempt))
 
 def load_chars_from_next_data():
-    html = open(HTML_FILE, encoding="utf-8", errors="ignore").read()
-    soup = BeautifulSoup(html, "html.parser")
-    script = soup.find("script", id="__NEXT_DATA__")
-    data = json.loads(script.string)
-    pageProps = data["props"]["pageProps"]
-    return pageProps["chars"]
-
-def main():
-    chars = load_chars_from_next_data()
-
-    downloads = []
+    return list(snapshot.iter_characters(HTML_FILE))
 
+def iter_skill_images(chars):
+    """
+    Gera (url, path) de todas as imagens de personagem e skill.
+    Pode repetir (url, path); collect_downloads() remove duplicatas.
+    """
     for ch in chars:
         ch_name = ch.get("name")
         ch_url = ch.get("url")          # imagem do personagem
@@ -98,9 +100,9 @@ def main():
 
         # personagem
         if ch_url:
-            downloads.append((ch_url, os.path.join(CHAR_DIR, f"{slug(ch_name)}.png")))
+            yield ch_url, os.path.join(CHAR_DIR, f"{slug(ch_name)}.png")
         if ch_theme:
-            downloads.append((ch_theme, os.path.join(CHAR_DIR, f"{slug(ch_name)}__old.png")))
+            yield ch_theme, os.path.join(CHAR_DIR, f"{slug(ch_name)}__old.png")
 
         # skills do personagem (aqui está o pulo do gato)
         for sk in ch.get("skills", []):
@@ -110,12 +112,20 @@ def main():
 
             base = f"{slug(ch_name)}__{slug(sk_name)}"
             if sk_url:
-                downloads.append((sk_url, os.path.join(SKILL_DIR, f"{base}.png")))
+                yield sk_url, os.path.join(SKILL_DIR, f"{base}.png")
             if sk_theme:
-                downloads.append((sk_theme, os.path.join(SKILL_DIR, f"{base}__old.png")))
+                yield sk_theme, os.path.join(SKILL_DIR, f"{base}__old.png")
 
+def collect_downloads(chars):
     # remove duplicatas por URL+path
-    downloads = list(dict.fromkeys(downloads))
+    return list(dict.fromkeys(iter_skill_images(chars)))
+
+def main():
+    from tqdm import tqdm
+
+    setup()
+    chars = load_chars_from_next_data()
+    downloads = collect_downloads(chars)
 
     print(f"Total para baixar/verificar: {len(downloads)}")
     for url, path in tqdm(downloads, desc="Baixando imagens"):
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+
+import records
+import snapshot
+from script_missions import OUT_JSON as MISSIONS_JSON, iter_missions
+from script_name_match import MIN_SCORE, NgramIndex, normalize_name
+
+# Os objetivos das missões vêm do site só como texto ("Win 3 battles in a
+# row with Rock Lee. (2/3)"). Aqui cada texto vira um predicado estruturado
+# e um log de partidas (JSONL, uma partida por linha) é lido UMA vez,
+# atualizando o progresso de todas as missões de todos os jogadores: cada
+# partida só olha os objetivos dos personagens que estavam no time
+# (índice personagem -> objetivos).
+#
+# Linha do log:
+#   {"player": "nick", "won": true,
+#    "team": ["Uzumaki Naruto", "Uchiha Sasuke", "Haruno Sakura"],
+#    "skills": [{"character": "Uchiha Sasuke", "skill": "Chidori",
+#                "count": 1, "targetEffects": ["Sharingan"]}]}
+# ("skills" e "count" são opcionais; .jsonl.gz também serve)
+
+# ========= CONFIG =========
+OUT_DIR = "export"
+GOALS_JSON = os.path.join(OUT_DIR, "mission_goals.json")
+OUT_JSON = os.path.join(OUT_DIR, "mission_progress.json")
+BATTLE_LOG = "battles.jsonl"
+
+# "any Ninja of the Team 7" sem lista no texto: membros mantidos à mão
+GROUPS = {
+    "Team 7": ["Uzumaki Naruto", "Uchiha Sasuke", "Haruno Sakura"],
+    "Team 8": ["Inuzuka Kiba", "Aburame Shino", "Hyuuga Hinata"],
+    "Team 9": ["Rock Lee", "Hyuuga Neji", "Tenten"],
+    "Team 10": ["Nara Shikamaru", "Akimichi Chouji", "Yamanaka Ino"],
+    "Sand Village": ["Gaara of the Desert", "Gaara Rehabilitated", "Shukaku Gaara", "Kankuro", "Temari", "Baki"],
+}
+# apelidos das listas entre parênteses que batem com mais de um personagem
+ALIASES = {
+    "Gaara": "Gaara of the Desert",
+}
+# ==========================
+
+PROGRESS_RE = re.compile(r"\s*\((\d+)\s*/\s*(\d+)\)\s*$")
+WIN_RE = re.compile(r"^Win (\d+) battles?( in a row)? with (.+)$", re.I)
+USE_RE = re.compile(r"^Use (.+?)'s \"(.+?)\"(?: on an enemy affected by \"(.+?)\")? (\d+) times?$", re.I)
+SAME_TEAM_RE = re.compile(r"\s+on the same team$", re.I)
+GROUP_RE = re.compile(r"^any Ninja of the (.+?)(?:\s*\((.+)\))?$", re.I)
+
+
+# ---------- compilação ----------
+
+def split_names(text: str, sep: str):
+    """
+    'A, B and C' -> [A, B, C] (sep = 'and' ou 'or').
+    """
+    parts = re.split(rf",\s*|\s+{sep}\s+", text)
+    return [p.strip() for p in parts if p.strip()]
+
+
+def compile_goal(text: str) -> dict:
+    """
+    Texto do objetivo -> predicado:
+      counter    "win" | "streak" | "use" | "unknown"
+      characters nomes (como no texto; compile_missions troca pelos do snapshot)
+      mode       "any" (basta um no time) | "all" (todos no mesmo time)
+      count      alvo
+      skill / targetEffect  só no "use"
+      group      nome do grupo ("any Ninja of the ..."), se houver
+    """
+    goal = {"text": text, "counter": "unknown", "characters": [], "mode": "any", "count": 0}
+    body = PROGRESS_RE.sub("", text).strip().rstrip(".").strip()
+
+    m = USE_RE.match(body)
+    if m:
+        goal.update(counter="use", characters=[m.group(1).strip()], skill=m.group(2),
+                    count=int(m.group(4)))
+        if m.group(3):
+            goal["targetEffect"] = m.group(3)
+        return goal
+
+    m = WIN_RE.match(body)
+    if not m:
+        return goal
+    goal.update(counter="streak" if m.group(2) else "win", count=int(m.group(1)))
+    who = m.group(3).strip()
+
+    g = GROUP_RE.match(who)
+    if g:
+        goal["group"] = g.group(1).strip()
+        if g.group(2):
+            # "Gaara/Gaara Rehabilitated, Kankuro, Temari"
+            goal["characters"] = [n.strip() for part in split_names(g.group(2), "and") for n in part.split("/")]
+        else:
+            goal["characters"] = list(GROUPS.get(goal["group"], []))
+        return goal
+
+    if SAME_TEAM_RE.search(who):
+        goal.update(mode="all", characters=split_names(SAME_TEAM_RE.sub("", who), "and"))
+    else:
+        goal["characters"] = split_names(who, "or")
+    return goal
+
+
+class Roster:
+    """
+    Resolve os nomes dos textos pros nomes do snapshot: exato, apelido,
+    token único ("Dosu" -> "Kinuta Dosu") e, por último, trigram.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.by_norm = {normalize_name(n): n for n in self.names}
+        self.index = NgramIndex()
+        for n in self.names:
+            self.index.add(n, n)
+
+    def resolve(self, name: str):
+        if not self.names:
+            return name
+        name = ALIASES.get(name, name)
+        norm = normalize_name(name)
+        if norm in self.by_norm:
+            return self.by_norm[norm]
+        tokens = set(norm.split())
+        hits = [n for key, n in self.by_norm.items() if tokens <= set(key.split()) and not key.endswith(" s")]
+        if len(hits) == 1:
+            return hits[0]
+        best = self.index.candidates(name, limit=1)
+        if best and best[0][1] >= MIN_SCORE:
+            return best[0][0]
+        return None
+
+
+def compile_missions(missions_json: str, roster: Roster):
+    """
+    [predicado + missionId + goalIndex] de todas as missões, com os nomes
+    já resolvidos. Nomes que não bateram ficam em "unresolved".
+    """
+    goals = []
+    for _, mission in iter_missions(missions_json):
+        for i, g in enumerate(mission.get("goals") or []):
+            goal = compile_goal(g.get("text", ""))
+            goal.update(missionId=mission["id"], goalIndex=i)
+            resolved, unresolved = [], []
+            for name in goal["characters"]:
+                r = roster.resolve(name)
+                if r is None:
+                    unresolved.append(name)
+                elif r not in resolved:
+                    resolved.append(r)
+            goal["characters"] = resolved
+            if unresolved:
+                goal["unresolved"] = unresolved
+            goals.append(goal)
+    return goals
+
+
+# ---------- avaliação ----------
+
+class ProgressTracker:
+    """
+    Progresso de todos os jogadores em todos os objetivos, alimentado
+    partida a partida (feed). Sequência ("in a row"): vitória com o time
+    que vale soma, derrota com esse time zera; partidas sem o personagem
+    não contam nem quebram.
+    """
+
+    def __init__(self, goals):
+        self.goals = goals
+        self.by_char = {}     # personagem -> objetivos win/streak
+        self.by_skill = {}    # (personagem, skill) -> objetivos use
+        self.by_mission = {}
+        for gid, g in enumerate(goals):
+            self.by_mission.setdefault(g["missionId"], []).append(gid)
+            if g["counter"] in ("win", "streak") and g["characters"] and not g.get("unresolved"):
+                # "all": basta indexar um deles, o resto é conferido no feed
+                keys = g["characters"][:1] if g["mode"] == "all" else g["characters"]
+                for name in keys:
+                    self.by_char.setdefault(normalize_name(name), []).append(gid)
+            elif g["counter"] == "use" and g["characters"]:
+                key = (normalize_name(g["characters"][0]), normalize_name(g["skill"]))
+                self.by_skill.setdefault(key, []).append(gid)
+        self.players = {}
+        self.matches = 0
+        self._norm = {}
+
+    def norm(self, name: str) -> str:
+        # o log repete os mesmos ~200 nomes milhões de vezes
+        n = self._norm.get(name)
+        if n is None:
+            n = self._norm[name] = normalize_name(name)
+        return n
+
+    def feed(self, match: dict):
+        """
+        Lê e valida a partida inteira antes de mexer nos contadores: registro
+        com campo inválido levanta TypeError/ValueError/AttributeError sem
+        deixar progresso pela metade.
+        """
+        player = match.get("player") or ""
+        team = {self.norm(n) for n in match.get("team") or []}
+        won = bool(match.get("won"))
+        uses = []
+        for use in match.get("skills") or []:
+            key = (self.norm(use.get("character")), self.norm(use.get("skill")))
+            uses.append((key, set(use.get("targetEffects") or []), int(use.get("count") or 1)))
+
+        state = self.players.setdefault(player, {"count": {}, "streak": {}})
+        count, streak = state["count"], state["streak"]
+
+        seen = set()
+        for name in team:
+            for gid in self.by_char.get(name, ()):
+                if gid in seen:
+                    continue
+                seen.add(gid)
+                g = self.goals[gid]
+                if g["mode"] == "all" and not all(self.norm(n) in team for n in g["characters"]):
+                    continue
+                if g["counter"] == "win":
+                    if won:
+                        count[gid] = count.get(gid, 0) + 1
+                elif won:
+                    streak[gid] = streak.get(gid, 0) + 1
+                    count[gid] = max(count.get(gid, 0), streak[gid])
+                else:
+                    streak[gid] = 0
+
+        for key, effects, n in uses:
+            for gid in self.by_skill.get(key, ()):
+                effect = self.goals[gid].get("targetEffect")
+                if effect and effect not in effects:
+                    continue
+                count[gid] = count.get(gid, 0) + n
+        self.matches += 1
+
+    def result(self) -> dict:
+        """
+        {jogador: {missionId: {"goals": [...], "completed": bool}}} — só
+        missões em que o jogador tem algum progresso.
+        """
+        out = {}
+        for player, state in sorted(self.players.items()):
+            missions = {}
+            for gid in sorted(state["count"]):
+                missions.setdefault(self.goals[gid]["missionId"], None)
+            for mid in missions:
+                rows = []
+                for gid in self.by_mission[mid]:
+                    g = self.goals[gid]
+                    n = min(state["count"].get(gid, 0), g["count"])
+                    rows.append({"text": g["text"], "progress": n, "count": g["count"], "done": n >= g["count"]})
+                missions[mid] = {"goals": rows, "completed": all(r["done"] for r in rows)}
+            if missions:
+                out[player] = missions
+        return out
+
+
+def iter_battles(path: str, stats: dict = None):
+    """
+    Partidas do log, uma por linha. Linha que não é um objeto JSON é pulada
+    (e contada em stats["skipped"]): um erro não derruba a passada inteira.
+    """
+    stats = {} if stats is None else stats
+    stats.setdefault("skipped", 0)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                match = records.loads(line)
+            except ValueError as e:
+                match = None
+                print(f"⚠️ Linha {line_no} ignorada: {e}")
+            if not isinstance(match, dict):
+                stats["skipped"] += 1
+                continue
+            yield match
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila os objetivos das missões e calcula o progresso a partir de um log de partidas.")
+    parser.add_argument("battles", nargs="?", default=BATTLE_LOG, help=f"Log JSONL (default: {BATTLE_LOG}; sem o arquivo, só compila)")
+    parser.add_argument("--missions", default=MISSIONS_JSON, help=f"default: {MISSIONS_JSON}")
+    parser.add_argument("--html", default=snapshot.DEFAULT_SNAPSHOT, help="Snapshot pros nomes dos personagens")
+    parser.add_argument("-o", "--out", default=OUT_JSON)
+    args = parser.parse_args()
+
+    names = [ch["name"] for ch in snapshot.iter_characters(args.html)] if os.path.exists(args.html) else []
+    goals = compile_missions(args.missions, Roster(names))
+
+    os.makedirs(OUT_DIR, exist_ok=True)
+    with open(GOALS_JSON, "w", encoding="utf-8") as f:
+        json.dump(goals, f, ensure_ascii=False, indent=1)
+
+    unknown = [g["text"] for g in goals if g["counter"] == "unknown"]
+    unresolved = sorted({n for g in goals for n in g.get("unresolved", [])})
+    print(f"Objetivos: {len(goals)} | Sem padrão: {len(unknown)} | Nomes sem par: {unresolved or '-'}")
+    for text in unknown:
+        print("  ?", text)
+    print("📄 JSON:", GOALS_JSON)
+
+    if not os.path.exists(args.battles):
+        return
+
+    tracker = ProgressTracker(goals)
+    t0 = time.time()
+    stats = {"skipped": 0}
+    for match in iter_battles(args.battles, stats):
+        try:
+            tracker.feed(match)
+        except (TypeError, ValueError, AttributeError) as e:
+            # campo com tipo errado ("team": 3, "count": "x"...)
+            stats["skipped"] += 1
+            print(f"⚠️ Partida ignorada: {e}")
+    progress = tracker.result()
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(progress, f, ensure_ascii=False, separators=(",", ":"))
+
+    completed = sum(m["completed"] for p in progress.values() for m in p.values())
+    print(f"{tracker.matches} partidas, {len(progress)} jogadores em {time.time() - t0:.1f}s | Missões completas: {completed}"
+          f" | Linhas ignoradas: {stats['skipped']}")
+    print("📄 JSON:", args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import os
+from bisect import bisect_right
+
+from script_missions import OUT_JSON as MISSIONS_JSON, iter_missions
+
+# ========= CONFIG =========
+OUT_DIR = "export"
+OUT_JSON = os.path.join(OUT_DIR, "mission_index.json")
+# ==========================
+
+
+def build_graph(missions):
+    """
+    missions: lista de mission_obj (missions.json).
+    Aresta A -> B quando B tem A em card.completedRequeriments.
+    Retorna (by_id, prereqs {id: [ids diretos]}, faltando {id: [nomes sem missão]}).
+    """
+    by_id = {}
+    by_title = {}
+    for m in missions:
+        by_id[m["id"]] = m
+        by_title[(m.get("title") or "").strip().lower()] = m["id"]
+
+    prereqs = {}
+    missing = {}
+    for mid, m in by_id.items():
+        direct = []
+        for req in (m.get("card") or {}).get("completedRequeriments") or []:
+            name = (req or {}).get("name") or ""
+            rid = by_title.get(name.strip().lower())
+            if rid is None:
+                missing.setdefault(mid, []).append(name)
+            elif rid != mid and rid not in direct:
+                direct.append(rid)
+        prereqs[mid] = direct
+    return by_id, prereqs, missing
+
+
+def topological_order(prereqs):
+    """
+    Kahn estável (empates por id). Ciclo não deveria existir, mas se
+    existir as missões do ciclo vão pro fim e são reportadas.
+    """
+    indegree = {mid: len(reqs) for mid, reqs in prereqs.items()}
+    dependents = {mid: [] for mid in prereqs}
+    for mid, reqs in prereqs.items():
+        for r in reqs:
+            dependents[r].append(mid)
+
+    ready = sorted(mid for mid, d in indegree.items() if d == 0)
+    order = []
+    while ready:
+        mid = ready.pop(0)
+        order.append(mid)
+        for dep in sorted(dependents[mid]):
+            indegree[dep] -= 1
+            if indegree[dep] == 0:
+                ready.append(dep)
+        ready.sort()
+
+    cycle = sorted(mid for mid, d in indegree.items() if d > 0)
+    return order + cycle, cycle
+
+
+def transitive_prereqs(order, prereqs):
+    """
+    Em ordem topológica cada missão só depende de missões já resolvidas,
+    então uma passada basta. Resultado também sai em ordem topológica.
+    """
+    position = {mid: i for i, mid in enumerate(order)}
+    closure = {}
+    for mid in order:
+        acc = set()
+        for r in prereqs[mid]:
+            acc.add(r)
+            acc |= closure.get(r, set())
+        closure[mid] = acc
+    return {mid: sorted(reqs, key=position.get) for mid, reqs in closure.items()}
+
+
+def build_index(missions):
+    by_id, prereqs, missing = build_graph(missions)
+    order, cycle = topological_order(prereqs)
+
+    unlocks = {}
+    by_rank = {}
+    by_level = {}
+    for mid in order:
+        card = by_id[mid].get("card") or {}
+        # só o campo do card: "reward" também pode ser borda/avatar
+        char = card.get("unlockedCharacter")
+        if char:
+            unlocks.setdefault(char, []).append(mid)
+        rank = card.get("rankRequirement")
+        if rank:
+            by_rank.setdefault(rank, []).append(mid)
+        by_level.setdefault(int(card.get("levelRequirement") or 0), []).append(mid)
+
+    # nível -> missões liberadas até aquele nível (cumulativo)
+    levels = sorted(by_level)
+    available = {}
+    acc = []
+    for lvl in levels:
+        acc = acc + by_level[lvl]
+        available[str(lvl)] = acc
+
+    return {
+        "order": order,
+        "missions": {
+            mid: {
+                "title": by_id[mid].get("title"),
+                "section": by_id[mid].get("section"),
+                "prereqs": prereqs[mid],
+            }
+            for mid in order
+        },
+        "prerequisites": transitive_prereqs(order, prereqs),
+        "unlocks": unlocks,
+        "byRank": by_rank,
+        "levels": levels,
+        "availableAtLevel": available,
+        "missingRequirements": missing,
+        "cycles": cycle,
+    }
+
+
+def missions_available_at(index: dict, level: int) -> list[str]:
+    """
+    Missões com levelRequirement <= level (busca binária em index["levels"]).
+    """
+    i = bisect_right(index["levels"], level)
+    if i == 0:
+        return []
+    return index["availableAtLevel"][str(index["levels"][i - 1])]
+
+
+def what_unlocks(index: dict, character: str) -> list[str]:
+    """
+    Missões (e pré-requisitos, em ordem) para liberar um personagem.
+    """
+    out = []
+    for mid in index["unlocks"].get(character, []):
+        for r in index["prerequisites"].get(mid, []) + [mid]:
+            if r not in out:
+                out.append(r)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o grafo de desbloqueio das missões + índices reversos.")
+    parser.add_argument("missions_json", nargs="?", default=MISSIONS_JSON, help=f"missions.json (default: {MISSIONS_JSON})")
+    parser.add_argument("-o", "--out", default=OUT_JSON, help=f"Saída (default: {OUT_JSON})")
+    args = parser.parse_args()
+
+    missions = [m for _, m in iter_missions(args.missions_json)]
+    index = build_index(missions)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+
+    print(f"Missões: {len(index['order'])} | Personagens desbloqueáveis: {len(index['unlocks'])}")
+    if index["missingRequirements"]:
+        print(f"⚠️ Requisitos sem missão correspondente: {index['missingRequirements']}")
+    if index["cycles"]:
+        print(f"⚠️ Ciclo entre: {index['cycles']}")
+    print("📄 JSON:", args.out)
+
+
+if __name__ == "__main__":
+    main()
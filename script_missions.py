@@ -2,14 +2,14 @@ import os
 import re
 import json
 import time
-import random
+import hashlib
 import logging
+import threading
 from urllib.parse import urljoin, urlparse
 
-import requests
-from tqdm import tqdm
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+import records
+import snapshot
+import download_guard
 
 # =========================
 # CONFIG
@@ -21,9 +21,31 @@ OUT_DIR = "missions_out"
 IMG_DIR = os.path.join(OUT_DIR, "images")
 OUT_JSON = os.path.join(OUT_DIR, "missions.json")
 STATE_JSON = os.path.join(OUT_DIR, "_state.json")
+FINGERPRINTS_JSON = os.path.join(OUT_DIR, "_fingerprints.json")  # script_missions_sync.py
 
 USER_DATA_DIR = "user_data_na"   # perfil persistente (cookies/login)
-HEADLESS = False
+STORAGE_STATE = "storageState.json"  # login salvo pelo script.js (opcional)
+
+# Gravação/replay das navegações (HAR do Playwright), pra mexer nos
+# extratores sem refazer o crawl logado:
+#   NA_HAR=record  crawl normal, gravando as respostas do site em HAR_DIR
+#   NA_HAR=replay  serve só o que foi gravado (offline, headless, sem login);
+#                  o que não está no HAR é abortado, imagens só as já baixadas
+HAR_MODE = os.environ.get("NA_HAR", "")
+HAR_DIR = os.path.join(OUT_DIR, "har")
+REPLAY_DIR = os.path.join(OUT_DIR, "replay")   # saída do replay (não sobrescreve a real)
+HAR_URL_RE = re.compile(r"^https?://([^/]+\.)?naruto-arena\.site/")
+
+# Headless = sem janela e sem input(): usa o login já salvo em USER_DATA_DIR /
+# STORAGE_STATE. Rode uma vez com HEADLESS=0 para logar manualmente.
+HEADLESS = os.environ.get("NA_HEADLESS", "0") == "1" or HAR_MODE == "replay"
+
+# Bloqueia imagens/fontes/mídia e hosts de terceiros (analytics, ads...).
+# O crawler só precisa do HTML com o __NEXT_DATA__. Só no headless: a
+# rodada com janela é a do login (Google, desafio do Cloudflare).
+BLOCK_RESOURCES = True
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+ALLOWED_HOSTS = {urlparse(BASE_URL).hostname, "naruto-arena.site"}
 
 REQUESTS_PER_SECOND = 2
 MAX_RETRIES = 6
@@ -31,30 +53,52 @@ MAX_RETRIES = 6
 # Se deu ruim antes e você quer reprocessar tudo:
 RESET_STATE = True
 
+# Reciclagem do browser em crawls longos: página nova a cada N navegações
+# ou quando o Chromium passar do limite de memória (RSS, precisa do psutil).
+MAX_NAVS_PER_PAGE = 50
+MAX_BROWSER_RSS_MB = 1500
+MAX_CONTEXT_RESTARTS = 5
+
 # =========================
 
-os.makedirs(OUT_DIR, exist_ok=True)
-os.makedirs(IMG_DIR, exist_ok=True)
+# Nada roda no import (playwright/tqdm/requests também são lazy):
+# pastas e log em setup(), sessão HTTP no primeiro download.
+_req = None
+_last_req = 0.0
+_rate_lock = threading.Lock()  # o hedge do download_guard chama de outra thread
+_latency = download_guard.LatencyTracker()
+_har_count = 0
+
 
-logging.basicConfig(
-    filename=os.path.join(OUT_DIR, "missions_errors.log"),
-    level=logging.ERROR,
-    format="%(asctime)s - %(message)s",
-)
+def setup():
+    os.makedirs(OUT_DIR, exist_ok=True)
+    os.makedirs(IMG_DIR, exist_ok=True)
 
-req = requests.Session()
-req.headers.update({"User-Agent": "Mozilla/5.0"})
+    logging.basicConfig(
+        filename=os.path.join(OUT_DIR, "missions_errors.log"),
+        level=logging.ERROR,
+        format="%(asctime)s - %(message)s",
+    )
 
-_last_req = 0.0
+
+def get_session():
+    global _req
+    if _req is None:
+        import requests
+
+        _req = requests.Session()
+        _req.headers.update({"User-Agent": "Mozilla/5.0"})
+    return _req
 
 
 def rate_limit():
     global _last_req
-    min_interval = 1 / REQUESTS_PER_SECOND
-    elapsed = time.time() - _last_req
-    if elapsed < min_interval:
-        time.sleep(min_interval - elapsed)
-    _last_req = time.time()
+    with _rate_lock:
+        min_interval = 1 / REQUESTS_PER_SECOND
+        elapsed = time.time() - _last_req
+        if elapsed < min_interval:
+            time.sleep(min_interval - elapsed)
+        _last_req = time.time()
 
 
 def slug(s: str) -> str:
@@ -84,19 +128,259 @@ def load_state():
 
 
 def save_state(state):
+    if HAR_MODE == "replay":
+        return  # replay não mexe no resume do crawl real
     with open(STATE_JSON, "w", encoding="utf-8") as f:
         json.dump(state, f, ensure_ascii=False, indent=2)
 
 
 def next_data_from_html(html: str):
-    soup = BeautifulSoup(html, "lxml")
-    tag = soup.find("script", id="__NEXT_DATA__")
-    if not tag or not tag.string:
-        return None
+    return snapshot.next_data_from_html(html)
+
+
+def next_data_from_page(page):
+    """
+    Lê o __NEXT_DATA__ direto do DOM (já vem no HTML do SSR, então
+    domcontentloaded basta). Cai pro parse do HTML inteiro se falhar.
+    """
+    try:
+        raw = page.evaluate(
+            "() => { const el = document.getElementById('__NEXT_DATA__');"
+            " return el ? el.textContent : null; }"
+        )
+        if raw:
+            return json.loads(raw)
+    except Exception:
+        pass
+    return next_data_from_html(page.content())
+
+
+def goto(page, url: str):
+    return page.goto(url, wait_until="domcontentloaded")
+
+
+def visit(browser, url: str) -> bool:
+    """
+    browser.goto; no replay, URL que não foi gravada (abortada ->
+    net::ERR_FAILED) é logada e pulada em vez de derrubar a rodada.
+    """
+    try:
+        browser.goto(url)
+        return True
+    except Exception as e:
+        if HAR_MODE != "replay":
+            raise
+        logging.error(f"Replay sem resposta gravada: {url} err={e}")
+        return False
+
+
+def block_unneeded_requests(route):
+    request = route.request
+    host = urlparse(request.url).hostname or ""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return route.abort()
+    if host not in ALLOWED_HOSTS and not host.endswith(".naruto-arena.site"):
+        return route.abort()
+    return route.continue_()
+
+
+def load_saved_cookies(ctx):
+    """
+    launch_persistent_context não aceita storage_state, então os cookies
+    do storageState.json (se existir) são injetados no contexto.
+    """
+    if not os.path.exists(STORAGE_STATE):
+        return
+    try:
+        state = json.load(open(STORAGE_STATE, "r", encoding="utf-8"))
+        cookies = [c for c in state.get("cookies", []) if "naruto-arena" in c.get("domain", "")]
+        if cookies:
+            ctx.add_cookies(cookies)
+    except Exception as e:
+        logging.error(f"Falha lendo {STORAGE_STATE}: {e}")
+
+
+def har_files(har_dir: str = HAR_DIR):
+    # nome começa com a data: ordem alfabética = ordem de gravação
+    if not os.path.isdir(har_dir):
+        return []
+    return sorted(os.path.join(har_dir, f) for f in os.listdir(har_dir) if f.endswith(".har.zip"))
+
+
+def attach_har(ctx, mode: str = HAR_MODE, har_dir: str = HAR_DIR):
+    """
+    record: um HAR por contexto (o Playwright só grava no ctx.close(), e o
+    BrowserSession pode reabrir o contexto no meio do crawl).
+    replay: todos os HARs da pasta; o mais novo tem prioridade.
+    """
+    global _har_count
+    if mode == "record":
+        os.makedirs(har_dir, exist_ok=True)
+        _har_count += 1
+        path = os.path.join(har_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{_har_count}.har.zip")
+        ctx.route_from_har(path, url=HAR_URL_RE, update=True)
+    elif mode == "replay":
+        files = har_files(har_dir)
+        if not files:
+            raise RuntimeError(f"Nenhum HAR em {har_dir}: grave antes com NA_HAR=record")
+        # rotas registradas depois rodam antes: o abort é o último recurso
+        ctx.route("**/*", lambda route: route.abort())
+        for path in files:
+            ctx.route_from_har(path, url=HAR_URL_RE, not_found="fallback")
+    elif mode:
+        raise ValueError(f"NA_HAR inválido: {mode!r} (use record ou replay)")
+
+
+def open_context(p, user_data_dir: str = USER_DATA_DIR, headless: bool = None):
+    """
+    Contexto persistente com o login salvo + bloqueio de recursos
+    (+ gravação/replay em HAR, conforme NA_HAR).
+    Cada processo precisa do seu user_data_dir (o Chromium trava o perfil).
+    """
+    headless = HEADLESS if headless is None else headless
+    ctx = p.chromium.launch_persistent_context(
+        user_data_dir,
+        headless=headless,
+        viewport={"width": 1400, "height": 900},
+    )
+    load_saved_cookies(ctx)
+    # com janela é a rodada de login: Google/Cloudflare precisam de outros hosts
+    if BLOCK_RESOURCES and headless:
+        ctx.route("**/*", block_unneeded_requests)
+    attach_har(ctx)
+    return ctx
+
+
+def browser_rss_mb():
+    """
+    RSS somado dos processos filhos (driver do playwright + Chromium).
+    None se o psutil não estiver instalado.
+    """
     try:
-        return json.loads(tag.string)
-    except:
+        import psutil
+    except ImportError:
         return None
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+def is_crash_error(e: Exception) -> bool:
+    msg = str(e).lower()
+    return any(k in msg for k in ("crash", "target closed", "has been closed", "browser has disconnected"))
+
+
+class BrowserSession:
+    """
+    Contexto + página que se reciclam sozinhos:
+      - página nova a cada MAX_NAVS_PER_PAGE navegações ou acima de MAX_BROWSER_RSS_MB
+        (se o RSS continuar acima depois da página nova, reabre o contexto)
+      - se o renderer/contexto cair, reabre o contexto (o login fica no
+        user_data_dir + storageState.json) e repete a navegação
+    """
+
+    def __init__(self, p, user_data_dir: str = USER_DATA_DIR, headless: bool = None):
+        self.p = p
+        self.user_data_dir = user_data_dir
+        self.headless = headless
+        self.ctx = None
+        self.page = None
+        self.navigations = 0
+        self.page_navigations = 0
+        self.pages_recycled = 0
+        self.context_restarts = 0
+        self.memory_restarts = 0
+        self.peak_rss_mb = 0.0
+        self._open()
+
+    def _open(self):
+        self.ctx = open_context(self.p, self.user_data_dir, self.headless)
+        self.page = self.ctx.new_page()
+        self.page_navigations = 0
+
+    def _restart_context(self):
+        self.context_restarts += 1
+        if self.context_restarts > MAX_CONTEXT_RESTARTS:
+            raise RuntimeError(f"Contexto reiniciado {MAX_CONTEXT_RESTARTS}x, desistindo.")
+        try:
+            self.ctx.close()
+        except Exception:
+            pass
+        self._open()
+
+    def _reopen_context(self):
+        # por memória, não por crash: não conta no MAX_CONTEXT_RESTARTS
+        try:
+            self.ctx.close()
+        except Exception:
+            pass
+        self._open()
+        self.memory_restarts += 1
+
+    def _recycle_page(self):
+        try:
+            self.page.close()
+        except Exception:
+            pass
+        self.page = self.ctx.new_page()
+        self.page_navigations = 0
+        self.pages_recycled += 1
+
+    def _maybe_recycle(self):
+        rss = browser_rss_mb()
+        if rss is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        over = rss is not None and rss > MAX_BROWSER_RSS_MB
+        if self.page_navigations >= MAX_NAVS_PER_PAGE or over:
+            self._recycle_page()
+        if over:
+            # página nova não devolve a memória do processo do browser:
+            # se continuar acima do limite, reabre o contexto inteiro
+            rss = browser_rss_mb()
+            if rss is not None and rss > MAX_BROWSER_RSS_MB:
+                self._reopen_context()
+
+    def goto(self, url: str):
+        self._maybe_recycle()
+        try:
+            resp = goto(self.page, url)
+        except Exception as e:
+            if not is_crash_error(e):
+                raise
+            logging.error(f"Browser caiu em {url}: {e} — reiniciando contexto")
+            self._restart_context()
+            resp = goto(self.page, url)
+        self.navigations += 1
+        self.page_navigations += 1
+        return resp
+
+    def stats(self) -> dict:
+        return {
+            "navigations": self.navigations,
+            "pagesRecycled": self.pages_recycled,
+            "contextRestarts": self.context_restarts,
+            "memoryRestarts": self.memory_restarts,
+            "peakRssMb": round(self.peak_rss_mb, 1) if self.peak_rss_mb else None,
+        }
+
+    def close(self):
+        try:
+            self.ctx.close()
+        except Exception:
+            pass
+
+
+def mission_image_path(sess_id: str, mission_id: str, key: str, img_url: str) -> str:
+    fname = f"{sess_id}__{mission_id}__{key}__{safe_filename(img_url)}"
+    return os.path.join(IMG_DIR, fname)
+
+
+def session_image_path(sess_id: str, img_url: str) -> str:
+    return os.path.join(IMG_DIR, f"session__{sess_id}__{safe_filename(img_url)}")
 
 
 def ensure_not_redirected_to_home(page, intended_url: str) -> bool:
@@ -117,26 +401,26 @@ def download_image(url: str, out_path: str, page=None):
         return None
     if os.path.exists(out_path):
         return out_path
+    if HAR_MODE == "replay":
+        return None
 
-    # 1) requests com retry/backoff
+    # 1) requests com retry/backoff (prazo total, stall e hedge no download_guard)
     for attempt in range(MAX_RETRIES):
         try:
-            rate_limit()
-            r = req.get(url, timeout=30, stream=True)
-            if r.status_code == 429:
-                time.sleep((2 ** attempt) + random.uniform(0.5, 1.5))
+            status = download_guard.fetch_to_file(
+                get_session().get, url, out_path, tracker=_latency,
+                before=rate_limit, passthrough=(429, 401, 403),
+            )
+            if status == 429:
+                time.sleep(download_guard.backoff(attempt))
                 continue
-            if r.status_code in (401, 403):
-                raise PermissionError(f"HTTP {r.status_code}")
-            r.raise_for_status()
-            with open(out_path, "wb") as f:
-                for chunk in r.iter_content(8192):
-                    if chunk:
-                        f.write(chunk)
+            if status in (401, 403):
+                # não adianta insistir: vai direto pro Playwright autenticado
+                break
             return out_path
         except Exception:
             if attempt < MAX_RETRIES - 1:
-                time.sleep(2 ** attempt)
+                time.sleep(download_guard.backoff(attempt))
 
     # 2) fallback Playwright (sessão autenticada)
     if page is not None:
@@ -257,186 +541,245 @@ def extract_mission_status_from_mission_nextdata(nd):
     }
 
 
-# =========================
-# MAIN
-# =========================
+# Campos do card que mudam o conteúdo da missão. isAvailable/isCompleted
+# são do progresso da conta e não entram (senão tudo "muda" a cada vitória).
+FINGERPRINT_FIELDS = ("name", "url", "unlockedCharacter", "rankRequirement", "levelRequirement", "completedRequeriments")
 
-def main():
-    state = load_state()
-    done_sessions = set(state.get("done_sessions", []))
-    done_missions = set(state.get("done_missions", []))
 
-    sessions_out = []
+def card_fingerprint(card) -> str:
+    payload = {k: card.get(k) for k in FINGERPRINT_FIELDS}
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
-    with sync_playwright() as p:
-        ctx = p.chromium.launch_persistent_context(
-            USER_DATA_DIR,
-            headless=HEADLESS,
-            viewport={"width": 1400, "height": 900},
-        )
-        page = ctx.new_page()
 
-        # 1) ROOT
-        page.goto(ROOT_URL, wait_until="networkidle")
-        print("\nSe não estiver logado, faça login nessa janela.")
-        input("Quando estiver logado e a página Ninja Missions carregada, ENTER...")
+def card_summary(card) -> dict:
+    return {
+        "imageUrl": card.get("url"),
+        "isAvailable": card.get("isAvailable"),
+        "isLevelAvailable": card.get("isLevelAvailable"),
+        "isCompleted": card.get("isCompleted"),
+        "rankRequirement": card.get("rankRequirement"),
+        "levelRequirement": card.get("levelRequirement"),
+        "completedRequeriments": card.get("completedRequeriments", []),
+        "unlockedCharacter": card.get("unlockedCharacter"),
+    }
 
-        root_html = page.content()
-        root_nd = next_data_from_html(root_html)
-        if not root_nd:
-            print("Não encontrei __NEXT_DATA__ na página raiz. Veja missions_errors.log.")
-            logging.error("ROOT sem __NEXT_DATA__")
-            ctx.close()
-            return
 
-        sessions = extract_sessions_from_root_nextdata(root_nd)
-        print(f"Encontradas {len(sessions)} sessões (via __NEXT_DATA__).")
+def build_mission_obj(sess_obj, card, ms, m_url):
+    # validado no schema (records.Mission): __NEXT_DATA__ mudou de formato -> erro aqui
+    return records.validate(records.Mission, {
+        "id": slug(ms["title"] or card["name"] or card["id"]),
+        "title": ms["title"] or card["name"],
+        "section": sess_obj["title"],
+        "card": card_summary(card),
+        "missionInfo": ms.get("missionInfo", {}),
+        "requirements": ms.get("requirements", ""),
+        "reward": ms.get("reward", ""),
+        "goals": ms.get("goals", []),
+        "images": {
+            "mission": {"url": ms["images"].get("mission"), "file": None},
+            "reward": {"url": ms["images"].get("reward"), "file": None},
+        },
+        "pageUrl": m_url
+    })
 
-        # jobs de imagem: (url, out_path, setter_fn)
-        image_jobs = []
 
-        # 2) PARA CADA SESSÃO
-        for sess in tqdm(sessions, desc="Sessões"):
-            sess_url = sess["url"]
-            if sess_url in done_sessions:
-                continue
+def iter_missions(path: str = OUT_JSON):
+    """
+    Gera (sessão, missão) a partir de um missions.json já exportado.
+    """
+    data = records.read_json(path)
+    for sess in data.get("sessions", []):
+        for mission in sess.get("missions", []):
+            yield sess, mission
 
-            page.goto(sess_url, wait_until="networkidle")
-            if not ensure_not_redirected_to_home(page, sess_url):
-                continue
 
-            s_html = page.content()
-            s_nd = next_data_from_html(s_html)
-            if not s_nd:
-                logging.error(f"SESSÃO sem __NEXT_DATA__: {sess_url}")
-                continue
+def open_root(browser):
+    """
+    Abre /ninja-missions (pedindo login se não for headless) e devolve o
+    __NEXT_DATA__ da raiz, ou None.
+    """
+    browser.goto(ROOT_URL)
+    if HEADLESS:
+        if not ensure_not_redirected_to_home(browser.page, ROOT_URL):
+            print("Login expirado/ausente. Rode uma vez com NA_HEADLESS=0 para logar.")
+            return None
+    else:
+        print("\nSe não estiver logado, faça login nessa janela.")
+        input("Quando estiver logado e a página Ninja Missions carregada, ENTER...")
 
-            cards = extract_mission_cards_from_session_nextdata(s_nd)
+    root_nd = next_data_from_page(browser.page)
+    if not root_nd:
+        print("Não encontrei __NEXT_DATA__ na página raiz. Veja missions_errors.log.")
+        logging.error("ROOT sem __NEXT_DATA__")
+    return root_nd
 
-            sess_obj = {
-                "id": sess["id"],
-                "title": sess["title"],
-                "description": sess.get("description", ""),
-                "url": sess_url,
-                "image": None,
-                "missions": []
-            }
 
-            # imagem da sessão (do root)
-            if sess.get("imageUrl"):
-                img_url = sess["imageUrl"]
-                fname = f"session__{sess_obj['id']}__{safe_filename(img_url)}"
-                out_path = os.path.join(IMG_DIR, fname)
+# =========================
+# MAIN
+# =========================
 
-                def set_session_img(obj=sess_obj, u=img_url, p=out_path):
-                    obj["image"] = {"url": u, "file": p.replace("\\", "/")}
+def main():
+    from tqdm import tqdm
+    from playwright.sync_api import sync_playwright
 
-                image_jobs.append((img_url, out_path, set_session_img))
+    setup()
+    t0 = time.time()
+    state = load_state()
+    done_sessions = set(state.get("done_sessions", []))
+    done_missions = set(state.get("done_missions", []))
 
-            # 3) PARA CADA MISSÃO (usamos /mission/<linkTo>)
-            for card in tqdm(cards, desc=f"Missões ({sess_obj['title']})", leave=False):
-                m_url = card["missionUrl"]
-                if m_url in done_missions:
-                    continue
+    sessions_out = []
 
-                page.goto(m_url, wait_until="networkidle")
-                if not ensure_not_redirected_to_home(page, m_url):
+    with sync_playwright() as p:
+        browser = BrowserSession(p)
+        try:
+            # 1) ROOT
+            root_nd = open_root(browser)
+            if not root_nd:
+                return
+
+            sessions = extract_sessions_from_root_nextdata(root_nd)
+            print(f"Encontradas {len(sessions)} sessões (via __NEXT_DATA__).")
+
+            # jobs de imagem: (url, out_path, setter_fn)
+            image_jobs = []
+            fingerprints = {}
+
+            # 2) PARA CADA SESSÃO
+            for sess in tqdm(sessions, desc="Sessões"):
+                sess_url = sess["url"]
+                if sess_url in done_sessions:
                     continue
 
-                m_html = page.content()
-                m_nd = next_data_from_html(m_html)
-                if not m_nd:
-                    logging.error(f"MISSÃO sem __NEXT_DATA__: {m_url}")
+                if not visit(browser, sess_url):
+                    continue
+                if not ensure_not_redirected_to_home(browser.page, sess_url):
                     continue
 
-                ms = extract_mission_status_from_mission_nextdata(m_nd)
-                if not ms:
-                    logging.error(f"MISSÃO sem missionStatus: {m_url}")
+                s_nd = next_data_from_page(browser.page)
+                if not s_nd:
+                    logging.error(f"SESSÃO sem __NEXT_DATA__: {sess_url}")
                     continue
 
-                mission_obj = {
-                    "id": slug(ms["title"] or card["name"] or card["id"]),
-                    "title": ms["title"] or card["name"],
-                    "section": sess_obj["title"],
-                    "card": {
-                        "imageUrl": card.get("url"),
-                        "isAvailable": card.get("isAvailable"),
-                        "isLevelAvailable": card.get("isLevelAvailable"),
-                        "isCompleted": card.get("isCompleted"),
-                        "rankRequirement": card.get("rankRequirement"),
-                        "levelRequirement": card.get("levelRequirement"),
-                        "completedRequeriments": card.get("completedRequeriments", []),
-                        "unlockedCharacter": card.get("unlockedCharacter"),
-                    },
-                    "missionInfo": ms.get("missionInfo", {}),
-                    "requirements": ms.get("requirements", ""),
-                    "reward": ms.get("reward", ""),
-                    "goals": ms.get("goals", []),
-                    "images": {
-                        "mission": {"url": ms["images"].get("mission"), "file": None},
-                        "reward": {"url": ms["images"].get("reward"), "file": None},
-                    },
-                    "pageUrl": m_url
+                cards = extract_mission_cards_from_session_nextdata(s_nd)
+
+                sess_obj = {
+                    "id": sess["id"],
+                    "title": sess["title"],
+                    "description": sess.get("description", ""),
+                    "url": sess_url,
+                    "image": None,
+                    "missions": []
                 }
 
-                # agenda downloads (mission/reward) — URLs vêm do missionStatus (nunca Patreon)
-                for key in ["mission", "reward"]:
-                    img_url = mission_obj["images"][key]["url"]
-                    if not img_url:
+                # imagem da sessão (do root)
+                if sess.get("imageUrl"):
+                    img_url = sess["imageUrl"]
+                    out_path = session_image_path(sess_obj["id"], img_url)
+
+                    def set_session_img(obj=sess_obj, u=img_url, p=out_path):
+                        obj["image"] = {"url": u, "file": p.replace("\\", "/")}
+
+                    image_jobs.append((img_url, out_path, set_session_img))
+
+                # 3) PARA CADA MISSÃO (usamos /mission/<linkTo>)
+                for card in tqdm(cards, desc=f"Missões ({sess_obj['title']})", leave=False):
+                    m_url = card["missionUrl"]
+                    if m_url in done_missions:
                         continue
-                    fname = f"{sess_obj['id']}__{mission_obj['id']}__{key}__{safe_filename(img_url)}"
-                    out_path = os.path.join(IMG_DIR, fname)
 
-                    def make_setter(obj=mission_obj, k=key, u=img_url, p=out_path):
-                        def _set():
-                            obj["images"][k]["file"] = p.replace("\\", "/")
-                            obj["images"][k]["url"] = u
-                        return _set
+                    if not visit(browser, m_url):
+                        continue
+                    if not ensure_not_redirected_to_home(browser.page, m_url):
+                        continue
 
-                    image_jobs.append((img_url, out_path, make_setter()))
+                    m_nd = next_data_from_page(browser.page)
+                    if not m_nd:
+                        logging.error(f"MISSÃO sem __NEXT_DATA__: {m_url}")
+                        continue
 
-                sess_obj["missions"].append(mission_obj)
+                    ms = extract_mission_status_from_mission_nextdata(m_nd)
+                    if not ms:
+                        logging.error(f"MISSÃO sem missionStatus: {m_url}")
+                        continue
 
-                done_missions.add(m_url)
-                state["done_missions"] = sorted(done_missions)
-                save_state(state)
+                    try:
+                        mission_obj = build_mission_obj(sess_obj, card, ms, m_url)
+                    except records.RecordError as e:
+                        logging.error(f"MISSÃO fora do schema: {m_url} err={e}")
+                        continue
 
-            sessions_out.append(sess_obj)
+                    # agenda downloads (mission/reward) — URLs vêm do missionStatus (nunca Patreon)
+                    for key in ["mission", "reward"]:
+                        img_url = mission_obj["images"][key]["url"]
+                        if not img_url:
+                            continue
+                        out_path = mission_image_path(sess_obj["id"], mission_obj["id"], key, img_url)
 
-            done_sessions.add(sess_url)
-            state["done_sessions"] = sorted(done_sessions)
-            save_state(state)
+                        def make_setter(obj=mission_obj, k=key, u=img_url, p=out_path):
+                            def _set():
+                                obj["images"][k]["file"] = p.replace("\\", "/")
+                                obj["images"][k]["url"] = u
+                            return _set
 
-        # 4) BAIXAR IMAGENS (dedupe url+path)
-        dedup = {}
-        for u, pth, setter in image_jobs:
-            dedup[(u, pth)] = (u, pth, setter)
-        jobs = list(dedup.values())
+                        image_jobs.append((img_url, out_path, make_setter()))
 
-        for (img_url, out_path, setter) in tqdm(jobs, desc="Baixando imagens"):
-            dl = download_image(img_url, out_path, page=page)
-            if dl:
-                setter()
-            else:
-                # mantém url, file fica None
-                pass
-
-        # 5) SALVAR JSON
-        out = {
-            "sourceRoot": ROOT_URL,
-            "generatedAt": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "sessions": sessions_out
-        }
-        with open(OUT_JSON, "w", encoding="utf-8") as f:
-            json.dump(out, f, ensure_ascii=False, indent=2)
+                    sess_obj["missions"].append(mission_obj)
+                    fingerprints[m_url] = card_fingerprint(card)
 
-        print("\n✅ Concluído!")
-        print("📄 JSON:", OUT_JSON)
-        print("🖼️ Imagens:", IMG_DIR)
-        print("📄 Log:", os.path.join(OUT_DIR, "missions_errors.log"))
-        print("💾 State:", STATE_JSON)
+                    done_missions.add(m_url)
+                    state["done_missions"] = sorted(done_missions)
+                    save_state(state)
 
-        ctx.close()
+                sessions_out.append(sess_obj)
+
+                done_sessions.add(sess_url)
+                state["done_sessions"] = sorted(done_sessions)
+                save_state(state)
+
+            # 4) BAIXAR IMAGENS (dedupe url+path)
+            dedup = {}
+            for u, pth, setter in image_jobs:
+                dedup[(u, pth)] = (u, pth, setter)
+            jobs = list(dedup.values())
+
+            for (img_url, out_path, setter) in tqdm(jobs, desc="Baixando imagens"):
+                dl = download_image(img_url, out_path, page=browser.page)
+                if dl:
+                    setter()
+                else:
+                    # mantém url, file fica None
+                    pass
+
+            # 5) SALVAR JSON
+            out = {
+                "sourceRoot": ROOT_URL,
+                "generatedAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "sessions": sessions_out
+            }
+            if HAR_MODE == "replay":
+                # replay não é o estado do site: não vira base do sync
+                os.makedirs(REPLAY_DIR, exist_ok=True)
+                out_json = os.path.join(REPLAY_DIR, "missions.json")
+                records.write_json(out_json, out)
+            else:
+                out_json = OUT_JSON
+                records.write_json(out_json, out)
+                # base pro próximo script_missions_sync.py
+                with open(FINGERPRINTS_JSON, "w", encoding="utf-8") as f:
+                    json.dump(fingerprints, f, ensure_ascii=False, indent=2)
+
+            print("\n✅ Concluído!")
+            print("📄 JSON:", out_json)
+            print("🖼️ Imagens:", IMG_DIR)
+            print("📄 Log:", os.path.join(OUT_DIR, "missions_errors.log"))
+            print("💾 State:", STATE_JSON)
+            print("🧠 Browser:", browser.stats())
+            print(f"⏱️ {time.time() - t0:.1f}s" + (f" (NA_HAR={HAR_MODE}: {HAR_DIR})" if HAR_MODE else ""))
+        finally:
+            # o HAR (NA_HAR=record) só é gravado no close do contexto
+            browser.close()
 
 
 if __name__ == "__main__":
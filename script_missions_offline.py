@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import records
+import snapshot
+import script_missions as sm
+
+# ========= CONFIG =========
+DEFAULT_HTML_DIR = os.path.join("missions_html")   # mesmo lugar que o script.js procura
+HTML_EXTS = {".html", ".htm"}
+# ==========================
+
+# page do Next.js -> tipo de página salva
+PAGE_KINDS = {
+    "/ninja-missions": "root",
+    "/missions/[id]": "session",
+    "/mission/[id]": "mission",
+}
+
+
+def extract_saved_page(path: str):
+    """
+    Roda no worker do pool: lê um HTML salvo e devolve só o que interessa
+    (bem menor que o __NEXT_DATA__ inteiro, que volta pro processo pai).
+    """
+    nd = snapshot.read_next_data(path)
+    if not nd:
+        return {"path": path, "kind": None}
+
+    kind = PAGE_KINDS.get(nd.get("page"))
+    link_to = (nd.get("query") or {}).get("id")
+    out = {"path": path, "kind": kind, "linkTo": link_to}
+
+    if kind == "root":
+        out["sessions"] = sm.extract_sessions_from_root_nextdata(nd)
+    elif kind == "session":
+        props = (nd.get("props") or {}).get("pageProps") or {}
+        out["title"] = props.get("animeName") or link_to
+        out["cards"] = sm.extract_mission_cards_from_session_nextdata(nd)
+    elif kind == "mission":
+        out["status"] = sm.extract_mission_status_from_mission_nextdata(nd)
+    return out
+
+
+def iter_html_files(html_dir: str):
+    for root, _, files in os.walk(html_dir):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in HTML_EXTS:
+                yield os.path.join(root, name)
+
+
+def existing_file(path: str):
+    # imagem baixada numa rodada online anterior? então já aponta pra ela
+    return path.replace("\\", "/") if os.path.exists(path) else None
+
+
+def build_output(pages):
+    roots = [p for p in pages if p["kind"] == "root"]
+    sessions_by_link = {p["linkTo"]: p for p in pages if p["kind"] == "session" and p["linkTo"]}
+    missions_by_link = {p["linkTo"]: p for p in pages if p["kind"] == "mission" and p["linkTo"]}
+
+    if roots:
+        sessions = roots[0]["sessions"]
+    else:
+        # sem a raiz salva: monta a lista a partir das próprias páginas de sessão
+        sessions = sorted(
+            (
+                {
+                    "id": sm.slug(link),
+                    "title": p["title"],
+                    "description": "",
+                    "imageUrl": None,
+                    "linkTo": link,
+                    "url": f"{sm.BASE_URL}/missions/{link}",
+                }
+                for link, p in sessions_by_link.items()
+            ),
+            key=lambda x: x["title"].lower(),
+        )
+
+    sessions_out = []
+    missing = {"sessions": [], "missions": []}
+    for sess in sessions:
+        page = sessions_by_link.get(sess["linkTo"])
+        if page is None:
+            missing["sessions"].append(sess["linkTo"])
+            continue
+
+        sess_obj = {
+            "id": sess["id"],
+            "title": sess["title"],
+            "description": sess.get("description", ""),
+            "url": sess["url"],
+            "image": None,
+            "missions": [],
+        }
+        if sess.get("imageUrl"):
+            f = existing_file(sm.session_image_path(sess["id"], sess["imageUrl"]))
+            if f:
+                sess_obj["image"] = {"url": sess["imageUrl"], "file": f}
+
+        for card in page["cards"]:
+            link = card["missionUrl"].rsplit("/", 1)[-1]
+            m_page = missions_by_link.get(link)
+            ms = m_page and m_page.get("status")
+            if not ms:
+                missing["missions"].append(link)
+                continue
+
+            try:
+                mission_obj = sm.build_mission_obj(sess_obj, card, ms, card["missionUrl"])
+            except records.RecordError as e:
+                print(f"⚠️ {link}: {e}")
+                missing["missions"].append(link)
+                continue
+            for key in ["mission", "reward"]:
+                img_url = mission_obj["images"][key]["url"]
+                if img_url:
+                    mission_obj["images"][key]["file"] = existing_file(
+                        sm.mission_image_path(sess_obj["id"], mission_obj["id"], key, img_url)
+                    )
+            sess_obj["missions"].append(mission_obj)
+
+        sessions_out.append(sess_obj)
+
+    out = {
+        "sourceRoot": sm.ROOT_URL,
+        "generatedAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "sessions": sessions_out,
+    }
+    return out, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Gera o missions.json a partir de páginas salvas (raiz, sessões e missões), sem browser."
+    )
+    parser.add_argument("html_dir", nargs="?", default=DEFAULT_HTML_DIR, help=f"Pasta com os HTMLs salvos (default: {DEFAULT_HTML_DIR})")
+    parser.add_argument("-o", "--out", default=sm.OUT_JSON, help=f"Saída (default: {sm.OUT_JSON})")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="Processos no pool")
+    args = parser.parse_args()
+
+    files = list(iter_html_files(args.html_dir))
+    if not files:
+        raise SystemExit(f"Nenhum HTML em {args.html_dir}")
+
+    t0 = time.time()
+    chunksize = max(1, len(files) // ((args.workers or 1) * 4))
+    with ProcessPoolExecutor(max_workers=args.workers) as ex:
+        pages = list(ex.map(extract_saved_page, files, chunksize=chunksize))
+
+    kinds = {}
+    for p in pages:
+        kinds[p["kind"]] = kinds.get(p["kind"], 0) + 1
+    print(f"{len(files)} arquivos lidos em {time.time() - t0:.2f}s: {kinds}")
+
+    out, missing = build_output(pages)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    records.write_json(args.out, out)
+
+    total = sum(len(s["missions"]) for s in out["sessions"])
+    print(f"Sessões: {len(out['sessions'])} | Missões: {total}")
+    if missing["sessions"]:
+        print(f"⚠️ Sessões sem HTML salvo: {missing['sessions']}")
+    if missing["missions"]:
+        print(f"⚠️ Missões sem HTML salvo: {len(missing['missions'])}")
+    print("📄 JSON:", args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import logging
+import os
+import time
+
+import records
+import script_missions as sm
+
+# Sync incremental: abre só a raiz e as listas das sessões (~10 páginas),
+# compara a impressão digital de cada card com a última rodada e só visita
+# /mission/<linkTo> do que é novo ou mudou. O resto é mesclado do
+# missions.json existente.
+
+
+def load_existing(path: str):
+    """
+    {pageUrl: mission_obj} e {id da sessão: sess_obj} do missions.json anterior.
+    """
+    missions = {}
+    sessions = {}
+    if not os.path.exists(path):
+        return missions, sessions
+    for sess, mission in sm.iter_missions(path):
+        sessions.setdefault(sess["id"], sess)
+        missions[mission["pageUrl"]] = mission
+    return missions, sessions
+
+
+def load_fingerprints(path: str = sm.FINGERPRINTS_JSON) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def plan_cards(cards, existing: dict, fingerprints: dict, force: bool = False):
+    """
+    [(card, fingerprint, ação)], ação = "new" | "changed" | "same".
+    Missão sem entrada no missions.json conta como nova mesmo com
+    fingerprint igual (ex.: rodada anterior falhou nela).
+    """
+    plan = []
+    for card in cards:
+        m_url = card["missionUrl"]
+        fp = sm.card_fingerprint(card)
+        if m_url not in existing:
+            action = "new"
+        elif force or fingerprints.get(m_url) != fp:
+            action = "changed"
+        else:
+            action = "same"
+        plan.append((card, fp, action))
+    return plan
+
+
+def merge_unchanged(old: dict, sess_obj: dict, card) -> dict:
+    # sem visitar a página: só atualiza o que vem do card (progresso da conta)
+    obj = dict(old)
+    obj["section"] = sess_obj["title"]
+    obj["card"] = sm.card_summary(card)
+    return obj
+
+
+def fetch_mission(browser, sess_obj, card):
+    m_url = card["missionUrl"]
+    if not sm.visit(browser, m_url):
+        return None
+    if not sm.ensure_not_redirected_to_home(browser.page, m_url):
+        return None
+
+    m_nd = sm.next_data_from_page(browser.page)
+    ms = sm.extract_mission_status_from_mission_nextdata(m_nd) if m_nd else None
+    if not ms:
+        logging.error(f"MISSÃO sem missionStatus: {m_url}")
+        return None
+
+    try:
+        mission_obj = sm.build_mission_obj(sess_obj, card, ms, m_url)
+    except records.RecordError as e:
+        logging.error(f"MISSÃO fora do schema: {m_url} err={e}")
+        return None
+    for key in ["mission", "reward"]:
+        img_url = mission_obj["images"][key]["url"]
+        if not img_url:
+            continue
+        out_path = sm.mission_image_path(sess_obj["id"], mission_obj["id"], key, img_url)
+        if sm.download_image(img_url, out_path, page=browser.page):
+            mission_obj["images"][key]["file"] = out_path.replace("\\", "/")
+    return mission_obj
+
+
+def keep_session(old_sess, fingerprints: dict, new_fingerprints: dict, seen: set):
+    """
+    Lista da sessão não abriu (redirect, sem __NEXT_DATA__): mantém a sessão
+    anterior inteira, com as fingerprints, em vez de "remover" as missões.
+    """
+    for mission in old_sess.get("missions", []):
+        m_url = mission["pageUrl"]
+        seen.add(m_url)
+        if m_url in fingerprints:
+            new_fingerprints[m_url] = fingerprints[m_url]
+    return old_sess
+
+
+def session_image(browser, sess, old_sess):
+    img_url = sess.get("imageUrl")
+    if not img_url:
+        return None
+    old_img = (old_sess or {}).get("image") or {}
+    if old_img.get("url") == img_url and old_img.get("file") and os.path.exists(old_img["file"]):
+        return old_img
+    out_path = sm.session_image_path(sess["id"], img_url)
+    if sm.download_image(img_url, out_path, page=browser.page):
+        return {"url": img_url, "file": out_path.replace("\\", "/")}
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualiza o missions.json visitando só missões novas ou alteradas.")
+    parser.add_argument("--dry-run", action="store_true", help="Só lista o que mudou, não abre páginas de missão")
+    parser.add_argument("--force", action="store_true", help="Revisita todas as missões (mantém a mesclagem)")
+    args = parser.parse_args()
+
+    from tqdm import tqdm
+    from playwright.sync_api import sync_playwright
+
+    sm.setup()
+    existing, old_sessions = load_existing(sm.OUT_JSON)
+    fingerprints = load_fingerprints()
+    new_fingerprints = {}
+    counts = {"new": 0, "changed": 0, "same": 0, "removed": 0, "failed": 0}
+    sessions_out = []
+    seen = set()
+
+    with sync_playwright() as p:
+        browser = sm.BrowserSession(p)
+
+        root_nd = sm.open_root(browser)
+        if not root_nd:
+            browser.close()
+            return
+
+        sessions = sm.extract_sessions_from_root_nextdata(root_nd)
+        print(f"Encontradas {len(sessions)} sessões (via __NEXT_DATA__).")
+
+        for sess in tqdm(sessions, desc="Sessões"):
+            s_nd = None
+            if sm.visit(browser, sess["url"]) and sm.ensure_not_redirected_to_home(browser.page, sess["url"]):
+                s_nd = sm.next_data_from_page(browser.page)
+                if not s_nd:
+                    logging.error(f"SESSÃO sem __NEXT_DATA__: {sess['url']}")
+            if not s_nd:
+                counts["failed"] += 1
+                if sess["id"] in old_sessions:
+                    sessions_out.append(keep_session(old_sessions[sess["id"]], fingerprints, new_fingerprints, seen))
+                continue
+
+            plan = plan_cards(sm.extract_mission_cards_from_session_nextdata(s_nd), existing, fingerprints, args.force)
+            sess_obj = {
+                "id": sess["id"],
+                "title": sess["title"],
+                "description": sess.get("description", ""),
+                "url": sess["url"],
+                "image": None,
+                "missions": [],
+            }
+
+            for card, fp, action in plan:
+                m_url = card["missionUrl"]
+                seen.add(m_url)
+                counts[action] += 1
+                if action != "same":
+                    print(f"  [{action}] {sess_obj['title']} / {card['name']}")
+
+                if action == "same":
+                    mission_obj = merge_unchanged(existing[m_url], sess_obj, card)
+                elif args.dry_run:
+                    mission_obj = existing.get(m_url)
+                    fp = fingerprints.get(m_url)
+                else:
+                    mission_obj = fetch_mission(browser, sess_obj, card)
+                    if mission_obj is None:
+                        # falhou agora: fica a versão anterior (se houver) e tenta de novo na próxima
+                        counts["failed"] += 1
+                        mission_obj = existing.get(m_url)
+                        fp = fingerprints.get(m_url)
+
+                if mission_obj is not None:
+                    sess_obj["missions"].append(mission_obj)
+                    if fp:
+                        new_fingerprints[m_url] = fp
+
+            if not args.dry_run:
+                sess_obj["image"] = session_image(browser, sess, old_sessions.get(sess["id"]))
+            sessions_out.append(sess_obj)
+
+        stats = browser.stats()
+        browser.close()
+
+    counts["removed"] = len(set(existing) - seen)
+    print(f"\nNovas: {counts['new']} | Alteradas: {counts['changed']} | Iguais: {counts['same']} "
+          f"| Removidas: {counts['removed']} | Falhas: {counts['failed']}")
+    print("🧠 Browser:", stats)
+
+    if args.dry_run:
+        print("(dry-run: nada foi gravado)")
+        return
+
+    out = {
+        "sourceRoot": sm.ROOT_URL,
+        "generatedAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "sessions": sessions_out,
+    }
+    records.write_json(sm.OUT_JSON, out)
+    with open(sm.FINGERPRINTS_JSON, "w", encoding="utf-8") as f:
+        json.dump(new_fingerprints, f, ensure_ascii=False, indent=2)
+
+    print("\n✅ Concluído!")
+    print("📄 JSON:", sm.OUT_JSON)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import math
+import os
+import re
+import time
+import unicodedata
+
+import snapshot
+
+# ========= CONFIG =========
+HTML_FILE = snapshot.DEFAULT_SNAPSHOT
+WIKI_JSON = os.path.join("out_nawiki", "characters.json")   # script_text_image.py
+WIKI_TEXT_JSON = "personagens.json"                          # script_only_text.py
+OUT_DIR = "export"
+OUT_JSON = os.path.join(OUT_DIR, "id_map.json")
+
+MIN_SCORE = 0.6  # abaixo disso fica sem par (vai pro "unmatched")
+NGRAM = 3
+# "(S)" de um lado só: pode ser o mesmo personagem (a wiki às vezes omite),
+# mas perde pro candidato com a mesma variante
+VARIANT_PENALTY = 0.85
+# ==========================
+
+
+def normalize_name(name: str) -> str:
+    """
+    Forma única pra comparar nomes/slugs de qualquer fonte:
+      'Uzumaki Naruto (S)' / 'uzumaki-naruto-s' / 'Uzumaki  Narutó (S)' -> 'uzumaki naruto s'
+    O "(S)" vira o token "s" — continua diferenciando a versão Shippuden.
+    """
+    s = unicodedata.normalize("NFKD", name or "")
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    s = s.lower()
+    s = re.sub(r"[^a-z0-9]+", " ", s)
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def canonical_id(name: str) -> str:
+    return normalize_name(name).replace(" ", "-") or "unknown"
+
+
+def is_variant(norm: str) -> bool:
+    # "(S)" -> token final "s" (versão Shippuden)
+    return norm.endswith(" s")
+
+
+def ngrams(norm: str, n: int = NGRAM) -> set:
+    padded = f"  {norm} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class NgramIndex:
+    """
+    Índice invertido trigram -> ids. Uma consulta só olha os candidatos
+    que dividem pelo menos um trigram, em vez de comparar com todo mundo.
+
+    Os trigrams têm peso idf: pedaços que todo mundo tem ("edo tensei",
+    "uchiha") contam pouco, o que diferencia os nomes conta muito.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.grams = {}
+        self.variant = {}
+        self.by_norm = {}
+        self._weights = None
+
+    def add(self, key: str, name: str):
+        norm = normalize_name(name)
+        grams = ngrams(norm)
+        self.grams[key] = grams
+        self.variant[key] = is_variant(norm)
+        self.by_norm.setdefault(norm, key)
+        for g in grams:
+            self.postings.setdefault(g, []).append(key)
+        self._weights = None
+
+    def weight(self, gram: str) -> float:
+        if self._weights is None:
+            n = len(self.grams) or 1
+            self._weights = {g: math.log(1 + n / len(keys)) for g, keys in self.postings.items()}
+        # trigram que não existe no índice: peso máximo
+        return self._weights.get(gram, math.log(1 + len(self.grams)))
+
+    def candidates(self, name: str, limit: int = 5):
+        """
+        [(key, score)] por Dice ponderado:
+        2*peso(A∩B) / (peso(A)+peso(B)), com penalidade se só um lado é "(S)".
+        """
+        norm = normalize_name(name)
+        exact = self.by_norm.get(norm)
+        if exact is not None:
+            return [(exact, 1.0)]
+
+        grams = ngrams(norm)
+        variant = is_variant(norm)
+        total = sum(self.weight(g) for g in grams)
+        shared = {}
+        for g in grams:
+            w = self.weight(g)
+            for key in self.postings.get(g, ()):
+                shared[key] = shared.get(key, 0.0) + w
+
+        scored = []
+        for key, w in shared.items():
+            score = 2 * w / (total + sum(self.weight(g) for g in self.grams[key]))
+            if self.variant[key] != variant:
+                score *= VARIANT_PENALTY
+            scored.append((key, score))
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        return scored[:limit]
+
+
+# ---------- fontes ----------
+
+def load_sources(wiki_json: str, wiki_text_json: str):
+    """
+    {fonte: {key_da_fonte: nome}}. A chave é a que cada script já usa:
+      snapshot  -> nome em pageProps.chars
+      wiki      -> id de script_text_image.py (slugify(nome))
+      wiki_text -> id de script_only_text.py (slug da URL /arquivo/)
+    """
+    sources = {"snapshot": {ch["name"]: ch["name"] for ch in snapshot.iter_characters(HTML_FILE) if ch.get("name")}}
+
+    for src, path in (("wiki", wiki_json), ("wiki_text", wiki_text_json)):
+        if not path or not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        sources[src] = {r["id"]: r.get("name") or r["id"] for r in records if r.get("id")}
+    return sources
+
+
+def load_map(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"entries": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def match_source(index: NgramIndex, records: dict, taken: set, min_score: float):
+    """
+    Atribuição 1:1 gulosa: todos os pares candidatos ordenados por score,
+    cada lado só pode ser usado uma vez.
+    """
+    pairs = []
+    for key, name in records.items():
+        for target, score in index.candidates(name):
+            if score >= min_score:
+                pairs.append((score, key, target))
+    pairs.sort(key=lambda p: (-p[0], p[1], p[2]))
+
+    used_keys = set()
+    result = {}
+    for score, key, target in pairs:
+        if key in used_keys or target in taken:
+            continue
+        used_keys.add(key)
+        taken.add(target)
+        result[key] = (target, score)
+    return result
+
+
+def build_map(sources: dict, previous: dict, min_score: float = MIN_SCORE):
+    """
+    entries: {id_canônico: {"name", "sources": {fonte: {"key", "confidence"}}}}
+    Pares já gravados no mapa anterior são mantidos sem recalcular.
+    """
+    entries = {}
+    for ch_name in sources["snapshot"]:
+        cid = canonical_id(ch_name)
+        old = (previous.get("entries") or {}).get(cid) or {}
+        entries[cid] = {
+            "name": ch_name,
+            "sources": {"snapshot": {"key": ch_name, "confidence": 1.0}},
+        }
+        for src, link in (old.get("sources") or {}).items():
+            if src != "snapshot" and link.get("key") in sources.get(src, {}):
+                entries[cid]["sources"][src] = link
+
+    index = NgramIndex()
+    for cid, e in entries.items():
+        index.add(cid, e["name"])
+
+    unmatched = {}
+    for src, records in sources.items():
+        if src == "snapshot":
+            continue
+        taken = {cid for cid, e in entries.items() if src in e["sources"]}
+        done = {e["sources"][src]["key"] for e in entries.values() if src in e["sources"]}
+        pending = {k: v for k, v in records.items() if k not in done}
+
+        for key, (cid, score) in match_source(index, pending, taken, min_score).items():
+            entries[cid]["sources"][src] = {"key": key, "confidence": round(score, 3)}
+
+        matched = {e["sources"][src]["key"] for e in entries.values() if src in e["sources"]}
+        unmatched[src] = sorted(k for k in records if k not in matched)
+
+    return {
+        "generatedAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "minScore": min_score,
+        "entries": entries,
+        "unmatched": unmatched,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Casa personagens entre snapshot do site e datasets da wiki (índice de trigramas).")
+    parser.add_argument("--wiki", default=WIKI_JSON, help=f"JSON do script_text_image.py (default: {WIKI_JSON})")
+    parser.add_argument("--wiki-text", default=WIKI_TEXT_JSON, help=f"JSON do script_only_text.py (default: {WIKI_TEXT_JSON})")
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE)
+    parser.add_argument("--rebuild", action="store_true", help="Ignora o mapa anterior e recalcula tudo")
+    parser.add_argument("-o", "--out", default=OUT_JSON)
+    args = parser.parse_args()
+
+    sources = load_sources(args.wiki, args.wiki_text)
+    previous = {"entries": {}} if args.rebuild else load_map(args.out)
+    id_map = build_map(sources, previous, args.min_score)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(id_map, f, ensure_ascii=False, indent=2)
+
+    for src in sources:
+        if src == "snapshot":
+            continue
+        n = sum(1 for e in id_map["entries"].values() if src in e["sources"])
+        print(f"{src}: {n} casados | {len(id_map['unmatched'][src])} sem par")
+    print("📄 JSON:", args.out)
+
+
+if __name__ == "__main__":
+    main()
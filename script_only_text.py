@@ -1,11 +1,28 @@
+import os
 import re
-import json
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+import http_cache
+import records
+
 BASE = "https://naruto-arenawiki.weebly.com/"
 
+# Cache das páginas HTML (ver http_cache.py): live | cache-first | offline
+CACHE_MODE = os.environ.get("NAWIKI_CACHE_MODE", "cache-first")
+CACHE_DIR = http_cache.DEFAULT_CACHE_DIR
+
+
+def fetch_live(url: str) -> str:
+    import requests
+
+    r = requests.get(url, timeout=30)
+    r.raise_for_status()  # 404/5xx não pode ir pro cache como página boa
+    return r.text
+
+
+def fetch(url: str) -> str:
+    return http_cache.get_text(url, fetch_live, mode=CACHE_MODE, cache_dir=CACHE_DIR)
+
 # ---------- helpers: ids / texto ----------
 
 def normalize_id(s: str) -> str:
@@ -125,7 +142,9 @@ def extract_chakra_cost_from_line_container(line_container):
 # ---------- extração de personagem ----------
 
 def extract_character(url: str):
-    html = requests.get(url, timeout=30).text
+    from bs4 import BeautifulSoup
+
+    html = fetch(url)
     soup = BeautifulSoup(html, "html.parser")
 
     # Nome geralmente está no h2
@@ -233,20 +252,22 @@ def extract_character(url: str):
     if not chakra_types:
         chakra_types = ["unknown"]
 
-    return {
+    return records.validate(records.Character, {
         "id": char_id,
         "name": name,
         "description": desc,
         "chakraTypes": chakra_types,
         "skills": skills,
         "_sourceUrl": url,
-    }
+    })
 
 
 # ---------- index: pega todos os links /arquivo/<slug> ----------
 
 def get_character_links():
-    index_html = requests.get(urljoin(BASE, "personagens.html"), timeout=30).text
+    from bs4 import BeautifulSoup
+
+    index_html = fetch(urljoin(BASE, "personagens.html"))
     soup = BeautifulSoup(index_html, "html.parser")
 
     links = []
@@ -273,8 +294,7 @@ def main():
         except Exception as e:
             print(f"  ERRO em {u}: {e}")
 
-    with open("personagens.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    records.write_json("personagens.json", data)
 
     print("Gerado: personagens.json")
 
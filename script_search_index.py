@@ -0,0 +1,173 @@
+import os
+import re
+import json
+import math
+import unicodedata
+from bisect import bisect_left
+
+from script_skill_tokens import load_chars_from_next_data, tokenize_description, LOCALES
+
+# ========= CONFIG =========
+OUT_DIR = "export"
+OUT_TEMPLATE = os.path.join(OUT_DIR, "search_{locale}.json")
+
+# BM25
+K1 = 1.2
+B = 0.75
+SCORE_SCALE = 100  # scores viram int (JSON menor)
+# ==========================
+
+# Campo de descrição do personagem por locale
+CHAR_FIELDS = {
+    "en": "description",
+    "br": "descriptionBR",
+}
+
+STOPWORDS = {
+    "en": {
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "he", "her",
+        "his", "in", "is", "it", "its", "of", "on", "or", "she", "that", "the", "their",
+        "them", "they", "this", "to", "will", "with",
+    },
+    "br": {
+        "a", "ao", "aos", "as", "com", "da", "das", "de", "do", "dos", "e", "ela", "ele",
+        "em", "essa", "esse", "na", "nas", "no", "nos", "o", "os", "ou", "para", "por",
+        "que", "se", "sua", "suas", "seu", "seus", "um", "uma",
+    },
+}
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    s = unicodedata.normalize("NFKD", text or "")
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    return s.lower()
+
+
+def plain_text(desc: str) -> str:
+    # reaproveita o tokenizer da marcação: só o texto, sem as tags
+    return "".join(tok[1] for tok in tokenize_description(desc))
+
+
+def terms_of(text: str, locale: str) -> list[str]:
+    stop = STOPWORDS.get(locale, set())
+    return [w for w in WORD_RE.findall(normalize_text(text)) if w not in stop]
+
+
+def iter_documents(chars, locale: str):
+    """
+    Gera (doc, texto). doc = [id do personagem, índice da skill]
+    (índice -1 = descrição do próprio personagem). O nome da skill entra
+    no texto pra "rasengan" achar a skill Rasengan.
+    """
+    skill_field = LOCALES[locale]
+    char_field = CHAR_FIELDS[locale]
+    for ci, ch in enumerate(chars):
+        yield [ci, -1], f"{ch.get('name', '')} {plain_text(ch.get(char_field) or '')}"
+        for si, sk in enumerate(ch.get("skills", [])):
+            yield [ci, si], f"{sk.get('name', '')} {plain_text(sk.get(skill_field) or '')}"
+
+
+def build_index(chars, locale: str) -> dict:
+    docs = []
+    doc_terms = []
+    for doc, text in iter_documents(chars, locale):
+        docs.append(doc)
+        doc_terms.append(terms_of(text, locale))
+
+    n = len(docs)
+    avg_len = sum(len(t) for t in doc_terms) / max(n, 1)
+
+    tf = {}
+    for d, terms in enumerate(doc_terms):
+        for term in terms:
+            tf.setdefault(term, {})
+            tf[term][d] = tf[term].get(d, 0) + 1
+
+    terms = sorted(tf)
+    postings = []
+    for term in terms:
+        df = len(tf[term])
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        scored = []
+        for d, f in tf[term].items():
+            norm = f + K1 * (1 - B + B * len(doc_terms[d]) / avg_len)
+            scored.append((d, round(SCORE_SCALE * idf * f * (K1 + 1) / norm)))
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        # lista plana [doc, score, doc, score, ...] por termo
+        postings.append([v for pair in scored for v in pair])
+
+    return {
+        "locale": locale,
+        "docs": docs,
+        "chars": [ch.get("name") for ch in chars],
+        "skills": [[sk.get("name") for sk in ch.get("skills", [])] for ch in chars],
+        "terms": terms,
+        "postings": postings,
+    }
+
+
+def _term_postings(index: dict, term: str, prefix: bool):
+    """
+    {doc: score} do termo; com prefix=True junta todos os termos que
+    começam com ele (busca binária em terms, que está ordenado).
+    """
+    terms = index["terms"]
+    i = bisect_left(terms, term)
+    out = {}
+    while i < len(terms) and (terms[i] == term or (prefix and terms[i].startswith(term))):
+        flat = index["postings"][i]
+        for j in range(0, len(flat), 2):
+            d, score = flat[j], flat[j + 1]
+            out[d] = max(out.get(d, 0), score)
+        if not prefix:
+            break
+        i += 1
+    return out
+
+
+def search(index: dict, query: str, limit: int = 20):
+    """
+    Busca enquanto digita: todas as palavras precisam aparecer (AND) e a
+    última vale como prefixo. Retorna [(personagem, skill|None, score)].
+    """
+    words = terms_of(query, index["locale"])
+    if not words:
+        return []
+
+    acc = None
+    for k, w in enumerate(words):
+        hits = _term_postings(index, w, prefix=(k == len(words) - 1))
+        if acc is None:
+            acc = hits
+        else:
+            acc = {d: acc[d] + s for d, s in hits.items() if d in acc}
+        if not acc:
+            return []
+
+    ranked = sorted(acc.items(), key=lambda x: (-x[1], x[0]))[:limit]
+    out = []
+    for d, score in ranked:
+        ci, si = index["docs"][d]
+        skill = index["skills"][ci][si] if si >= 0 else None
+        out.append((index["chars"][ci], skill, score))
+    return out
+
+
+def main():
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+    chars = load_chars_from_next_data()
+    for locale in LOCALES:
+        index = build_index(chars, locale)
+        out_json = OUT_TEMPLATE.format(locale=locale)
+        with open(out_json, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        print(f"[{locale}] docs: {len(index['docs'])} | termos: {len(index['terms'])} -> {out_json}")
+
+    print("\n✅ Concluído!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import os
+
+import numpy as np
+
+from script_skill_tokens import load_chars_from_next_data, tokenize_description
+from script_facets import ENERGY_NAMES, KNOWN_CLASSES, normalize_class, skill_tags
+
+# ========= CONFIG =========
+OUT_DIR = "export"
+OUT_NPZ = os.path.join(OUT_DIR, "skill_matrix.npz")
+# ==========================
+
+# Colunas fixas (a ordem é o formato do arquivo)
+ENERGY_TYPES = list(ENERGY_NAMES)          # Tai, Nin, Gen, Blood, Random
+CLASS_NAMES = sorted(KNOWN_CLASSES)        # bit i = CLASS_NAMES[i]
+TAG_NAMES = ["AoE Damage", "Buffer", "Chakra Steal", "Damage Over Time", "Defense", "Stun"]
+
+
+def bitmask(values, names) -> int:
+    return sum(1 << names.index(v) for v in values if v in names)
+
+
+def build_matrix(chars) -> dict:
+    """
+    Uma linha por skill (856 no snapshot), colunas:
+      char      índice do personagem em pageProps.chars
+      skill     posição da skill dentro do personagem
+      energy    (n, 5) quantidade de cada tipo de chakra
+      cooldown  int
+      classes   bitmask sobre CLASS_NAMES
+      tags      bitmask sobre TAG_NAMES (heurística do script_facets)
+    """
+    rows = []
+    for ci, ch in enumerate(chars):
+        for si, sk in enumerate(ch.get("skills", [])):
+            energy = [0] * len(ENERGY_TYPES)
+            for e in sk.get("energy") or []:
+                if e in ENERGY_TYPES:
+                    energy[ENERGY_TYPES.index(e)] += 1
+            classes = {normalize_class(c) for c in sk.get("classes") or []}
+            tags = skill_tags(tokenize_description(sk.get("description") or ""))
+            rows.append((ci, si, energy, int(sk.get("cooldown") or 0),
+                         bitmask(classes, CLASS_NAMES), bitmask(tags, TAG_NAMES), sk.get("name") or ""))
+
+    return {
+        "char": np.array([r[0] for r in rows], dtype=np.int16),
+        "skill": np.array([r[1] for r in rows], dtype=np.int8),
+        "energy": np.array([r[2] for r in rows], dtype=np.int8).reshape(-1, len(ENERGY_TYPES)),
+        "cooldown": np.array([r[3] for r in rows], dtype=np.int8),
+        "classes": np.array([r[4] for r in rows], dtype=np.uint32),
+        "tags": np.array([r[5] for r in rows], dtype=np.uint8),
+        "skill_names": np.array([r[6] for r in rows], dtype=str),
+        "char_names": np.array([ch.get("name") or "" for ch in chars], dtype=str),
+        "energy_types": np.array(ENERGY_TYPES, dtype=str),
+        "class_names": np.array(CLASS_NAMES, dtype=str),
+        "tag_names": np.array(TAG_NAMES, dtype=str),
+    }
+
+
+class SkillMatrix:
+    """
+    Consultas vetorizadas em cima das colunas. Resultados por personagem
+    são arrays de tamanho n_chars indexados como pageProps.chars.
+
+        m = SkillMatrix.load()
+        m.names(m.with_class("Mental") & (m.cost == 1))
+        m.char_energy()[:, m.energy_col("Tai")]
+    """
+
+    def __init__(self, cols: dict):
+        self.char = cols["char"]
+        self.skill = cols["skill"]
+        self.energy = cols["energy"]
+        self.cooldown = cols["cooldown"]
+        self.classes = cols["classes"]
+        self.tags = cols["tags"]
+        self.skill_names = cols["skill_names"]
+        self.char_names = cols["char_names"]
+        self.energy_types = list(cols["energy_types"])
+        self.class_names = list(cols["class_names"])
+        self.tag_names = list(cols["tag_names"])
+        self.cost = self.energy.sum(axis=1)
+        self.n_chars = len(self.char_names)
+
+    @classmethod
+    def load(cls, path: str = OUT_NPZ):
+        with np.load(path) as data:
+            return cls({k: data[k] for k in data.files})
+
+    @classmethod
+    def from_chars(cls, chars):
+        return cls(build_matrix(chars))
+
+    # ---------- máscaras por skill ----------
+
+    def energy_col(self, name: str) -> int:
+        # aceita "Tai" ou "Taijutsu"
+        for i, e in enumerate(self.energy_types):
+            if name in (e, ENERGY_NAMES.get(e)):
+                return i
+        raise KeyError(name)
+
+    def with_class(self, name: str):
+        return (self.classes & np.uint32(1 << self.class_names.index(name))) != 0
+
+    def with_tag(self, name: str):
+        return (self.tags & np.uint8(1 << self.tag_names.index(name))) != 0
+
+    def uses(self, energy: str):
+        return self.energy[:, self.energy_col(energy)] > 0
+
+    def names(self, mask) -> list[tuple[str, str]]:
+        idx = np.flatnonzero(mask)
+        return [(str(self.char_names[self.char[i]]), str(self.skill_names[i])) for i in idx]
+
+    # ---------- agregados por personagem ----------
+
+    def per_char(self, values, mask=None):
+        """
+        Soma values (por skill, 1D ou 2D) por personagem.
+        """
+        values = np.asarray(values)
+        if mask is not None:
+            values = np.where(mask.reshape((-1,) + (1,) * (values.ndim - 1)), values, 0)
+        out = np.zeros((self.n_chars,) + values.shape[1:], dtype=np.int32)
+        np.add.at(out, self.char, values)
+        return out
+
+    def char_energy(self, mask=None):
+        """
+        (n_chars, 5): chakra total de cada tipo somando as skills.
+        """
+        return self.per_char(self.energy, mask)
+
+    def cheapest_rotation(self, k: int = 3):
+        """
+        Custo total das k skills ativas (não Passive) mais baratas de cada
+        personagem. Personagem com menos de k skills ativas fica com -1.
+        """
+        active = ~self.with_class("Passive")
+        big = np.iinfo(np.int16).max
+        table = np.full((self.n_chars, int(self.skill.max()) + 1), big, dtype=np.int16)
+        table[self.char[active], self.skill[active]] = self.cost[active]
+        table.sort(axis=1)
+        best = table[:, :k]
+        total = best.sum(axis=1, dtype=np.int32)
+        return np.where((best == big).any(axis=1), -1, total)
+
+    def cooldown_pressure(self):
+        """
+        Média de cooldown das skills ativas: quanto maior, mais turnos o
+        personagem passa sem poder repetir o que tem de melhor.
+        """
+        active = ~self.with_class("Passive")
+        total = self.per_char(self.cooldown.astype(np.int32), active)
+        count = self.per_char(active.astype(np.int32))
+        return np.divide(total, count, out=np.zeros(self.n_chars), where=count > 0)
+
+    def top_chars(self, scores, n: int = 10) -> list[tuple[str, float]]:
+        order = np.argsort(-np.asarray(scores), kind="stable")[:n]
+        return [(str(self.char_names[i]), float(scores[i])) for i in order]
+
+
+def main():
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+    cols = build_matrix(load_chars_from_next_data())
+    np.savez_compressed(OUT_NPZ, **cols)
+
+    m = SkillMatrix(cols)
+    print(f"Skills: {len(m.char)} | Personagens: {m.n_chars}")
+    totals = m.char_energy().sum(axis=0)
+    print("Chakra total:", ", ".join(f"{e}={t}" for e, t in zip(m.energy_types, totals)))
+    rotation = m.cheapest_rotation(3)
+    print(f"Rotação de 3 skills custando <= 1 chakra: {int(((rotation >= 0) & (rotation <= 1)).sum())} personagens")
+    print("Maior pressão de cooldown:", m.top_chars(m.cooldown_pressure(), 3))
+
+    print("\n✅ Concluído!")
+    print("📦 NPZ:", OUT_NPZ)
+
+
+if __name__ == "__main__":
+    main()
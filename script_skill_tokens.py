@@ -0,0 +1,139 @@
+import os
+import re
+import json
+
+import snapshot
+
+# ========= CONFIG =========
+HTML_FILE = "Characters and Skills - Naruto Arena Classic2.html"
+OUT_DIR = "export"
+OUT_JSON = os.path.join(OUT_DIR, "skill_tokens.json")
+# ==========================
+
+# Campos de descrição por locale (pageProps.chars[*].skills[*])
+LOCALES = {
+    "en": "description",
+    "br": "descriptionBR",
+}
+
+TEXT = "Text"
+BREAK = "br"
+
+# Variações de tag que aparecem no snapshot -> nome canônico
+TAG_ALIASES = {
+    "classes": "Classes",
+    "classe": "Classes",
+}
+
+# Spans de onde vale a pena puxar o número (ex.: "deals 20 damage" -> 20)
+NUMERIC_KINDS = {"Damage", "Defense", "Improvements", "Effects"}
+
+TAG_RE = re.compile(r"<(\w+)>")
+NUMBER_RE = re.compile(r"\d+")
+
+
+def load_chars_from_next_data():
+    return list(snapshot.iter_characters(HTML_FILE))
+
+
+def canonical_tag(tag: str) -> str:
+    return TAG_ALIASES.get(tag.lower(), tag)
+
+
+def make_token(kind: str, text: str):
+    """
+    Token compacto: [kind, text] ou [kind, text, valor] quando o span
+    tem um número (dano, defesa, melhoria...).
+    """
+    if kind == "SkillName":
+        text = text.strip("'")
+    if kind in NUMERIC_KINDS:
+        m = NUMBER_RE.search(text)
+        if m:
+            return [kind, text, int(m.group(0))]
+    return [kind, text]
+
+
+def tokenize_description(desc: str):
+    """
+    Compila a marcação do site em spans (kind, text).
+
+    A marcação usa a MESMA tag para abrir e fechar (<Damage>...<Damage>)
+    e nem sempre vem balanceada, então:
+      - tag igual à aberta fecha o span
+      - tag diferente fecha a atual e abre a nova
+      - <br> vira um token de quebra e não mexe no span aberto
+      - span sem fechamento termina no fim do texto
+    """
+    tokens = []
+    if not desc:
+        return tokens
+
+    current = TEXT
+    pos = 0
+
+    def flush(end):
+        text = desc[pos:end]
+        if current != TEXT:
+            # restos de marcação quebrada tipo "<Improvements>>improved<<Improvements>"
+            text = text.strip("<>")
+        if not text:
+            return
+        # junta com o anterior se for o mesmo tipo de texto corrido
+        if current == TEXT and tokens and tokens[-1][0] == TEXT:
+            tokens[-1][1] += text
+            return
+        tokens.append(make_token(current, text))
+
+    for m in TAG_RE.finditer(desc):
+        tag = canonical_tag(m.group(1))
+        flush(m.start())
+        pos = m.end()
+
+        if tag.lower() == BREAK:
+            tokens.append([BREAK, "\n"])
+            continue
+
+        current = TEXT if tag == current else tag
+
+    flush(len(desc))
+    return tokens
+
+
+def compile_skill(sk: dict) -> dict:
+    out = {"name": sk.get("name")}
+    for locale, field in LOCALES.items():
+        out[locale] = tokenize_description(sk.get(field) or "")
+    return out
+
+
+def build_tokens(chars):
+    """
+    { "<nome do personagem>": [ {name, en: [...], br: [...]}, ... ] }
+    A lista de skills segue a mesma ordem de pageProps.chars[*].skills.
+    """
+    out = {}
+    for ch in chars:
+        out[ch.get("name")] = [compile_skill(sk) for sk in ch.get("skills", [])]
+    return out
+
+
+def main():
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+    chars = load_chars_from_next_data()
+    tokens = build_tokens(chars)
+
+    total = sum(len(v) for v in tokens.values())
+    print(f"Personagens: {len(tokens)} | Skills compiladas: {total}")
+
+    # saída compacta (sem indent) — é carregada pelo site
+    with open(OUT_JSON, "w", encoding="utf-8") as f:
+        json.dump(tokens, f, ensure_ascii=False, separators=(",", ":"))
+
+    print("\n✅ Concluído!")
+    print("📄 JSON:", OUT_JSON)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+from urllib.request import urlopen
+
+import records
+import snapshot
+from script_mission_index import build_index as build_mission_index, what_unlocks
+from script_missions import OUT_JSON as MISSIONS_JSON, iter_missions
+from script_name_match import normalize_name
+from script_search_index import build_index as build_search_index, search
+from script_skill_tokens import LOCALES
+
+# Serviço local que carrega os snapshots uma vez e responde consultas a
+# partir de índices em memória (sem reparsear o __NEXT_DATA__ a cada
+# pergunta). Um watcher confere o mtime dos arquivos e recarrega sozinho;
+# a troca é atômica (as consultas em andamento terminam no estado antigo).
+#
+#   GET /character/<nome>      GET /skill/<nome>        GET /mission/<id>
+#   GET /unlocks/<personagem>  GET /search?q=...&locale=en
+#   GET /diff?a=<snapshot>&b=<snapshot>                 GET /status
+
+# ========= CONFIG =========
+HOST = "127.0.0.1"
+PORT = 8766
+SNAPSHOT_GLOB = "Characters and Skills - Naruto Arena Classic*.html"
+WATCH_INTERVAL = 2.0
+# ==========================
+
+SKILL_FIELDS = ("description", "descriptionBR", "energy", "classes", "cooldown", "url")
+
+
+def diff_snapshots(chars_a, chars_b) -> dict:
+    """
+    Personagens adicionados/removidos e skills com campo alterado.
+    """
+    a = {ch["name"]: ch for ch in chars_a}
+    b = {ch["name"]: ch for ch in chars_b}
+    changed = {}
+    for name in sorted(a.keys() & b.keys()):
+        skills_a = {sk["name"]: sk for sk in a[name].get("skills") or []}
+        skills_b = {sk["name"]: sk for sk in b[name].get("skills") or []}
+        entry = {}
+        if skills_b.keys() - skills_a.keys():
+            entry["addedSkills"] = sorted(skills_b.keys() - skills_a.keys())
+        if skills_a.keys() - skills_b.keys():
+            entry["removedSkills"] = sorted(skills_a.keys() - skills_b.keys())
+        for sk_name in sorted(skills_a.keys() & skills_b.keys()):
+            fields = [f for f in SKILL_FIELDS if skills_a[sk_name].get(f) != skills_b[sk_name].get(f)]
+            if fields:
+                entry.setdefault("changedSkills", {})[sk_name] = fields
+        if entry:
+            changed[name] = entry
+    return {
+        "addedCharacters": sorted(b.keys() - a.keys()),
+        "removedCharacters": sorted(a.keys() - b.keys()),
+        "changed": changed,
+    }
+
+
+def file_mtime(path: str):
+    # None = arquivo ausente (apareceu ou sumiu -> recarrega)
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class State:
+    """
+    Tudo que uma consulta precisa, montado de uma vez. Imutável depois de
+    pronto: recarregar = montar outro State e trocar a referência.
+    """
+
+    def __init__(self, snapshot_paths, missions_json: str):
+        t0 = time.time()
+        self.files = {}
+        self.snapshots = {}
+        for path in snapshot_paths:
+            self.snapshots[os.path.basename(path)] = list(snapshot.iter_characters(path))
+            self.files[path] = os.path.getmtime(path)
+
+        # snapshot "atual" = o primeiro da lista (DEFAULT_SNAPSHOT se existir)
+        self.current = os.path.basename(snapshot_paths[0]) if snapshot_paths else None
+        chars = self.snapshots.get(self.current, [])
+
+        self.characters = {}
+        self.skills = {}
+        for ch in chars:
+            self.characters[normalize_name(ch.get("name"))] = ch
+            for sk in ch.get("skills") or []:
+                hit = dict(sk, character=ch.get("name"))
+                self.skills.setdefault(normalize_name(sk.get("name")), []).append(hit)
+
+        self.search = {locale: build_search_index(chars, locale) for locale in LOCALES}
+
+        self.missions = {}
+        self.mission_index = None
+        if missions_json:
+            # vigiado mesmo se ainda não existe: o sync cria depois
+            self.files[missions_json] = file_mtime(missions_json)
+        if missions_json and os.path.exists(missions_json):
+            self.missions = {m["id"]: m for _, m in iter_missions(missions_json)}
+            self.mission_index = build_mission_index(list(self.missions.values()))
+
+        self._diffs = {}
+        self._diff_lock = threading.Lock()
+        self.loaded_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.load_seconds = round(time.time() - t0, 3)
+
+    def stale(self) -> bool:
+        return any(file_mtime(path) != mtime for path, mtime in self.files.items())
+
+    def diff(self, a: str, b: str) -> dict:
+        with self._diff_lock:
+            if (a, b) not in self._diffs:
+                self._diffs[(a, b)] = diff_snapshots(self.snapshots[a], self.snapshots[b])
+            return self._diffs[(a, b)]
+
+    def status(self) -> dict:
+        return {
+            "current": self.current,
+            "snapshots": {name: len(chars) for name, chars in self.snapshots.items()},
+            "missions": len(self.missions),
+            "loadedAt": self.loaded_at,
+            "loadSeconds": self.load_seconds,
+        }
+
+
+class Service:
+    def __init__(self, snapshot_paths, missions_json: str):
+        self.snapshot_paths = snapshot_paths
+        self.missions_json = missions_json
+        self.state = State(snapshot_paths, missions_json)
+        self.reloads = 0
+
+    def watch(self, interval: float = WATCH_INTERVAL):
+        while True:
+            time.sleep(interval)
+            if not self.state.stale():
+                continue
+            try:
+                self.state = State(self.snapshot_paths, self.missions_json)
+                self.reloads += 1
+                print(f"🔄 Recarregado em {self.state.load_seconds}s")
+            except Exception as e:
+                # arquivo no meio da escrita etc.: mantém o estado antigo e tenta de novo
+                print(f"⚠️ Falha ao recarregar: {e}")
+
+    def handle(self, path: str, query: dict):
+        """
+        (status HTTP, corpo) — corpo vira JSON.
+        """
+        st = self.state
+        parts = [unquote(p) for p in path.strip("/").split("/", 1)]
+        route, arg = parts[0], (parts[1] if len(parts) > 1 else "")
+
+        if route == "status":
+            return 200, dict(st.status(), reloads=self.reloads)
+        if route == "character":
+            ch = st.characters.get(normalize_name(arg))
+            return (200, ch) if ch else (404, {"error": f"personagem não encontrado: {arg}"})
+        if route == "skill":
+            hits = st.skills.get(normalize_name(arg))
+            return (200, hits) if hits else (404, {"error": f"skill não encontrada: {arg}"})
+        if route == "mission":
+            m = st.missions.get(arg)
+            return (200, m) if m else (404, {"error": f"missão não encontrada: {arg}"})
+        if route == "unlocks":
+            if st.mission_index is None:
+                return 404, {"error": "missions.json não carregado"}
+            ids = what_unlocks(st.mission_index, arg)
+            return 200, [st.missions[i] for i in ids]
+        if route == "search":
+            locale = (query.get("locale") or ["en"])[0]
+            if locale not in st.search:
+                return 400, {"error": f"locale inválido: {locale}"}
+            q = (query.get("q") or [""])[0]
+            try:
+                limit = int((query.get("limit") or ["20"])[0])
+            except ValueError:
+                return 400, {"error": "limit precisa ser inteiro"}
+            hits = search(st.search[locale], q, limit)
+            return 200, [{"character": c, "skill": s, "score": score} for c, s, score in hits]
+        if route == "diff":
+            a = (query.get("a") or [None])[0]
+            b = (query.get("b") or [st.current])[0]
+            if a not in st.snapshots or b not in st.snapshots:
+                return 400, {"error": f"snapshots carregados: {sorted(st.snapshots)}"}
+            return 200, st.diff(a, b)
+        return 404, {"error": f"rota desconhecida: /{route}"}
+
+
+def make_handler(service: Service):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            try:
+                code, body = service.handle(url.path, parse_qs(url.query))
+            except Exception as e:
+                code, body = 500, {"error": str(e)}
+            data = records.dumps(body, pretty=False)
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def query(path: str, host: str = HOST, port: int = PORT):
+    """
+    Cliente pros scripts: query("/character/Uzumaki Naruto").
+    """
+    from urllib.parse import quote
+
+    with urlopen(f"http://{host}:{port}{quote(path, safe='/?=&')}") as resp:
+        return json.loads(resp.read())
+
+
+def default_snapshots():
+    paths = sorted(glob.glob(SNAPSHOT_GLOB))
+    if snapshot.DEFAULT_SNAPSHOT in paths:
+        paths.remove(snapshot.DEFAULT_SNAPSHOT)
+        paths.insert(0, snapshot.DEFAULT_SNAPSHOT)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço local com os snapshots em memória (consultas + recarga automática).")
+    parser.add_argument("snapshots", nargs="*", help=f"HTMLs (default: {SNAPSHOT_GLOB}; o primeiro é o atual)")
+    parser.add_argument("--missions", default=MISSIONS_JSON, help=f"default: {MISSIONS_JSON}")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+
+    paths = args.snapshots or default_snapshots()
+    if not paths:
+        raise SystemExit("Nenhum snapshot encontrado")
+
+    service = Service(paths, args.missions)
+    threading.Thread(target=service.watch, daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Carregado em {service.state.load_seconds}s: {service.state.status()['snapshots']}")
+    print(f"🔎 http://{args.host}:{args.port}/character/Uzumaki%20Naruto")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from script_facets import ENERGY_NAMES
+from script_skill_matrix import OUT_NPZ as MATRIX_NPZ, SkillMatrix, TAG_NAMES
+from script_skill_tokens import load_chars_from_next_data
+
+# ========= CONFIG =========
+OUT_DIR = "export"
+OUT_JSON = os.path.join(OUT_DIR, "team_index.json")
+
+TOP_K = 50
+CHUNK_CHARS = 8          # personagens "líderes" (primeiro da trinca) por tarefa do pool
+
+# Pesos do score (tudo por time de 3)
+MEMBER_WEIGHT = 10       # cada membro que cobre a tag
+SKILL_WEIGHT = 1         # cada skill com a tag
+CHAKRA_PER_TURN = 3      # chakra que o time ganha por turno no jogo
+OVERSPEND_WEIGHT = 4     # por chakra médio gasto acima do que entra
+COOLDOWN_WEIGHT = 1      # por turno de cooldown médio (somado nos 3)
+# ==========================
+
+# tipos "de verdade" (Random se paga com qualquer um, não define perfil)
+PROFILE_TYPES = [e for e in ENERGY_NAMES if e != "Random"]
+
+_features = None
+
+
+def char_features(m: SkillMatrix) -> dict:
+    """
+    Vetores de tamanho fixo por personagem (só skills ativas, sem Passive):
+      tags     (n, 6) skills com cada tag
+      cost     custo médio de chakra de uma skill
+      cooldown cooldown médio
+      profile  bitmask dos tipos em PROFILE_TYPES que o personagem usa
+    """
+    active = ~m.with_class("Passive")
+    count = np.maximum(m.per_char(active.astype(np.int32)), 1)
+
+    tags = np.stack([m.per_char(m.with_tag(t).astype(np.int32), active) for t in TAG_NAMES], axis=1)
+    energy = m.char_energy(active)
+    profile = np.zeros(m.n_chars, dtype=np.uint8)
+    for bit, e in enumerate(PROFILE_TYPES):
+        profile |= (energy[:, m.energy_col(e)] > 0).astype(np.uint8) << bit
+
+    return {
+        "tags": tags.astype(np.int16),
+        "cost": m.per_char(m.cost.astype(np.int32), active) / count,
+        "cooldown": m.cooldown_pressure(),
+        "profile": profile,
+    }
+
+
+def profile_name(code: int) -> str:
+    types = [ENERGY_NAMES[e] for bit, e in enumerate(PROFILE_TYPES) if code >> bit & 1]
+    return "+".join(types) or "Random"
+
+
+def teams_for(leaders, n: int):
+    """
+    Todas as trincas i<j<k com i em leaders, como 3 arrays.
+    """
+    a, b, c = [], [], []
+    for i in leaders:
+        j, k = np.triu_indices(n - i - 1, 1)
+        a.append(np.full(len(j), i, dtype=np.int16))
+        b.append((j + i + 1).astype(np.int16))
+        c.append((k + i + 1).astype(np.int16))
+    return np.concatenate(a), np.concatenate(b), np.concatenate(c)
+
+
+def score_teams(f: dict, a, b, c):
+    """
+    (scores por tag (m, 6), score geral (m,), perfil (m,)) — tudo em lote.
+    """
+    ta, tb, tc = f["tags"][a], f["tags"][b], f["tags"][c]
+    members = (ta > 0).astype(np.int16) + (tb > 0) + (tc > 0)
+    skills = ta + tb + tc
+
+    turn_cost = f["cost"][a] + f["cost"][b] + f["cost"][c]
+    overspend = np.maximum(turn_cost - CHAKRA_PER_TURN, 0)
+    cooldown = f["cooldown"][a] + f["cooldown"][b] + f["cooldown"][c]
+    penalty = OVERSPEND_WEIGHT * overspend + COOLDOWN_WEIGHT * cooldown
+
+    per_tag = MEMBER_WEIGHT * members + SKILL_WEIGHT * skills - penalty[:, None]
+    # geral: quantas tags o time cobre + tamanho do kit, menos a mesma penalidade
+    overall = MEMBER_WEIGHT * (members > 0).sum(axis=1) + SKILL_WEIGHT * skills.sum(axis=1) - penalty
+    profile = f["profile"][a] | f["profile"][b] | f["profile"][c]
+    return per_tag, overall, profile
+
+
+def top_k(scores, k: int):
+    """
+    Índices dos k maiores, ordenados (argpartition + sort só no pedaço).
+    """
+    if len(scores) > k:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def _init_worker(features):
+    global _features
+    _features = features
+
+
+def evaluate_chunk(leaders, n: int, k: int):
+    """
+    Roda no pool: pontua todas as trincas dos leaders e devolve só os
+    candidatos a top-K de cada tag/perfil (o resto nunca sai do worker).
+    """
+    a, b, c = teams_for(leaders, n)
+    per_tag, overall, profile = score_teams(_features, a, b, c)
+    teams = np.stack([a, b, c], axis=1)
+
+    out = {"tags": {}, "profiles": {}, "teams": len(a)}
+    for t, tag in enumerate(TAG_NAMES):
+        idx = top_k(per_tag[:, t], k)
+        out["tags"][tag] = (teams[idx], per_tag[idx, t])
+    for code in np.unique(profile):
+        sel = np.flatnonzero(profile == code)
+        idx = sel[top_k(overall[sel], k)]
+        out["profiles"][int(code)] = (teams[idx], overall[idx])
+    return out
+
+
+def merge(results, k: int):
+    merged = {"tags": {}, "profiles": {}}
+    for group in merged:
+        keys = {key for r in results for key in r[group]}
+        for key in keys:
+            teams = np.concatenate([r[group][key][0] for r in results if key in r[group]])
+            scores = np.concatenate([r[group][key][1] for r in results if key in r[group]])
+            idx = top_k(scores, k)
+            merged[group][key] = [[*map(int, teams[i]), round(float(scores[i]), 2)] for i in idx]
+    return merged
+
+
+def build_team_index(m: SkillMatrix, k: int = TOP_K, workers: int = None):
+    features = char_features(m)
+    n = m.n_chars
+    chunks = [list(range(i, min(i + CHUNK_CHARS, n - 2))) for i in range(0, n - 2, CHUNK_CHARS)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(features,)) as ex:
+        results = list(ex.map(evaluate_chunk, chunks, [n] * len(chunks), [k] * len(chunks)))
+
+    merged = merge(results, k)
+    return {
+        "generatedAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "teamsScored": sum(r["teams"] for r in results),
+        "topK": k,
+        "chars": [str(x) for x in m.char_names],
+        # cada entrada: [char_a, char_b, char_c, score] (índices em "chars")
+        "tags": {tag: merged["tags"][tag] for tag in TAG_NAMES},
+        "profiles": {profile_name(code): teams for code, teams in sorted(merged["profiles"].items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pontua todos os times de 3 e gera o top-K por tag e por perfil de chakra.")
+    parser.add_argument("--matrix", default=MATRIX_NPZ, help=f"skill_matrix.npz (default: {MATRIX_NPZ}; se não existir, lê o snapshot)")
+    parser.add_argument("-k", "--top-k", type=int, default=TOP_K)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("-o", "--out", default=OUT_JSON)
+    args = parser.parse_args()
+
+    if os.path.exists(args.matrix):
+        m = SkillMatrix.load(args.matrix)
+    else:
+        m = SkillMatrix.from_chars(load_chars_from_next_data())
+
+    t0 = time.time()
+    index = build_team_index(m, args.top_k, args.workers)
+    print(f"{index['teamsScored']} times pontuados em {time.time() - t0:.1f}s")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+
+    names = index["chars"]
+    for tag, teams in index["tags"].items():
+        if teams:
+            a, b, c, score = teams[0]
+            print(f"{tag}: {names[a]} / {names[b]} / {names[c]} ({score})")
+    print("📄 JSON:", args.out)
+
+
+if __name__ == "__main__":
+    main()
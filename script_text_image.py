@@ -1,11 +1,15 @@
 import os
 import re
-import json
 import time
+from typing import TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
+import http_cache
+import records
+import download_guard
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 
 BASE = "https://naruto-arenawiki.weebly.com/"
@@ -23,6 +27,11 @@ HEADERS = {
 REQUEST_DELAY_SECONDS = 0.6
 TIMEOUT = 30
 
+# Cache das páginas HTML (ver http_cache.py): live | cache-first | offline
+# offline = reprocessa tudo do cache, sem rede (bom pra mexer no parser)
+CACHE_MODE = os.environ.get("NAWIKI_CACHE_MODE", "cache-first")
+CACHE_DIR = http_cache.DEFAULT_CACHE_DIR  # compartilhado com script_only_text.py
+
 
 def slugify(name: str) -> str:
     """
@@ -64,25 +73,36 @@ def guess_ext_from_url(url: str) -> str:
     return ".png"
 
 
-def fetch(url: str) -> str:
+def fetch_live(url: str) -> str:
+    import requests
+
     time.sleep(REQUEST_DELAY_SECONDS)
     r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
     r.raise_for_status()
     return r.text
 
 
+def fetch(url: str) -> str:
+    # o delay só acontece quando vai de fato na rede
+    return http_cache.get_text(url, fetch_live, mode=CACHE_MODE, cache_dir=CACHE_DIR)
+
+
 def download_file(url: str, dest_path: str) -> None:
+    import requests
+
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
     time.sleep(REQUEST_DELAY_SECONDS)
-    with requests.get(url, headers=HEADERS, timeout=TIMEOUT, stream=True) as r:
-        r.raise_for_status()
-        with open(dest_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=1024 * 64):
-                if chunk:
-                    f.write(chunk)
+
+    def get(u, **kwargs):
+        return requests.get(u, headers=HEADERS, **kwargs)
+
+    # prazo total + detector de travamento; grava em .part e renomeia
+    download_guard.fetch_to_file(get, url, dest_path, passthrough=())
 
 
 def parse_index_character_links(index_html: str) -> list[str]:
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(index_html, "html.parser")
     links = set()
 
@@ -103,23 +123,23 @@ def parse_index_character_links(index_html: str) -> list[str]:
     return sorted(links)
 
 
-def parse_chakra_cost(raw: str) -> dict:
+def parse_chakra_cost(raw: str) -> list[dict]:
     """
-    NAWiki mostra:
-    - "Chakra Necessário: ⯀⯀"  -> { Random: 2 }
-    - "Chakra Necessário: ⯀"    -> { Random: 1 }
-    - "Chakra Necessário: Nenhum" -> {}
+    NAWiki mostra (formato ChakraRequirement[] do front):
+    - "Chakra Necessário: ⯀⯀"  -> [{type: Random, total: 2}]
+    - "Chakra Necessário: ⯀"    -> [{type: Random, total: 1}]
+    - "Chakra Necessário: Nenhum" -> []
     """
     raw = raw.strip()
     if not raw or "Nenhum" in raw or "nenhum" in raw:
-        return {}
+        return []
 
     count = raw.count("⯀")
     if count > 0:
-        return {"Random": count}
+        return [{"type": "Random", "total": count}]
 
     # fallback: se aparecer algo inesperado, guarda como string
-    return {"Unknown": raw}
+    return [{"type": "Unknown", "total": raw}]
 
 
 def parse_cooldown(raw: str) -> int:
@@ -145,13 +165,15 @@ def normalize_classes(raw: str) -> list[str]:
     return parts
 
 
-def extract_main_content(soup: BeautifulSoup):
+def extract_main_content(soup: "BeautifulSoup"):
     # Weebly geralmente coloca conteúdo no #wsite-content
     main = soup.select_one("#wsite-content")
     return main if main else soup
 
 
 def parse_character_page(url: str) -> dict:
+    from bs4 import BeautifulSoup
+
     html = fetch(url)
     soup = BeautifulSoup(html, "html.parser")
     main = extract_main_content(soup)
@@ -287,14 +309,41 @@ def parse_character_page(url: str) -> dict:
             "_imageUrl": s.get("imageUrl"),  # campo interno p/ download
         })
 
-    return {
+    # valida no schema do front: página mal parseada estoura aqui (ERRO no main)
+    return records.validate(records.Character, {
         "id": char_id,
         "name": name,
         "chakraTypes": ["Random"],  # NAWiki usa ⯀ como “random” na prática; se você quiser mapear melhor depois, dá.
         "skills": out_skills,
         "_characterImageUrl": character_image_url,  # campo interno p/ download
         "_sourceUrl": url,
-    }
+    })
+
+
+def image_downloads(data: dict, taken: set) -> list[tuple[str, str]]:
+    """
+    [(url, caminho)] das imagens do personagem e das skills (campos internos
+    _characterImageUrl/_imageUrl). taken = caminhos já usados na rodada:
+    skill com mesmo nome em outro personagem ganha o prefixo do personagem.
+    """
+    out = []
+    if data.get("_characterImageUrl"):
+        ext = guess_ext_from_url(data["_characterImageUrl"])
+        char_path = os.path.join(CHAR_IMG_DIR, safe_filename(data["name"]) + ext)
+        taken.add(char_path)
+        out.append((data["_characterImageUrl"], char_path))
+
+    for sk in data.get("skills", []):
+        img_url = sk.get("_imageUrl")
+        if not img_url:
+            continue
+        ext = guess_ext_from_url(img_url)
+        skill_path = os.path.join(SKILL_IMG_DIR, safe_filename(sk["name"]) + ext)
+        if skill_path in taken:
+            skill_path = os.path.join(SKILL_IMG_DIR, safe_filename(f"{data['name']} - {sk['name']}") + ext)
+        taken.add(skill_path)
+        out.append((img_url, skill_path))
+    return out
 
 
 def main():
@@ -308,42 +357,20 @@ def main():
     print(f"Encontrados {len(character_urls)} links de personagens no índice.")
 
     all_chars = []
+    taken = set()
     for i, url in enumerate(character_urls, 1):
         try:
             print(f"[{i}/{len(character_urls)}] {url}")
             data = parse_character_page(url)
 
-            # baixa imagem do personagem
-            if data.get("_characterImageUrl"):
-                ext = guess_ext_from_url(data["_characterImageUrl"])
-                char_file = safe_filename(data["name"]) + ext
-                char_path = os.path.join(CHAR_IMG_DIR, char_file)
-                if not os.path.exists(char_path):
-                    download_file(data["_characterImageUrl"], char_path)
-
-            # baixa imagens das habilidades
-            for sk in data["skills"]:
-                img_url = sk.get("_imageUrl")
-                if not img_url:
-                    continue
-                ext = guess_ext_from_url(img_url)
-                skill_file = safe_filename(sk["name"]) + ext
-                skill_path = os.path.join(SKILL_IMG_DIR, skill_file)
-
-                # evita sobrescrever se houver skill com mesmo nome em outro personagem
-                if os.path.exists(skill_path):
-                    # cria um nome alternativo com prefixo do personagem
-                    skill_file = safe_filename(f"{data['name']} - {sk['name']}") + ext
-                    skill_path = os.path.join(SKILL_IMG_DIR, skill_file)
-
-                if not os.path.exists(skill_path):
-                    download_file(img_url, skill_path)
-
-                # remove campo interno
-                sk.pop("_imageUrl", None)
+            for img_url, path in image_downloads(data, taken):
+                if not os.path.exists(path):
+                    download_file(img_url, path)
 
             # remove campos internos
             data.pop("_characterImageUrl", None)
+            for sk in data["skills"]:
+                sk.pop("_imageUrl", None)
 
             all_chars.append(data)
         except Exception as e:
@@ -351,8 +378,7 @@ def main():
 
     # salva JSON final
     out_json = os.path.join(OUT_DIR, "characters.json")
-    with open(out_json, "w", encoding="utf-8") as f:
-        json.dump(all_chars, f, ensure_ascii=False, indent=2)
+    records.write_json(out_json, all_chars)
 
     print(f"\nOK! Gerado: {out_json}")
     print(f"Imagens personagem: {CHAR_IMG_DIR}")
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# ========= CONFIG =========
+DEFAULT_DIRS = ["images", "out_nawiki", os.path.join("missions_out", "images")]
+REPORT_JSON = "image_report.json"
+
+IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
+MIN_SIZE = 64  # bytes; menor que isso não é imagem de verdade
+
+# sha256 de placeholders conhecidos (ex.: "removed.png" do imgur).
+# Adicione aqui quando achar um novo no relatório. Além destes, vale o que
+# está em PLACEHOLDERS_JSON: todo arquivo pego pelo tamanho (abaixo) tem o
+# hash gravado lá, e nas próximas rodadas o mesmo arquivo é pego pelo hash
+# mesmo com outra extensão/formato de header.
+PLACEHOLDER_SHA256 = set()
+PLACEHOLDERS_JSON = "placeholder_hashes.json"
+
+# O "removed" do imgur é um PNG 161x81 — pega mesmo sem o hash
+PLACEHOLDER_SIZES = {(161, 81)}
+# ==========================
+
+
+def sniff_format(head: bytes):
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    stripped = head.lstrip().lower()
+    if stripped.startswith(b"<!doctype") or stripped.startswith(b"<html") or stripped.startswith(b"<"):
+        return "html"
+    return None
+
+
+def png_size(data: bytes):
+    # IHDR é sempre o primeiro chunk
+    if data[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", data[16:24])
+
+
+def jpeg_size(data: bytes):
+    i = 2
+    n = len(data)
+    while i + 9 < n:
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        seg_len = struct.unpack(">H", data[i + 2:i + 4])[0]
+        # SOF0..SOF15 menos DHT(C4)/JPG(C8)/DAC(CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            h, w = struct.unpack(">HH", data[i + 5:i + 9])
+            return (w, h)
+        i += 2 + seg_len
+    return None
+
+
+def gif_size(data: bytes):
+    return struct.unpack("<HH", data[6:10])
+
+
+def webp_size(data: bytes):
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        w, h = struct.unpack("<HH", data[26:30])
+        return (w & 0x3FFF, h & 0x3FFF)
+    if chunk == b"VP8L":
+        b = data[21:25]
+        w = 1 + (((b[1] & 0x3F) << 8) | b[0])
+        h = 1 + (((b[3] & 0x0F) << 10) | (b[2] << 2) | ((b[1] & 0xC0) >> 6))
+        return (w, h)
+    if chunk == b"VP8X":
+        w = 1 + int.from_bytes(data[24:27], "little")
+        h = 1 + int.from_bytes(data[27:30], "little")
+        return (w, h)
+    return None
+
+
+def is_truncated(fmt: str, data: bytes) -> bool:
+    tail = data[-32:]
+    if fmt == "png":
+        return b"IEND" not in tail
+    if fmt == "jpeg":
+        return b"\xff\xd9" not in tail
+    if fmt == "gif":
+        return not tail.rstrip(b"\x00").endswith(b";")
+    if fmt == "webp":
+        declared = struct.unpack("<I", data[4:8])[0] + 8
+        return len(data) < declared
+    return False
+
+
+SIZE_READERS = {
+    "png": png_size,
+    "jpeg": jpeg_size,
+    "gif": gif_size,
+    "webp": webp_size,
+}
+
+
+def check_file(path: str) -> dict:
+    """
+    Roda no worker do pool. Retorna {"path", "ok", "problems", ...}.
+    """
+    result = {"path": path.replace("\\", "/"), "ok": True, "problems": []}
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        result.update(ok=False, problems=[f"read-error: {e}"])
+        return result
+
+    result["bytes"] = len(data)
+    result["sha256"] = hashlib.sha256(data).hexdigest()
+
+    problems = result["problems"]
+    if len(data) < MIN_SIZE:
+        problems.append("too-small")
+
+    fmt = sniff_format(data[:64])
+    result["format"] = fmt
+    if fmt is None:
+        problems.append("unknown-magic")
+    elif fmt == "html":
+        problems.append("html-page")
+    else:
+        try:
+            size = SIZE_READERS[fmt](data)
+        except (struct.error, IndexError):
+            size = None
+        if not size or not all(size):
+            problems.append("bad-header")
+        else:
+            result["width"], result["height"] = size
+            if tuple(size) in PLACEHOLDER_SIZES:
+                problems.append("placeholder-size")
+        if is_truncated(fmt, data):
+            problems.append("truncated")
+
+        ext = os.path.splitext(path)[1].lower()
+        ext_fmt = {".jpg": "jpeg", ".jpeg": "jpeg"}.get(ext, ext.lstrip("."))
+        if ext_fmt != fmt:
+            # não é fatal (o browser lê pelo conteúdo), mas vale saber
+            result["extMismatch"] = True
+
+    result["ok"] = not problems
+    return result
+
+
+def load_placeholder_hashes(path: str = PLACEHOLDERS_JSON) -> set:
+    known = set(PLACEHOLDER_SHA256)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            known.update(json.load(f))
+    return known
+
+
+def apply_placeholder_hashes(results, known: set) -> set:
+    """
+    Marca quem tem hash de placeholder (conhecido ou aprendido nesta rodada
+    pelo tamanho). Retorna o conjunto atualizado.
+    """
+    known = known | {r["sha256"] for r in results if "placeholder-size" in r["problems"]}
+    for r in results:
+        if r.get("sha256") in known and "placeholder-hash" not in r["problems"]:
+            r["problems"].append("placeholder-hash")
+            r["ok"] = False
+    return known
+
+
+def iter_image_files(dirs):
+    for d in dirs:
+        if not os.path.isdir(d):
+            continue
+        for root, _, files in os.walk(d):
+            for name in files:
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTS:
+                    yield os.path.join(root, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verifica integridade das imagens baixadas (magic bytes, header, truncamento, placeholders)."
+    )
+    parser.add_argument("dirs", nargs="*", default=DEFAULT_DIRS, help="Pastas a verificar (default: images, out_nawiki, missions_out/images)")
+    parser.add_argument("-o", "--report", default=REPORT_JSON, help=f"Relatório JSON (default: {REPORT_JSON})")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="Processos no pool (default: todos os cores)")
+    parser.add_argument("--requeue", action="store_true", help="Apaga os arquivos ruins para os scripts de download baixarem de novo")
+    args = parser.parse_args()
+
+    files = sorted(iter_image_files(args.dirs))
+    print(f"Verificando {len(files)} imagens com {args.workers} processos...")
+
+    t0 = time.time()
+    # chunksize grande: cada arquivo é barato, o custo é o IPC
+    chunksize = max(1, len(files) // ((args.workers or 1) * 8))
+    with ProcessPoolExecutor(max_workers=args.workers) as ex:
+        results = list(ex.map(check_file, files, chunksize=chunksize))
+    elapsed = time.time() - t0
+
+    known = load_placeholder_hashes()
+    learned = apply_placeholder_hashes(results, known)
+    if learned - known:
+        with open(PLACEHOLDERS_JSON, "w", encoding="utf-8") as f:
+            json.dump(sorted(learned - PLACEHOLDER_SHA256), f, indent=2)
+
+    # mesmo hash em muitos arquivos diferentes = provável placeholder (ou
+    # ícone reaproveitado de propósito): vai pro relatório pra conferir
+    by_hash = {}
+    for r in results:
+        if r.get("sha256"):
+            by_hash.setdefault(r["sha256"], []).append(r)
+    duplicates = []
+    for h, group in by_hash.items():
+        if len(group) >= 3:
+            for r in group:
+                r["duplicateOf"] = len(group)
+            duplicates.append({"sha256": h, "count": len(group), "paths": [r["path"] for r in group]})
+    duplicates.sort(key=lambda d: -d["count"])
+
+    bad = [r for r in results if not r["ok"]]
+
+    requeued = []
+    if args.requeue:
+        for r in bad:
+            try:
+                os.remove(r["path"])
+                requeued.append(r["path"])
+            except OSError:
+                pass
+
+    report = {
+        "generatedAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "dirs": args.dirs,
+        "total": len(results),
+        "bad": len(bad),
+        "elapsedSeconds": round(elapsed, 3),
+        "requeued": requeued,
+        "files": bad,
+        "duplicates": duplicates,
+    }
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\nOK: {len(results) - len(bad)} | Ruins: {len(bad)} | Grupos duplicados: {len(duplicates)} | {elapsed:.2f}s")
+    if requeued:
+        print(f"Removidos para re-download: {len(requeued)}")
+    print("📄 Relatório:", args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Crawl dividido entre vários workers (processos ou máquinas) via work_queue.py.
+
+    python script_worker.py seed wiki          # enfileira páginas /arquivo/ da wiki
+    python script_worker.py seed images        # enfileira ícones do snapshot
+    python script_worker.py seed missions      # abre o browser, lista sessões e enfileira missões
+    python script_worker.py work wiki          # rode quantos quiser, em quantos hosts quiser
+    python script_worker.py export missions    # junta os resultados no JSON de sempre
+    python script_worker.py stats
+
+Todos apontam pro mesmo --db (ex.: num volume compartilhado). Cada worker
+respeita o rate limit do próprio script, então N hosts = N orçamentos.
+"""
+
+import argparse
+import os
+import shutil
+import time
+
+import records
+import work_queue
+
+QUEUES = ("wiki", "images", "missions")
+SESSIONS_QUEUE = "mission_sessions"  # só metadados das sessões (seed grava já como done)
+
+
+# =========================
+# SEED
+# =========================
+
+def seed_wiki(wq):
+    import script_text_image as wiki
+
+    urls = wiki.parse_index_character_links(wiki.fetch(wiki.INDEX_URL))
+    # order = posição no índice: o export segue a mesma ordem do script_text_image.main
+    return wq.enqueue("wiki", ((u, {"url": u, "order": i}) for i, u in enumerate(urls)))
+
+
+def seed_images(wq):
+    import script_images
+
+    chars = script_images.load_chars_from_next_data()
+    downloads = script_images.collect_downloads(chars)
+    # key = path: é o que define se o job já foi feito
+    return wq.enqueue("images", ((path, {"url": url, "path": path}) for url, path in downloads))
+
+
+def seed_missions(wq):
+    import script_missions as sm
+    from playwright.sync_api import sync_playwright
+
+    sm.setup()
+    added = 0
+    with sync_playwright() as p:
+        ctx = sm.open_context(p)
+        page = ctx.new_page()
+        sm.goto(page, sm.ROOT_URL)
+        if not sm.ensure_not_redirected_to_home(page, sm.ROOT_URL):
+            print("Login expirado/ausente. Rode script_missions.py com NA_HEADLESS=0 para logar.")
+            ctx.close()
+            return 0
+
+        root_nd = sm.next_data_from_page(page)
+        sessions = sm.extract_sessions_from_root_nextdata(root_nd or {})
+
+        for order, sess in enumerate(sessions):
+            sm.goto(page, sess["url"])
+            if not sm.ensure_not_redirected_to_home(page, sess["url"]):
+                continue
+            s_nd = sm.next_data_from_page(page)
+            if not s_nd:
+                continue
+
+            sess_info = {
+                "id": sess["id"],
+                "title": sess["title"],
+                "description": sess.get("description", ""),
+                "url": sess["url"],
+                "imageUrl": sess.get("imageUrl"),
+                "order": order,
+            }
+            wq.enqueue(SESSIONS_QUEUE, [(sess["id"], sess_info)])
+            wq.complete(SESSIONS_QUEUE, sess["id"], sess_info)
+
+            if sess.get("imageUrl"):
+                out_path = sm.session_image_path(sess["id"], sess["imageUrl"])
+                wq.enqueue("images", [(out_path, {"url": sess["imageUrl"], "path": out_path})])
+
+            cards = sm.extract_mission_cards_from_session_nextdata(s_nd)
+            added += wq.enqueue("missions", (
+                (card["missionUrl"], {"session": {"id": sess["id"], "title": sess["title"]}, "card": card})
+                for card in cards
+            ))
+        ctx.close()
+    return added
+
+
+# =========================
+# HANDLERS (um job -> resultado JSON)
+# =========================
+
+def wiki_handler():
+    import script_text_image as wiki
+
+    def handle(payload):
+        data = wiki.parse_character_page(payload["url"])
+        data["_order"] = payload.get("order")
+        return data
+    return handle
+
+
+def images_handler():
+    import script_images
+
+    script_images.setup()
+
+    def handle(payload):
+        os.makedirs(os.path.dirname(payload["path"]), exist_ok=True)
+        script_images.download(payload["url"], payload["path"])
+        # download() só loga o erro; sem arquivo = falhou (volta pra fila)
+        if not os.path.exists(payload["path"]):
+            raise IOError(f"download falhou: {payload['url']}")
+        return {"path": payload["path"].replace("\\", "/")}
+    return handle
+
+
+class MissionHandler:
+    """
+    Mantém um browser aberto por worker (lazy) e processa /mission/<linkTo>.
+    As imagens da missão viram jobs na fila "images".
+    """
+
+    def __init__(self, wq, slot: int = 1):
+        self.wq = wq
+        self.slot = slot
+        self._pw = None
+        self._browser = None
+
+    def _ensure_browser(self):
+        if self._browser is not None:
+            return self._browser
+        import script_missions as sm
+        from playwright.sync_api import sync_playwright
+
+        sm.setup()
+        self._pw = sync_playwright().start()
+        # perfil próprio por slot (o Chromium trava o user_data_dir); o nome é
+        # fixo, então o perfil é reaproveitado entre rodadas. Slot novo nasce
+        # como cópia do perfil logado.
+        worker_dir = f"{sm.USER_DATA_DIR}_slot{self.slot}"
+        if not os.path.exists(worker_dir) and os.path.isdir(sm.USER_DATA_DIR):
+            shutil.copytree(sm.USER_DATA_DIR, worker_dir, ignore=shutil.ignore_patterns("Singleton*", "*.lock"))
+        self._browser = sm.BrowserSession(self._pw, user_data_dir=worker_dir, headless=True)
+        return self._browser
+
+    def __call__(self, payload):
+        import script_missions as sm
+
+        browser = self._ensure_browser()
+        card = payload["card"]
+        m_url = card["missionUrl"]
+
+        browser.goto(m_url)
+        if not sm.ensure_not_redirected_to_home(browser.page, m_url):
+            raise PermissionError(f"redirecionado para home: {m_url}")
+        m_nd = sm.next_data_from_page(browser.page)
+        ms = sm.extract_mission_status_from_mission_nextdata(m_nd or {})
+        if not ms:
+            raise ValueError(f"MISSÃO sem missionStatus: {m_url}")
+
+        mission_obj = sm.build_mission_obj(payload["session"], card, ms, m_url)
+
+        jobs = []
+        for key in ["mission", "reward"]:
+            img_url = mission_obj["images"][key]["url"]
+            if not img_url:
+                continue
+            out_path = sm.mission_image_path(payload["session"]["id"], mission_obj["id"], key, img_url)
+            mission_obj["images"][key]["file"] = out_path.replace("\\", "/")
+            jobs.append((out_path, {"url": img_url, "path": out_path}))
+        self.wq.enqueue("images", jobs)
+
+        mission_obj["_sessionId"] = payload["session"]["id"]
+        return mission_obj
+
+    def close(self):
+        if self._browser is not None:
+            print(f"[{self.wq.worker_id}] browser: {self._browser.stats()}")
+            self._browser.close()
+        if self._pw is not None:
+            self._pw.stop()
+
+
+# =========================
+# EXPORT
+# =========================
+
+def export_wiki(wq, out_json):
+    """
+    Junta os personagens e enfileira as imagens (personagem + skills) na
+    fila "images" — os mesmos arquivos que o script_text_image.py baixa.
+    """
+    import script_text_image as wiki
+
+    # ordem do índice da wiki (decide qual skill repetida ganha o nome com prefixo)
+    results = [ch for _, ch in wq.results("wiki")]
+    results.sort(key=lambda c: (c.get("_order") is None, c.get("_order") or 0))
+    taken = set()
+    jobs = []
+    for ch in results:
+        jobs += [(path, {"url": url, "path": path}) for url, path in wiki.image_downloads(ch, taken)]
+    queued = wq.enqueue("images", jobs)
+    if queued:
+        print(f"Imagens da wiki enfileiradas: {queued} (rode: work images)")
+
+    data = []
+    for ch in results:
+        ch.pop("_order", None)
+        ch.pop("_characterImageUrl", None)
+        for sk in ch.get("skills", []):
+            sk.pop("_imageUrl", None)
+        data.append(ch)
+    os.makedirs(os.path.dirname(out_json) or ".", exist_ok=True)
+    records.write_json(out_json, data)
+    return len(data)
+
+
+def export_missions(wq, out_json):
+    import script_missions as sm
+
+    sessions = {}
+    for sess_id, info in wq.results(SESSIONS_QUEUE):
+        image = None
+        if info.get("imageUrl"):
+            path = sm.session_image_path(sess_id, info["imageUrl"])
+            if os.path.exists(path):
+                image = {"url": info["imageUrl"], "file": path.replace("\\", "/")}
+        sessions[sess_id] = {
+            "id": sess_id,
+            "title": info["title"],
+            "description": info.get("description", ""),
+            "url": info["url"],
+            "image": image,
+            "missions": [],
+            "_order": info.get("order", 0),
+        }
+
+    total = 0
+    for _, m in wq.results("missions"):
+        sess = sessions.get(m.pop("_sessionId", None))
+        if sess is None:
+            continue
+        # arquivo só conta se o job de imagem já terminou
+        for img in m["images"].values():
+            if img.get("file") and not os.path.exists(img["file"]):
+                img["file"] = None
+        sess["missions"].append(m)
+        total += 1
+
+    out = {
+        "sourceRoot": sm.ROOT_URL,
+        "generatedAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "sessions": [
+            {k: v for k, v in s.items() if k != "_order"}
+            for s in sorted(sessions.values(), key=lambda s: s["_order"])
+        ],
+    }
+    os.makedirs(os.path.dirname(out_json) or ".", exist_ok=True)
+    records.write_json(out_json, out)
+    return total
+
+
+# =========================
+# MAIN
+# =========================
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl distribuído com fila SQLite e leases.")
+    parser.add_argument("--db", default=work_queue.DEFAULT_DB, help="Arquivo SQLite da fila (volume compartilhado)")
+    parser.add_argument("--worker-id", default=None, help="Id do worker (default: host:pid)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_seed = sub.add_parser("seed", help="Enfileira jobs")
+    p_seed.add_argument("queue", choices=QUEUES)
+
+    p_work = sub.add_parser("work", help="Processa jobs até a fila esvaziar")
+    p_work.add_argument("queue", choices=QUEUES)
+    p_work.add_argument("--batch", type=int, default=1, help="Jobs por lease")
+    p_work.add_argument("--lease", type=float, default=work_queue.DEFAULT_LEASE_SECONDS, help="Segundos de lease")
+    p_work.add_argument("--wait", action="store_true", help="Não sai quando a fila esvazia (espera novos jobs)")
+    p_work.add_argument("--slot", type=int, default=1, help="missions: perfil do Chromium (um slot por worker no mesmo host)")
+
+    p_export = sub.add_parser("export", help="Junta os resultados num JSON")
+    p_export.add_argument("queue", choices=("wiki", "missions"))
+    p_export.add_argument("-o", "--out", default=None)
+
+    sub.add_parser("stats", help="Contagem por status em cada fila")
+
+    args = parser.parse_args()
+    wq = work_queue.WorkQueue(args.db, worker_id=args.worker_id)
+
+    if args.cmd == "seed":
+        added = {"wiki": seed_wiki, "images": seed_images, "missions": seed_missions}[args.queue](wq)
+        print(f"Novos jobs em '{args.queue}': {added}")
+
+    elif args.cmd == "work":
+        if args.queue == "missions":
+            handler = MissionHandler(wq, args.slot)
+        else:
+            handler = {"wiki": wiki_handler, "images": images_handler}[args.queue]()
+        try:
+            done = work_queue.run_worker(
+                wq, args.queue, handler,
+                batch=args.batch, lease_seconds=args.lease, idle_exit=not args.wait,
+            )
+        finally:
+            if isinstance(handler, MissionHandler):
+                handler.close()
+        print(f"[{wq.worker_id}] concluídos: {done}")
+
+    elif args.cmd == "export":
+        if args.queue == "wiki":
+            out = args.out or os.path.join("out_nawiki", "characters.json")
+            n = export_wiki(wq, out)
+        else:
+            out = args.out or os.path.join("missions_out", "missions.json")
+            n = export_missions(wq, out)
+        print(f"Exportados {n} registros -> {out}")
+
+    elif args.cmd == "stats":
+        for q in QUEUES + (SESSIONS_QUEUE,):
+            print(f"{q}: {wq.stats(q)}")
+
+    wq.close()
+
+
+if __name__ == "__main__":
+    main()
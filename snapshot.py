@@ -0,0 +1,62 @@
+import re
+import json
+
+# Leitura dos snapshots HTML salvos do naruto-arena.site (Next.js).
+# Sem BeautifulSoup: o <script id="__NEXT_DATA__"> é achado por regex,
+# que é bem mais rápido que montar a árvore do HTML inteiro.
+
+DEFAULT_SNAPSHOT = "Characters and Skills - Naruto Arena Classic2.html"
+
+# "snapshots.nar::Página.html" -> página dentro do snapshot_archive.py
+ARCHIVE_SEP = "::"
+
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]*\bid=["\']?__NEXT_DATA__["\']?[^>]*>(.*?)</script>',
+    re.S | re.I,
+)
+
+
+def next_data_from_html(html: str):
+    m = NEXT_DATA_RE.search(html or "")
+    if not m:
+        return None
+    try:
+        return json.loads(m.group(1))
+    except ValueError:
+        return None
+
+
+def read_next_data(path: str):
+    if ARCHIVE_SEP in path:
+        from snapshot_archive import SnapshotArchive
+
+        archive, name = path.split(ARCHIVE_SEP, 1)
+        return SnapshotArchive(archive).next_data(name)
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        return next_data_from_html(f.read())
+
+
+def page_props(snapshot) -> dict:
+    """
+    snapshot pode ser um caminho de HTML ou o __NEXT_DATA__ já carregado.
+    """
+    nd = read_next_data(snapshot) if isinstance(snapshot, str) else snapshot
+    return ((nd or {}).get("props") or {}).get("pageProps") or {}
+
+
+def iter_characters(snapshot=DEFAULT_SNAPSHOT):
+    """
+    Gera os personagens de pageProps.chars, na ordem do site
+    (a posição é o mesmo id do shortcut_c).
+    """
+    for ch in page_props(snapshot).get("chars") or []:
+        yield ch
+
+
+def iter_skills(snapshot=DEFAULT_SNAPSHOT):
+    """
+    Gera (personagem, skill) para todas as skills do snapshot.
+    """
+    for ch in iter_characters(snapshot):
+        for sk in ch.get("skills") or []:
+            yield ch, sk
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Arquivo de snapshots: em vez de dezenas de HTML de ~1 MB soltos no repo,
+# um arquivo só de frames comprimidos + índice JSON do lado.
+#   - cada página vira 2 frames: o __NEXT_DATA__ e o resto do HTML
+#     (ler pageProps = um seek + descomprimir só o frame do JSON)
+#   - frames são endereçados pelo sha256: snapshot repetido (ou só com o
+#     HTML em volta diferente) não ocupa espaço de novo
+#   - zstd se o `zstandard` estiver instalado; senão zlib (stdlib). O codec
+#     fica gravado no índice e vale pro arquivo todo.
+#
+# Referência "arquivo::página" funciona em snapshot.read_next_data(), então
+# os extratores que já recebem um caminho de HTML aceitam o arquivo direto.
+
+# ========= CONFIG =========
+DEFAULT_ARCHIVE = "snapshots.nar"
+ZSTD_LEVEL = 19
+ZLIB_LEVEL = 9
+# ==========================
+
+NEXT_DATA_BYTES_RE = re.compile(
+    rb'(<script[^>]*\bid=["\']?__NEXT_DATA__["\']?[^>]*>)(.*?)</script>',
+    re.S | re.I,
+)
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class SnapshotArchive:
+    def __init__(self, path: str = DEFAULT_ARCHIVE, codec: str = None):
+        self.path = path
+        self.index_path = path + ".idx.json"
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        else:
+            self.index = {
+                "version": 1,
+                "codec": codec or ("zstd" if zstandard is not None else "zlib"),
+                "blobs": {},   # sha256 -> [offset, tamanho comprimido, tamanho original]
+                "pages": {},
+            }
+        self.codec = self.index["codec"]
+        if self.codec == "zstd" and zstandard is None:
+            raise RuntimeError(f"{path} usa zstd: pip install zstandard")
+        self._dirty = False
+
+    # ---------- compressão ----------
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        return zlib.compress(data, ZLIB_LEVEL)
+
+    def _decompress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    # ---------- escrita ----------
+
+    def _put_blob(self, data: bytes) -> str:
+        key = sha256(data)
+        if key in self.index["blobs"]:
+            return key
+        frame = self._compress(data)
+        with open(self.path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(frame)
+        self.index["blobs"][key] = [offset, len(frame), len(data)]
+        self._dirty = True
+        return key
+
+    def add(self, name: str, html: bytes) -> bool:
+        """
+        Adiciona (ou substitui) a página `name`. False se já estava igual.
+        """
+        digest = sha256(html)
+        old = self.index["pages"].get(name)
+        if old and old["sha256"] == digest:
+            return False
+
+        m = NEXT_DATA_BYTES_RE.search(html)
+        if m:
+            start, end = m.span(2)
+            data_key = self._put_blob(html[start:end])
+            rest_key = self._put_blob(html[:start] + html[end:])
+            span = [start, end]
+        else:
+            data_key, span = None, None
+            rest_key = self._put_blob(html)
+
+        self.index["pages"][name] = {
+            "sha256": digest,
+            "bytes": len(html),
+            "nextData": span,  # offsets do JSON dentro do HTML original
+            "data": data_key,
+            "rest": rest_key,
+            "addedAt": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._dirty = True
+        return True
+
+    def add_file(self, path: str, name: str = None) -> bool:
+        with open(path, "rb") as f:
+            return self.add(name or os.path.basename(path), f.read())
+
+    def flush(self):
+        if not self._dirty:
+            return
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+        self._dirty = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    # ---------- leitura ----------
+
+    def _get_blob(self, key: str) -> bytes:
+        offset, length, _ = self.index["blobs"][key]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return self._decompress(f.read(length))
+
+    def names(self) -> list[str]:
+        return sorted(self.index["pages"])
+
+    def _page(self, name: str) -> dict:
+        try:
+            return self.index["pages"][name]
+        except KeyError:
+            raise KeyError(f"página não está no arquivo: {name}") from None
+
+    def next_data(self, name: str):
+        page = self._page(name)
+        if not page["data"]:
+            return None
+        try:
+            return json.loads(self._get_blob(page["data"]))
+        except ValueError:
+            return None
+
+    def html(self, name: str) -> bytes:
+        """
+        HTML original, byte a byte (o sha256 é conferido).
+        """
+        page = self._page(name)
+        rest = self._get_blob(page["rest"])
+        if page["data"]:
+            start = page["nextData"][0]
+            html = rest[:start] + self._get_blob(page["data"]) + rest[start:]
+        else:
+            html = rest
+        if sha256(html) != page["sha256"]:
+            raise ValueError(f"{name}: sha256 não confere")
+        return html
+
+    def stats(self) -> dict:
+        original = sum(p["bytes"] for p in self.index["pages"].values())
+        stored = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {
+            "codec": self.codec,
+            "pages": len(self.index["pages"]),
+            "blobs": len(self.index["blobs"]),
+            "originalMb": round(original / (1024 * 1024), 2),
+            "storedMb": round(stored / (1024 * 1024), 2),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arquivo comprimido de snapshots HTML com índice do __NEXT_DATA__.")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE, help=f"default: {DEFAULT_ARCHIVE}")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_add = sub.add_parser("add", help="Adiciona HTMLs (pula os que já estão iguais)")
+    p_add.add_argument("files", nargs="+")
+
+    sub.add_parser("list", help="Lista as páginas")
+
+    p_extract = sub.add_parser("extract", help="Reconstrói o HTML original de uma página")
+    p_extract.add_argument("name")
+    p_extract.add_argument("-o", "--out")
+
+    args = parser.parse_args()
+
+    with SnapshotArchive(args.archive) as archive:
+        if args.cmd == "add":
+            for path in args.files:
+                added = archive.add_file(path)
+                print(f"{'+' if added else '='} {os.path.basename(path)}")
+            print(archive.stats())
+        elif args.cmd == "list":
+            for name in archive.names():
+                page = archive.index["pages"][name]
+                print(f"{page['sha256'][:12]}  {page['bytes']:>9}  {name}")
+            print(archive.stats())
+        elif args.cmd == "extract":
+            out = args.out or args.name
+            with open(out, "wb") as f:
+                f.write(archive.html(args.name))
+            print("📄 HTML:", out)
+
+
+if __name__ == "__main__":
+    main()
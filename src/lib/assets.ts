@@ -0,0 +1,18 @@
+import manifest from '../../public/assets/nawiki/asset-manifest.json';
+
+const BASE_PATH = '/naruto-arena-blog';
+const ASSET_PREFIX = `${BASE_PATH}/assets/nawiki/`;
+
+// Logical asset path -> content-hashed copy (generated by script_asset_manifest.py).
+// Hashed URLs never change content, so they can be cached as immutable.
+const HASHED_ASSETS = manifest as Record<string, string>;
+
+export function assetUrl(url: string): string {
+    if (!url || !url.startsWith(ASSET_PREFIX)) return url;
+
+    const [path, query] = url.slice(ASSET_PREFIX.length).split('?');
+    const hashed = HASHED_ASSETS[decodeURIComponent(path)];
+    if (!hashed) return url;
+
+    return `${ASSET_PREFIX}${hashed}${query ? `?${query}` : ''}`;
+}
@@ -1,5 +1,6 @@
 import missionsData from '../../public/assets/nawiki/missions_out/missions_out_translated_v3.json';
 import { MissionSession } from './types';
+import { assetUrl } from './assets';
 
 const BASE_PATH = '/naruto-arena-blog';
 
@@ -24,9 +25,9 @@ export function getMissionImageUrl(mission: any, type: "mission" | "reward" | st
         filePath = filePath.replace(/^public\//, "").replace(/^\/+/, "");
 
         if (filePath.startsWith("missions_out/")) {
-            return `${BASE_PATH}/assets/nawiki/${filePath}`;
+            return assetUrl(`${BASE_PATH}/assets/nawiki/${filePath}`);
         }
-        return `${BASE_PATH}/${filePath}`;
+        return assetUrl(`${BASE_PATH}/${filePath}`);
     }
 
     if (normalized === "mission" && mission?.card?.imageUrl) return mission.card.imageUrl;
@@ -50,14 +51,14 @@ export function getSessionImageUrl(session: any): string {
     if (!session.image?.file) {
         // Fallback to exact local mapped string
         if (session.id && SESSION_IMAGE_MAP[session.id]) {
-            return `${BASE_PATH}/assets/nawiki/missions_out/images/${SESSION_IMAGE_MAP[session.id]}`;
+            return assetUrl(`${BASE_PATH}/assets/nawiki/missions_out/images/${SESSION_IMAGE_MAP[session.id]}`);
         }
         return '';
     }
 
     let filePath = session.image.file;
     filePath = filePath.replace(/^public\//, "").replace(/^\/+/, "");
-    return `${BASE_PATH}/${filePath}`;
+    return assetUrl(`${BASE_PATH}/${filePath}`);
 }
 
 // Helper to check if mission is completed
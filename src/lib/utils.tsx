@@ -1,4 +1,5 @@
 import { Character } from "./types";
+import { assetUrl } from "./assets";
 
 const BASE_PATH = '/naruto-arena-blog';
 
@@ -86,74 +87,73 @@ export function toSlug(text: string): string {
 }
 
 export function getCharacterImageUrl(id: string, name: string): string {
-    return `${BASE_PATH}/assets/nawiki/characters/${id.toLowerCase()}.png`;
+    return assetUrl(`${BASE_PATH}/assets/nawiki/characters/${id.toLowerCase()}.png`);
 }
 
-export function handleCharacterImageError(e: React.SyntheticEvent<HTMLImageElement, Event>, id: string, name: string) {
-    const target = e.target as HTMLImageElement;
-    const currentSrc = target.src;
-    const baseUrl = `${BASE_PATH}/assets/nawiki/characters`;
+const EMPTY_GIF = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7";
 
-    if (currentSrc.endsWith('.png')) {
-        // Try ID-based .jpg
-        target.src = currentSrc.replace('.png', '.jpg');
-    } else if (currentSrc.includes(id.toLowerCase())) {
-        // If ID-based JPEG failed, try name-based lookup
-        const finalName = CHARACTER_NAME_MAPPING[name] || name;
-        target.src = `${baseUrl}/${finalName}.jpg`;
-    } else if (!currentSrc.includes('slug=')) {
-        // Try slugified name fallbacks
-        const slug = toSlug(CHARACTER_NAME_MAPPING[name] || name);
-        // Add a query param to avoid infinite loops and identify it's a slug attempt
-        target.src = `${baseUrl}/${slug}.jpg?slug=1`;
-    } else if (currentSrc.endsWith('.jpg?slug=1')) {
-        // Final attempt with slugified .png
-        target.src = currentSrc.replace('.jpg?slug=1', '.png?slug=2');
-    } else {
+/**
+ * Moves an <img> to its next fallback candidate. Progress is kept on the element
+ * (not parsed from src) because hashed URLs from assetUrl() no longer end in the
+ * original extension. Returns false once every candidate has been tried.
+ */
+function tryNextFallback(target: HTMLImageElement, key: string, candidates: string[]): boolean {
+    if (target.dataset.fallbackKey !== key) {
+        target.dataset.fallbackKey = key;
+        target.dataset.fallbackStep = '0';
+    }
+    const step = Number(target.dataset.fallbackStep || '0');
+    if (step >= candidates.length) {
         // Final fallback: hide
         target.onerror = null;
-        target.src = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7";
+        target.src = EMPTY_GIF;
         target.style.opacity = '0';
+        return false;
     }
+    target.dataset.fallbackStep = String(step + 1);
+    target.src = assetUrl(candidates[step]);
+    return true;
 }
 
-export function getSkillImageUrl(skillId: string, charId: string, skillName: string, charName?: string): string {
+export function handleCharacterImageError(e: React.SyntheticEvent<HTMLImageElement, Event>, id: string, name: string) {
+    const baseUrl = `${BASE_PATH}/assets/nawiki/characters`;
+    const finalName = CHARACTER_NAME_MAPPING[name] || name;
+    const slug = toSlug(finalName);
+
+    tryNextFallback(e.target as HTMLImageElement, `char:${id}`, [
+        `${baseUrl}/${id.toLowerCase()}.jpg`, // ID-based .jpg
+        `${baseUrl}/${finalName}.jpg`,        // name-based lookup
+        `${baseUrl}/${slug}.jpg`,             // slugified name
+        `${baseUrl}/${slug}.png`,
+    ]);
+}
+
+function skillFileBase(skillId: string, charId: string): string {
     const skillPart = skillId.startsWith(charId)
         ? skillId.slice(charId.length + 1)
         : skillId;
+    return `${charId}__${skillPart}`;
+}
 
-    const finalName = `${charId}__${skillPart}`;
-    return `${BASE_PATH}/assets/nawiki/skills/${finalName}.png`;
+export function getSkillImageUrl(skillId: string, charId: string, skillName: string, charName?: string): string {
+    return assetUrl(`${BASE_PATH}/assets/nawiki/skills/${skillFileBase(skillId, charId)}.png`);
 }
 
 export function handleSkillImageError(e: React.SyntheticEvent<HTMLImageElement, Event>, skillId: string, charId: string, skillName: string, charName?: string) {
-    const target = e.target as HTMLImageElement;
-    const currentSrc = target.src;
     const baseUrl = `${BASE_PATH}/assets/nawiki/skills`;
-
-    if (currentSrc.endsWith('.png')) {
-        // Try ID-based .jpg
-        target.src = currentSrc.replace('.png', '.jpg');
-    } else if (currentSrc.includes('__')) {
-        // Try name-based lookup (old standard)
-        let finalName = skillName;
-        if (charName && PRE_PREFIXED_SKILLS.some(s => skillName.includes(s))) {
-            finalName = `${charName} - ${skillName}`;
-        }
-        target.src = `${baseUrl}/${finalName}.jpg`;
-    } else if (!currentSrc.includes('slug=')) {
-        // Try slugified skill name
-        const slug = toSlug(skillName);
-        target.src = `${baseUrl}/${slug}.jpg?slug=1`;
-    } else if (currentSrc.endsWith('.jpg?slug=1')) {
-        // Final attempt with slugified .png
-        target.src = currentSrc.replace('.jpg?slug=1', '.png?slug=2');
-    } else {
-        // Final fallback
-        target.onerror = null;
-        target.src = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7";
-        target.style.opacity = '0';
+    // name-based lookup (old standard)
+    let finalName = skillName;
+    if (charName && PRE_PREFIXED_SKILLS.some(s => skillName.includes(s))) {
+        finalName = `${charName} - ${skillName}`;
     }
+    const slug = toSlug(skillName);
+
+    tryNextFallback(e.target as HTMLImageElement, `skill:${skillId}`, [
+        `${baseUrl}/${skillFileBase(skillId, charId)}.jpg`, // ID-based .jpg
+        `${baseUrl}/${finalName}.jpg`,
+        `${baseUrl}/${slug}.jpg`,                           // slugified skill name
+        `${baseUrl}/${slug}.png`,
+    ]);
 }
 
 const CHAKRA_TYPES = ['Taijutsu', 'Ninjutsu', 'Genjutsu', 'Bloodline', 'Random'] as const;
@@ -0,0 +1,242 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+
+# Fila de trabalho em SQLite para dividir um crawl entre vários processos
+# (ou máquinas com um volume compartilhado).
+#
+# - enqueue é idempotente (mesma key não entra duas vezes)
+# - lease pega N jobs por um tempo limitado; se o worker morrer, o lease
+#   expira e outro worker pega o job
+# - heartbeat renova o lease enquanto o job ainda está rodando
+# - complete só grava se o lease ainda é do worker (ou venceu sem ninguém
+#   pegar de novo); job já done não é regravado, então repetir a escrita não
+#   duplica nada (complete devolve False)
+
+DEFAULT_DB = "work_queue.sqlite"
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_MAX_ATTEMPTS = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    queue         TEXT NOT NULL,
+    key           TEXT NOT NULL,
+    payload       TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'pending',  -- pending | leased | done | failed
+    owner         TEXT,
+    lease_expires REAL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    result        TEXT,
+    error         TEXT,
+    updated_at    REAL NOT NULL,
+    PRIMARY KEY (queue, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_pick ON jobs (queue, status, lease_expires);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def connect(path: str = DEFAULT_DB) -> sqlite3.Connection:
+    # isolation_level=None -> a gente controla as transações (BEGIN IMMEDIATE)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class WorkQueue:
+    def __init__(self, path: str = DEFAULT_DB, worker_id: str = None):
+        self.path = path
+        self.worker_id = worker_id or default_worker_id()
+        self.conn = connect(path)
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- produtor ----------
+
+    def enqueue(self, queue: str, items) -> int:
+        """
+        items: iterável de (key, payload_dict). Retorna quantos eram novos.
+        """
+        now = time.time()
+        rows = [(queue, key, json.dumps(payload, ensure_ascii=False), now) for key, payload in items]
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO jobs (queue, key, payload, updated_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            added = self.conn.total_changes - before
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    # ---------- worker ----------
+
+    def lease(self, queue: str, n: int = 1, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        Pega até n jobs pendentes (ou com lease vencido). Retorna lista de
+        dicts {key, payload, attempts}.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                """
+                SELECT key, payload, attempts FROM jobs
+                WHERE queue = ?
+                  AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+                ORDER BY attempts, key
+                LIMIT ?
+                """,
+                (queue, now, n),
+            ).fetchall()
+            self.conn.executemany(
+                """
+                UPDATE jobs SET status = 'leased', owner = ?, lease_expires = ?,
+                       attempts = attempts + 1, updated_at = ?
+                WHERE queue = ? AND key = ?
+                """,
+                [(self.worker_id, now + lease_seconds, now, queue, r["key"]) for r in rows],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [
+            {"key": r["key"], "payload": json.loads(r["payload"]), "attempts": r["attempts"] + 1}
+            for r in rows
+        ]
+
+    def heartbeat(self, queue: str, keys, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> int:
+        """
+        Renova os leases ainda nossos. Retorna quantos foram renovados
+        (menos que len(keys) = alguém pegou o job depois que o lease venceu).
+        """
+        now = time.time()
+        cur = self.conn.executemany(
+            """
+            UPDATE jobs SET lease_expires = ?, updated_at = ?
+            WHERE queue = ? AND key = ? AND status = 'leased' AND owner = ?
+            """,
+            [(now + lease_seconds, now, queue, k, self.worker_id) for k in keys],
+        )
+        return cur.rowcount
+
+    def complete(self, queue: str, key: str, result=None) -> bool:
+        now = time.time()
+        cur = self.conn.execute(
+            """
+            UPDATE jobs SET status = 'done', result = ?, error = NULL,
+                   owner = ?, lease_expires = NULL, updated_at = ?
+            WHERE queue = ? AND key = ?
+              AND (status != 'done')
+              AND (status != 'leased' OR owner = ? OR lease_expires < ?)
+            """,
+            (json.dumps(result, ensure_ascii=False), self.worker_id, now, queue, key, self.worker_id, now),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, queue: str, key: str, error: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        now = time.time()
+        self.conn.execute(
+            """
+            UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                   error = ?, owner = NULL, lease_expires = NULL, updated_at = ?
+            WHERE queue = ? AND key = ? AND status = 'leased' AND owner = ?
+            """,
+            (max_attempts, str(error)[:2000], now, queue, key, self.worker_id),
+        )
+
+    # ---------- leitura ----------
+
+    def stats(self, queue: str) -> dict:
+        rows = self.conn.execute(
+            "SELECT status, COUNT(*) AS n FROM jobs WHERE queue = ? GROUP BY status", (queue,)
+        ).fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+    def results(self, queue: str):
+        for r in self.conn.execute(
+            "SELECT key, result FROM jobs WHERE queue = ? AND status = 'done' ORDER BY key", (queue,)
+        ):
+            yield r["key"], json.loads(r["result"]) if r["result"] else None
+
+
+class Heartbeat:
+    """
+    Renova leases numa thread (com conexão própria — sqlite3 não compartilha
+    conexão entre threads) enquanto o bloco with está rodando.
+
+        with Heartbeat(wq, "images", [job["key"]]):
+            processa(job)
+    """
+
+    def __init__(self, wq: WorkQueue, queue: str, keys, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        self.wq = wq
+        self.queue = queue
+        self.keys = list(keys)
+        self.lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        hb = WorkQueue(self.wq.path, worker_id=self.wq.worker_id)
+        try:
+            # renova com folga: a cada 1/3 do lease
+            while not self._stop.wait(self.lease_seconds / 3):
+                hb.heartbeat(self.queue, self.keys, self.lease_seconds)
+        finally:
+            hb.close()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def run_worker(wq: WorkQueue, queue: str, handler, batch: int = 1,
+               lease_seconds: float = DEFAULT_LEASE_SECONDS,
+               max_attempts: int = DEFAULT_MAX_ATTEMPTS, idle_exit: bool = True):
+    """
+    Loop de worker: lease -> handler(payload) -> complete/fail.
+    Sai quando a fila esvazia (idle_exit) ou fica esperando novos jobs.
+    """
+    done = 0
+    while True:
+        jobs = wq.lease(queue, batch, lease_seconds)
+        if not jobs:
+            pending = wq.stats(queue).get("leased", 0)
+            if idle_exit and not pending:
+                return done
+            # ainda tem job com lease de outro worker: espera ele terminar ou vencer
+            time.sleep(min(5, lease_seconds / 4))
+            continue
+
+        with Heartbeat(wq, queue, [j["key"] for j in jobs], lease_seconds):
+            for job in jobs:
+                try:
+                    result = handler(job["payload"])
+                except Exception as e:
+                    wq.fail(queue, job["key"], f"{type(e).__name__}: {e}", max_attempts)
+                    continue
+                # False = perdeu o lease (outro worker já gravou): não conta
+                if wq.complete(queue, job["key"], result):
+                    done += 1